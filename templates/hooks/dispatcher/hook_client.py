@@ -0,0 +1,103 @@
+#!/usr/bin/env python3
+"""
+Hook Client
+
+Thin PreToolUse hook entry for hook_server.py. It forwards stdin (plus cwd
+and environment) to the resident server and relays its exit code, stdout
+and message. The only imports are os, socket, sys and json, so startup is just
+the interpreter (run it with `python3 -S` to skip site-packages too).
+
+When the server isn't running, or the request can't be sent, the client
+imports hook_dispatch.py from its own directory and evaluates in-process.
+The result is the same, it just takes longer. Once a request has been sent
+the server may already be running the chain, so a late or garbled answer is
+reported as a hook error instead; evaluating again would run every hook's
+side effects twice.
+
+Exit codes:
+- 0: Allow operation
+- 1: Error (logged but doesn't block)
+- 2: Block operation (stderr shown to Claude)
+"""
+
+import json
+import os
+import socket
+import sys
+
+SOCKET_ENV = 'HOOK_SERVER_SOCKET'
+CONNECT_TIMEOUT_SECONDS = 5
+# Longer than the server's request deadline (5 s) plus a command hook's
+# default timeout (60 s), so a slow chain is waited for, not re-run
+RESPONSE_TIMEOUT_SECONDS = 70
+
+
+def socket_path():
+    env = os.environ.get(SOCKET_ENV)
+    if env:
+        return os.path.expanduser(env)
+    return os.path.join(os.path.expanduser('~'), '.claude', 'hooks', 'hook_server.sock')
+
+
+def ask_server(raw_input):
+    """
+    Evaluate on the server.
+
+    Returns: (exit_code, stderr text, stdout text), or None if the request
+    couldn't be sent (the server never saw all of it, so it didn't evaluate)
+    """
+    header = json.dumps({"cwd": os.getcwd(), "env": dict(os.environ),
+                         "length": len(raw_input)}).encode('utf-8')
+    client = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    client.settimeout(CONNECT_TIMEOUT_SECONDS)
+    try:
+        try:
+            client.connect(socket_path())
+            client.sendall(header + b'\n' + raw_input)
+        except OSError:
+            return None
+        chunks = []
+        try:
+            client.settimeout(RESPONSE_TIMEOUT_SECONDS)
+            client.shutdown(socket.SHUT_WR)
+            while True:
+                chunk = client.recv(65536)
+                if not chunk:
+                    break
+                chunks.append(chunk)
+        except OSError as e:
+            return 1, f"Hook error: hook server didn't answer: {e}", ''
+    finally:
+        client.close()
+
+    status, _, rest = b''.join(chunks).decode('utf-8', errors='replace').partition('\n')
+    output, _, message = rest.partition('\n')
+    try:
+        return int(status), message, json.loads(output)
+    except ValueError:
+        return 1, "Hook error: hook server sent a malformed answer", ''
+
+
+def evaluate_locally(raw_input):
+    """Fallback: run the dispatcher chain in this process."""
+    sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+    import hook_dispatch
+    exit_code, messages, output = hook_dispatch.handle(raw_input)
+    return exit_code, '\n'.join(messages), output
+
+
+def main():
+    raw_input = sys.stdin.buffer.read()
+    answer = ask_server(raw_input)
+    if answer is None:
+        answer = evaluate_locally(raw_input)
+    exit_code, message, output = answer
+    if output:
+        print(output)
+    if message:
+        print(message, file=sys.stderr)
+    sys.exit(exit_code)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,359 @@
+#!/usr/bin/env python3
+"""
+Hook Dispatcher
+
+PreToolUse hook that runs several hook checks in one interpreter. Instead of
+one process per hook (each starting Python and parsing the same stdin JSON),
+stdin is read once and the configured hooks run in order, in-process.
+
+Each hook module exposes `evaluate(tool_name, tool_input) -> (exit_code,
+message)`. Files that don't define it (checked in the source, before
+importing, since script-style hooks run on import) are run as a subprocess
+with the original stdin, so third-party hooks still work without the speedup:
+by their shebang (or with this interpreter for .py files), or with the
+entry's "command" run by the shell. Their JSON stdout counts too: a
+permissionDecision of "deny" (or "decision": "block") blocks like exit 2,
+and "ask"/"allow" decisions are passed through on the dispatcher's stdout.
+
+Exit codes are merged with the usual semantics:
+- 2 (block) short-circuits: later hooks don't run, only its message is shown
+- 1 (error) is recorded and the chain continues
+- 0 (allow)
+The result is the highest seen: 2 > 1 > 0.
+
+Config (hook_dispatch.json next to this script, or $HOOK_DISPATCH_CONFIG):
+    {
+      "hooks": [
+        {"path": "command-logger.py", "tools": ["Bash"]},
+        {"path": "dangerous-commands-blocker.py", "tools": ["Bash"]},
+        {"path": "sensitive-file-blocker-enhanced.py", "tools": ["Edit", "Write", "Read"]}
+      ]
+    }
+Relative paths are resolved against the config file's directory. `tools` is
+optional (default: every tool); `"enabled": false` skips an entry. An entry
+can give a shell `"command"` instead of (or in addition to) a `"path"`; it is
+always run as a subprocess, like a command hook in settings.json.
+
+Verdict cache (opt-in): with a top-level `"verdict_cache": true` (or
+{"path": ..., "max_entries": ...}), verdicts of hooks that define
+`cache_key(tool_name, tool_input)` are stored in SQLite (verdict_cache.py)
+and reused across invocations. `"cache": false` on an entry opts it out.
+
+Exit codes:
+- 0: Allow operation
+- 1: Error (logged but doesn't block)
+- 2: Block operation (stderr shown to Claude)
+"""
+
+import hashlib
+import importlib.util
+import json
+import os
+import re
+import shlex
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+CONFIG_NAME = 'hook_dispatch.json'
+
+# Severity order when merging exit codes (unknown non-zero codes count as errors)
+SEVERITY = {0: 0, 1: 1, 2: 2}
+
+EVALUATE_PATTERN = re.compile(r'^def evaluate\(', re.MULTILINE)
+
+# Claude Code's default hook timeout
+SUBPROCESS_TIMEOUT_SECONDS = 60
+
+# Permission decisions in hook JSON output, strictest first
+DECISIONS = ('deny', 'ask', 'allow')
+
+
+def config_path():
+    """Config file: $HOOK_DISPATCH_CONFIG, else hook_dispatch.json next to this script."""
+    env = os.environ.get('HOOK_DISPATCH_CONFIG')
+    if env:
+        return Path(env).expanduser()
+    return Path(__file__).resolve().parent / CONFIG_NAME
+
+
+def load_config(path):
+    """
+    Read the ordered hook chain.
+
+    Returns: list of {"path": Path or None, "command": str or None,
+    "tools": set or None, "name": str, "cache": VerdictCache or None,
+    "timeout": seconds}
+    """
+    with open(path, 'r', encoding='utf-8') as f:
+        config = json.load(f)
+
+    cache = None
+    if config.get('verdict_cache'):
+        import verdict_cache  # Next to this script; sqlite3 is only imported when enabled
+        cache = verdict_cache.open_cache(config['verdict_cache'])
+
+    chain = []
+    for entry in config.get('hooks', []):
+        if isinstance(entry, str):
+            entry = {"path": entry}
+        if entry.get('enabled') is False:
+            continue
+        command = entry.get('command')
+        hook_path = None
+        if entry.get('path') or not command:
+            hook_path = Path(entry['path']).expanduser()
+            if not hook_path.is_absolute():
+                hook_path = path.parent / hook_path
+        tools = entry.get('tools')
+        chain.append({
+            "path": hook_path,
+            "command": command,
+            "tools": set(tools) if tools and '*' not in tools else None,
+            "name": entry.get('name', hook_path.stem if hook_path else str(command).split()[0]),
+            "cache": cache if entry.get('cache', True) else None,
+            "timeout": entry.get('timeout', SUBPROCESS_TIMEOUT_SECONDS),
+        })
+    return chain
+
+
+_modules = {}
+_digests = {}
+
+
+def rules_changed(module):
+    """True if a rule pack was added, edited or removed since the hook was imported."""
+    stamp = getattr(module, 'RULE_PACK_STAMP', None)
+    return stamp is not None and module.rule_packs.changed(stamp)
+
+
+def load_hook(hook_path):
+    """
+    Import a hook file as a module (hook names have dashes, so by path).
+
+    Modules are cached per path and mtime, so a long-lived process (see
+    hook_server.py) imports each once and picks up edits to the file, and
+    to the rule packs it merged (rule_packs.py).
+
+    Returns: module, or None if the file has no evaluate() (run it as a subprocess)
+    """
+    key = str(hook_path)
+    mtime_ns = os.stat(hook_path).st_mtime_ns
+    cached = _modules.get(key)
+    if cached is not None and cached[0] == mtime_ns and not rules_changed(cached[1]):
+        return cached[1]
+
+    module = None
+    with open(hook_path, 'rb') as f:
+        source = f.read()
+    _digests[key] = hashlib.sha256(source).hexdigest()
+    if EVALUATE_PATTERN.search(source.decode('utf-8', errors='replace')):
+        module_name = 'hook_' + re.sub(r'\W', '_', hook_path.stem)
+        spec = importlib.util.spec_from_file_location(module_name, hook_path)
+        if spec is None:
+            raise ImportError(f"not a Python file: {hook_path}")
+        module = importlib.util.module_from_spec(spec)
+        spec.loader.exec_module(module)
+    _modules[key] = (mtime_ns, module)
+    return module
+
+
+def verdict_key(hook, module, tool_name, tool_input):
+    """
+    Cache key for this call, or None if it must be evaluated.
+
+    The hook's cache_key() names everything its verdict depends on (None:
+    don't cache, e.g. while an escape hatch is set). The key also covers the
+    hook file's digest and its ruleset_hash(), if any, so rule edits
+    invalidate old verdicts.
+    """
+    if hook.get('cache') is None or not hasattr(module, 'cache_key'):
+        return None
+    call_key = module.cache_key(tool_name, tool_input)
+    if call_key is None:
+        return None
+    ruleset = module.ruleset_hash() if hasattr(module, 'ruleset_hash') else ''
+    return hook['cache'].key(str(hook['path']), _digests[str(hook['path'])],
+                             ruleset, call_key)
+
+
+def subprocess_args(hook):
+    """
+    How to start a subprocess hook, as Claude Code would from settings.json.
+
+    Returns: (args for subprocess.run, shell: bool)
+    """
+    if hook.get('command'):
+        return hook['command'], True
+    hook_path = str(hook['path'])
+    if hook['path'].suffix == '.py':
+        return [sys.executable, hook_path], False
+    with open(hook_path, 'rb') as f:
+        first_line = f.readline().decode('utf-8', errors='replace').strip()
+    if first_line.startswith('#!'):
+        return shlex.split(first_line[2:]) + [hook_path], False
+    if os.access(hook_path, os.X_OK):
+        return [hook_path], False
+    return ['sh', hook_path], False
+
+
+def parse_output(stdout):
+    """
+    Read a hook's JSON stdout (hookSpecificOutput.permissionDecision, or the
+    older top-level "decision": "block"/"approve").
+
+    Returns: (decision: 'deny', 'ask', 'allow' or None, reason: str)
+    """
+    try:
+        output = json.loads(stdout)
+    except ValueError:
+        return None, ""  # Plain text output doesn't affect the decision
+    if not isinstance(output, dict):
+        return None, ""
+    specific = output.get('hookSpecificOutput')
+    if isinstance(specific, dict) and specific.get('permissionDecision') in DECISIONS:
+        return specific['permissionDecision'], str(specific.get('permissionDecisionReason') or "")
+    if output.get('continue') is False:
+        return 'deny', str(output.get('stopReason') or "")
+    legacy = {'block': 'deny', 'approve': 'allow'}.get(output.get('decision'))
+    if legacy:
+        return legacy, str(output.get('reason') or "")
+    return None, ""
+
+
+def run_subprocess(hook, raw_input):
+    """
+    Run a hook without evaluate() as its own process, feeding the original stdin.
+
+    Returns: (exit_code, message, stdout) with a JSON "deny" mapped to exit 2
+    """
+    args, shell = subprocess_args(hook)
+    try:
+        proc = subprocess.run(args, input=raw_input, capture_output=True, shell=shell,
+                              timeout=hook.get('timeout', SUBPROCESS_TIMEOUT_SECONDS))
+    except subprocess.TimeoutExpired:
+        return 1, f"Hook error: {hook['name']} timed out", ""
+    message = proc.stderr.decode('utf-8', errors='replace').strip()
+    stdout = proc.stdout.decode('utf-8', errors='replace').strip()
+    if proc.returncode != 0:
+        return proc.returncode, message, ""  # Claude Code reads JSON output only on exit 0
+    decision, reason = parse_output(stdout)
+    if decision == 'deny':
+        return 2, reason or message or f"Blocked by {hook['name']}", ""
+    return 0, message, stdout if decision else ""
+
+
+def run_hook(hook, tool_name, tool_input, raw_input):
+    """
+    Evaluate one hook, never raising.
+
+    Returns: (exit_code: int, message: str, stdout: JSON decision to pass on, or "")
+    """
+    try:
+        module = load_hook(hook['path']) if hook['path'] and not hook.get('command') else None
+        if module is None:
+            return run_subprocess(hook, raw_input)
+        key = verdict_key(hook, module, tool_name, tool_input)
+        if key is not None:
+            cached = hook['cache'].get(key)
+            if cached is not None:
+                return cached[0], cached[1], ""
+        exit_code, message = module.evaluate(tool_name, tool_input)
+        if key is not None:
+            hook['cache'].put(key, exit_code, message)
+        return exit_code, message or "", ""
+    except SystemExit as e:
+        # A hook that still exits instead of returning
+        code = e.code if isinstance(e.code, int) else 1
+        return code, "" if code == 0 else f"Hook error: {hook['name']} exited with {code}", ""
+    except Exception as e:
+        return 1, f"Hook error: {hook['name']}: {e}", ""
+
+
+def dispatch(chain, tool_name, tool_input, raw_input=b''):
+    """
+    Run the chain for one tool call.
+
+    Args:
+        chain: load_config() result
+        tool_name: Tool being called
+        tool_input: Its input dict
+        raw_input: Original stdin bytes (for subprocess hooks)
+
+    Returns:
+        tuple: (merged exit code, [messages], [(hook name, exit code, ms)] timings,
+        stdout: the strictest "ask"/"allow" JSON output of a subprocess hook, or "")
+    """
+    result = 0
+    messages = []
+    timings = []
+    output, output_rank = "", len(DECISIONS)
+    for hook in chain:
+        if hook['tools'] is not None and tool_name not in hook['tools']:
+            continue
+        started = time.perf_counter()
+        exit_code, message, stdout = run_hook(hook, tool_name, tool_input, raw_input)
+        timings.append((hook['name'], exit_code, (time.perf_counter() - started) * 1000))
+
+        if exit_code == 2:
+            return 2, [message], timings, ""
+        if exit_code != 0:
+            exit_code = 1
+        if SEVERITY[exit_code] > SEVERITY[result]:
+            result = exit_code
+        if message:
+            messages.append(message)
+        if stdout:
+            rank = DECISIONS.index(parse_output(stdout)[0])
+            if rank < output_rank:
+                output, output_rank = stdout, rank
+    return result, messages, timings, output if result == 0 else ""
+
+
+def handle(raw_input, chain=None):
+    """
+    Handle one hook invocation: parse stdin bytes, run the chain.
+
+    Args:
+        raw_input: Hook stdin as bytes
+        chain: Preloaded load_config() result (loaded from config_path() if None)
+
+    Returns:
+        tuple: (exit code, [stderr messages], stdout text)
+    """
+    try:
+        data = json.loads(raw_input)
+        tool_name, tool_input = data.get('tool_name'), data.get('tool_input') or {}
+    except (ValueError, AttributeError) as e:
+        return 1, [f"Hook error: Failed to parse input: {e}"], ""
+
+    if chain is None:
+        path = config_path()
+        try:
+            chain = load_config(path)
+        except (OSError, ValueError, KeyError, TypeError) as e:
+            return 1, [f"Hook error: Failed to load {path}: {e}"], ""
+
+    exit_code, messages, timings, output = dispatch(chain, tool_name, tool_input, raw_input)
+
+    if os.environ.get('HOOK_DISPATCH_TIMINGS') == '1':
+        lines = [f"[hook_dispatch] {name}: exit {code} in {ms:.2f} ms"
+                 for name, code, ms in timings]
+        for cache in {id(h['cache']): h['cache'] for h in chain if h['cache']}.values():
+            lines.append(f"[hook_dispatch] verdict cache: {cache.hits} hits, {cache.misses} misses")
+        messages = lines + messages
+    return exit_code, messages, output
+
+
+def main():
+    exit_code, messages, output = handle(sys.stdin.buffer.read())
+    if output:
+        print(output)
+    for message in messages:
+        print(message, file=sys.stderr)
+    sys.exit(exit_code)
+
+
+if __name__ == '__main__':
+    main()
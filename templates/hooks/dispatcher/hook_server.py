@@ -0,0 +1,260 @@
+#!/usr/bin/env python3
+"""
+Hook Server
+
+Optional resident process for hook_dispatch.py. It keeps the hook chain
+imported, with each hook's rules compiled, and answers hook calls over a
+Unix socket. The hook entry is hook_client.py, which only connects, sends
+stdin and prints the answer. If the server isn't running, the client
+evaluates in-process instead.
+
+Each request carries the client's working directory and environment. The
+server applies both while evaluating, so escape hatches
+(ALLOW_DANGEROUS_COMMANDS=1, ...) and relative paths behave as they would
+in a separate hook process. Requests are therefore handled one at a time.
+The config and hook files are re-read when their mtime changes.
+
+Usage:
+    python3 ~/.claude/hooks/hook_server.py start    # Background (pid file next to socket)
+    python3 ~/.claude/hooks/hook_server.py run      # Foreground
+    python3 ~/.claude/hooks/hook_server.py status
+    python3 ~/.claude/hooks/hook_server.py stop
+
+Protocol (one request per connection):
+    request:  JSON header line {"cwd": ..., "env": {...}, "length": N}, then N bytes of hook stdin
+    response: exit code line, stdout text as a JSON string line, then stderr text
+
+A connection that doesn't deliver its request within REQUEST_TIMEOUT_SECONDS,
+or announces more than MAX_HEADER_BYTES / MAX_INPUT_BYTES, is answered with
+an error and closed, so one stuck or oversized client can't hold up the
+sequential server.
+"""
+
+import json
+import os
+import signal
+import socket
+import socketserver
+import subprocess
+import sys
+from pathlib import Path
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+import hook_dispatch  # noqa: E402
+
+SOCKET_ENV = 'HOOK_SERVER_SOCKET'
+DEFAULT_SOCKET = Path.home() / '.claude' / 'hooks' / 'hook_server.sock'
+
+# Time a connection gets to deliver its request. hook_client.py waits longer
+# than this plus the chain's run time for the answer, and never re-evaluates
+# a request it has sent
+REQUEST_TIMEOUT_SECONDS = 5
+MAX_HEADER_BYTES = 1 << 20   # cwd + environment
+MAX_INPUT_BYTES = 64 << 20   # Tool input, e.g. a Write of a large file
+
+
+def socket_path():
+    """Socket path: $HOOK_SERVER_SOCKET, else ~/.claude/hooks/hook_server.sock."""
+    env = os.environ.get(SOCKET_ENV)
+    return Path(env).expanduser() if env else DEFAULT_SOCKET
+
+
+def pid_path(sock_path):
+    return sock_path.with_suffix('.pid')
+
+
+class ChainCache:
+    """The configured chain, reloaded when the config file changes."""
+
+    def __init__(self, path):
+        self.path = path
+        self.mtime_ns = None
+        self.chain = None
+
+    def get(self):
+        mtime_ns = os.stat(self.path).st_mtime_ns
+        if self.chain is None or mtime_ns != self.mtime_ns:
+            self.chain = hook_dispatch.load_config(self.path)
+            self.mtime_ns = mtime_ns
+            # Import every hook now, not on the first call that needs it
+            for hook in self.chain:
+                try:
+                    hook_dispatch.load_hook(hook['path'])
+                except Exception:
+                    pass  # Reported per call by hook_dispatch.run_hook
+        return self.chain
+
+
+def evaluate_as_client(chains, raw_input, cwd, env):
+    """Run hook_dispatch.handle() with the client's cwd and environment."""
+    saved_env = dict(os.environ)
+    saved_cwd = os.getcwd()
+    try:
+        os.environ.clear()
+        os.environ.update(env)
+        os.chdir(cwd)
+        path = hook_dispatch.config_path()
+        cache = chains.setdefault(str(path), ChainCache(path))
+        try:
+            chain = cache.get()
+        except (OSError, ValueError, KeyError, TypeError) as e:
+            return 1, [f"Hook error: Failed to load {path}: {e}"], ""
+        return hook_dispatch.handle(raw_input, chain)
+    finally:
+        os.chdir(saved_cwd)
+        os.environ.clear()
+        os.environ.update(saved_env)
+
+
+def read_request(rfile):
+    """
+    Read one request: the header line, then exactly the announced input bytes.
+
+    Returns: (header dict, raw_input bytes)
+    Raises: ValueError for a malformed, oversized or short request; OSError on timeout
+    """
+    line = rfile.readline(MAX_HEADER_BYTES + 1)
+    if not line.endswith(b'\n'):
+        raise ValueError("header line too long or missing" if line else "empty request")
+    header = json.loads(line)
+    length = header.get('length')
+    if not isinstance(length, int) or isinstance(length, bool) or not 0 <= length <= MAX_INPUT_BYTES:
+        raise ValueError(f"bad input length {length!r} (at most {MAX_INPUT_BYTES} bytes)")
+    raw_input = rfile.read(length)
+    if len(raw_input) != length:
+        raise ValueError(f"request truncated: {len(raw_input)} of {length} input bytes")
+    return header, raw_input
+
+
+class HookRequestHandler(socketserver.StreamRequestHandler):
+    # StreamRequestHandler.setup() applies this with self.request.settimeout()
+    timeout = REQUEST_TIMEOUT_SECONDS
+
+    def handle(self):
+        try:
+            header, raw_input = read_request(self.rfile)
+            exit_code, messages, output = evaluate_as_client(
+                self.server.chains, raw_input, header['cwd'], header['env'])
+        except Exception as e:
+            exit_code, messages, output = 1, [f"Hook error: hook server: {e}"], ""
+        body = '\n'.join(messages)
+        try:
+            self.wfile.write(f"{exit_code}\n{json.dumps(output)}\n{body}".encode('utf-8'))
+        except OSError:
+            pass  # The client was killed (e.g. by Claude Code's hook timeout)
+
+
+class HookServer(socketserver.UnixStreamServer):
+    """Sequential on purpose: each request swaps the process cwd and environment."""
+
+    def __init__(self, sock_path):
+        self.chains = {}
+        super().__init__(str(sock_path), HookRequestHandler)
+
+
+def server_alive(sock_path):
+    """True if something accepts connections on the socket."""
+    client = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    try:
+        client.settimeout(1)
+        client.connect(str(sock_path))
+        return True
+    except OSError:
+        return False
+    finally:
+        client.close()
+
+
+def run(sock_path):
+    """Serve in the foreground until SIGTERM/SIGINT."""
+    if server_alive(sock_path):
+        print(f"Hook server already running on {sock_path}", file=sys.stderr)
+        sys.exit(1)
+    sock_path.parent.mkdir(parents=True, exist_ok=True)
+    if sock_path.exists():
+        sock_path.unlink()  # Stale socket from a server that died
+
+    old_umask = os.umask(0o177)  # Socket readable/writable by this user only
+    try:
+        server = HookServer(sock_path)
+    finally:
+        os.umask(old_umask)
+    pid_path(sock_path).write_text(str(os.getpid()))
+
+    def shutdown(signum, frame):
+        raise KeyboardInterrupt
+    signal.signal(signal.SIGTERM, shutdown)
+
+    try:
+        # Warm the default chain before the first call
+        try:
+            path = hook_dispatch.config_path()
+            server.chains[str(path)] = ChainCache(path)
+            server.chains[str(path)].get()
+        except (OSError, ValueError, KeyError, TypeError):
+            pass
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        for path in (sock_path, pid_path(sock_path)):
+            try:
+                path.unlink()
+            except FileNotFoundError:
+                pass
+
+
+def start(sock_path):
+    """Start the server in the background and wait until it accepts connections."""
+    if server_alive(sock_path):
+        print(json.dumps({"running": True, "socket": str(sock_path), "started": False}))
+        return 0
+    proc = subprocess.Popen([sys.executable, os.path.abspath(__file__), 'run'],
+                            stdin=subprocess.DEVNULL, stdout=subprocess.DEVNULL,
+                            stderr=subprocess.DEVNULL, start_new_session=True)
+    for _ in range(50):
+        if server_alive(sock_path):
+            print(json.dumps({"running": True, "socket": str(sock_path), "pid": proc.pid}))
+            return 0
+        if proc.poll() is not None:
+            break
+        try:
+            proc.wait(timeout=0.1)
+        except subprocess.TimeoutExpired:
+            pass
+    print(json.dumps({"running": False, "error": "server did not start"}))
+    return 1
+
+
+def stop(sock_path):
+    """Stop a background server via its pid file."""
+    try:
+        pid = int(pid_path(sock_path).read_text())
+        os.kill(pid, signal.SIGTERM)
+    except (OSError, ValueError):
+        print(json.dumps({"running": server_alive(sock_path), "stopped": False}))
+        return 1
+    print(json.dumps({"running": False, "stopped": True, "pid": pid}))
+    return 0
+
+
+def main():
+    command = sys.argv[1] if len(sys.argv) > 1 else 'status'
+    sock_path = socket_path()
+    if command == 'run':
+        run(sock_path)
+        sys.exit(0)
+    if command == 'start':
+        sys.exit(start(sock_path))
+    if command == 'stop':
+        sys.exit(stop(sock_path))
+    if command == 'status':
+        print(json.dumps({"running": server_alive(sock_path), "socket": str(sock_path)}))
+        sys.exit(0)
+    print("Usage: hook_server.py start|run|status|stop", file=sys.stderr)
+    sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
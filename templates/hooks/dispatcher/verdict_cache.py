@@ -0,0 +1,179 @@
+#!/usr/bin/env python3
+"""
+Verdict Cache
+
+Opt-in SQLite cache of hook verdicts for hook_dispatch.py, shared by every
+hook invocation that uses the same file. Agents re-run the same commands
+(test runs, builds, `git status`) many times per session; a cached verdict
+is one indexed lookup instead of a hook evaluation.
+
+Keys are hashes of (hook path, ruleset digest, the hook's cache_key()), so
+editing a hook or its rules changes every key for it: stale verdicts are
+never read again and age out. Least recently used rows are evicted once the
+table grows past max_entries.
+
+The cache is disposable. Any SQLite error (locked, corrupt, read-only) is
+treated as a miss and the hook simply runs.
+
+Usage:
+    python3 verdict_cache.py stats [PATH]
+    python3 verdict_cache.py clear [PATH]
+"""
+
+import hashlib
+import json
+import sqlite3
+import sys
+import time
+from pathlib import Path
+
+DEFAULT_PATH = Path.home() / '.claude' / 'hooks' / 'hook_verdicts.sqlite'
+DEFAULT_MAX_ENTRIES = 10000
+
+# Only these are stored: allow (with any warning text) and block. Errors are retried.
+CACHEABLE_CODES = (0, 2)
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS verdicts (
+    key TEXT PRIMARY KEY,
+    exit_code INTEGER NOT NULL,
+    message TEXT NOT NULL,
+    used INTEGER NOT NULL
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS verdicts_used ON verdicts (used);
+"""
+
+
+def make_key(*parts):
+    """Hash key parts (strings) into a cache key."""
+    return hashlib.sha256('\0'.join(parts).encode('utf-8', errors='surrogatepass')).hexdigest()[:32]
+
+
+class VerdictCache:
+    """SQLite verdict table with LRU eviction. Connects on first use."""
+
+    def __init__(self, path=DEFAULT_PATH, max_entries=DEFAULT_MAX_ENTRIES):
+        self.path = Path(path).expanduser()
+        self.max_entries = max_entries
+        self.conn = None
+        self.hits = 0
+        self.misses = 0
+
+    def key(self, *parts):
+        return make_key(*parts)
+
+    def connect(self):
+        if self.conn is None:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            conn = sqlite3.connect(str(self.path), timeout=0.2, isolation_level=None)
+            # WAL lets concurrent hook processes read while one writes; a lost
+            # write on power failure only costs a re-evaluation.
+            conn.execute('PRAGMA journal_mode=WAL')
+            conn.execute('PRAGMA synchronous=OFF')
+            conn.executescript(SCHEMA)
+            self.conn = conn
+        return self.conn
+
+    def get(self, key):
+        """
+        Look up a verdict and mark it used.
+
+        Returns: (exit_code, message), or None on a miss or any SQLite error
+        """
+        try:
+            conn = self.connect()
+            row = conn.execute('SELECT exit_code, message FROM verdicts WHERE key = ?',
+                               (key,)).fetchone()
+            if row is not None:
+                conn.execute('UPDATE verdicts SET used = ? WHERE key = ?', (time.time_ns(), key))
+        except sqlite3.Error:
+            row = None
+        if row is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        return row[0], row[1]
+
+    def put(self, key, exit_code, message):
+        """Store a verdict (0 and 2 only) and evict least recently used rows over the cap."""
+        if exit_code not in CACHEABLE_CODES:
+            return
+        try:
+            conn = self.connect()
+            conn.execute('INSERT OR REPLACE INTO verdicts VALUES (?, ?, ?, ?)',
+                         (key, exit_code, message or "", time.time_ns()))
+            # Only misses write, so the count query stays off the hit path
+            (count,) = conn.execute('SELECT COUNT(*) FROM verdicts').fetchone()
+            if count > self.max_entries:
+                conn.execute('DELETE FROM verdicts WHERE key IN '
+                             '(SELECT key FROM verdicts ORDER BY used LIMIT ?)',
+                             (count - self.max_entries,))
+        except sqlite3.Error:
+            pass
+
+    def stats(self):
+        conn = self.connect()
+        (count,) = conn.execute('SELECT COUNT(*) FROM verdicts').fetchone()
+        blocked = conn.execute('SELECT COUNT(*) FROM verdicts WHERE exit_code = 2').fetchone()[0]
+        return {
+            "path": str(self.path),
+            "entries": count,
+            "blocked": blocked,
+            "max_entries": self.max_entries,
+            "bytes": self.path.stat().st_size if self.path.exists() else 0,
+        }
+
+    def clear(self):
+        self.connect().execute('DELETE FROM verdicts')
+
+    def close(self):
+        if self.conn is not None:
+            self.conn.close()
+            self.conn = None
+
+
+_caches = {}
+
+
+def open_cache(settings):
+    """
+    VerdictCache for a `verdict_cache` config value, one per path per process.
+
+    Args:
+        settings: true (defaults), or {"path": ..., "max_entries": ...}
+
+    Returns: VerdictCache, or None if disabled
+    """
+    if not settings:
+        return None
+    if settings is True:
+        settings = {}
+    path = Path(settings.get('path', DEFAULT_PATH)).expanduser()
+    max_entries = int(settings.get('max_entries', DEFAULT_MAX_ENTRIES))
+    cache = _caches.get(str(path))
+    if cache is None:
+        cache = _caches[str(path)] = VerdictCache(path, max_entries)
+    cache.max_entries = max_entries
+    return cache
+
+
+def main():
+    command = sys.argv[1] if len(sys.argv) > 1 else 'stats'
+    path = sys.argv[2] if len(sys.argv) > 2 else DEFAULT_PATH
+    cache = VerdictCache(path)
+    try:
+        if command == 'clear':
+            cache.clear()
+            print(json.dumps({"path": str(cache.path), "cleared": True}))
+        elif command == 'stats':
+            print(json.dumps(cache.stats(), indent=2))
+        else:
+            print("Usage: verdict_cache.py stats|clear [PATH]", file=sys.stderr)
+            sys.exit(1)
+    except sqlite3.Error as e:
+        print(json.dumps({"path": str(cache.path), "error": str(e)}))
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
@@ -11,42 +11,60 @@ import json
 from datetime import datetime
 from pathlib import Path
 
+try:
+    import hook_input
+except ImportError:  # Optional: streaming stdin reader (hook_input.py next to this hook)
+    hook_input = None
+
 LOG_FILE = Path.home() / '.claude' / 'command-log.txt'
 
+# Only these fields are decoded from stdin when hook_input.py is available
+INPUT_FIELDS = ['tool_name', 'tool_input.command']
+
 def read_hook_input():
     try:
-        data = json.load(sys.stdin)
+        if hook_input is not None:
+            data = hook_input.read_fields(INPUT_FIELDS, tools=['Bash'])
+        else:
+            data = json.load(sys.stdin)
         return data.get('tool_name'), data.get('tool_input', {})
     except (json.JSONDecodeError, KeyError) as e:
         print(f"Hook error: {e}", file=sys.stderr)
         sys.exit(1)
 
-def main():
-    tool_name, tool_input = read_hook_input()
-
+def evaluate(tool_name, tool_input):
+    """Log one tool call. Always allows; returns (0, warning) if logging failed."""
     # Only log Bash commands
     if tool_name != 'Bash':
-        sys.exit(0)
+        return 0, ""
 
     command = tool_input.get('command', '')
     if not command:
-        sys.exit(0)
-
-    # Create log directory if needed
-    LOG_FILE.parent.mkdir(parents=True, exist_ok=True)
+        return 0, ""
 
     # Log command with timestamp
     timestamp = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
     log_entry = f"[{timestamp}] {command}\n"
 
     try:
+        # Create log directory if needed
+        LOG_FILE.parent.mkdir(parents=True, exist_ok=True)
         with open(LOG_FILE, 'a') as f:
             f.write(log_entry)
     except Exception as e:
         # Don't block if logging fails
-        print(f"Hook error: Failed to log command: {e}", file=sys.stderr)
+        return 0, f"Hook error: Failed to log command: {e}"
+
+    return 0, ""
+
+def main():
+    tool_name, tool_input = read_hook_input()
+
+    exit_code, message = evaluate(tool_name, tool_input)
+    if message:
+        print(message, file=sys.stderr)
 
-    sys.exit(0)  # Always allow
+    sys.exit(exit_code)  # Always allow
 
 if __name__ == '__main__':
     main()
@@ -9,6 +9,11 @@ Prevents common footguns like:
 - Force pushes to protected branches
 - Database drops/deletes without confirmation
 
+Commands are split into segments on |, &&, ||, ;, &, newlines, subshells and
+command substitutions (no shell is spawned). The early exit applies only when
+every segment starts with a safe prefix. Heredoc bodies are scanned as
+commands, except those only written to a file (`cat > notes.md <<'EOF'`).
+
 Based on patterns from TheDecipherist/claude-code-mastery, adapted for internal use.
 
 Exit codes:
@@ -21,6 +26,17 @@ import sys
 import json
 import os
 import re
+import hashlib
+
+try:
+    import hook_input
+except ImportError:  # Optional: streaming stdin reader (hook_input.py next to this hook)
+    hook_input = None
+
+try:
+    import rule_packs
+except ImportError:  # Optional: JSON/TOML rule packs (rule_packs.py next to this hook)
+    rule_packs = None
 
 # =============================================================================
 # CONFIGURATION - Edit these patterns for your needs
@@ -89,10 +105,31 @@ ALWAYS_ALLOWED_PREFIXES = [
 # IMPLEMENTATION
 # =============================================================================
 
+# Lists above, extended by rule packs when rule_packs.py is available
+RULE_PACK_STAMP = None
+_builtin_rules = {
+    'ALWAYS_BLOCKED': ALWAYS_BLOCKED,
+    'WARN_PATTERNS': WARN_PATTERNS,
+    'ALWAYS_ALLOWED_PREFIXES': ALWAYS_ALLOWED_PREFIXES,
+}
+if rule_packs is not None:
+    _rules, RULE_PACK_STAMP = rule_packs.load(
+        'dangerous-commands-blocker', __file__, _builtin_rules,
+        loosening={'ALWAYS_ALLOWED_PREFIXES'}, regex={'ALWAYS_BLOCKED', 'WARN_PATTERNS'})
+    ALWAYS_BLOCKED = _rules['ALWAYS_BLOCKED']
+    WARN_PATTERNS = _rules['WARN_PATTERNS']
+    ALWAYS_ALLOWED_PREFIXES = _rules['ALWAYS_ALLOWED_PREFIXES']
+
+# Only these fields are decoded from stdin when hook_input.py is available
+INPUT_FIELDS = ['tool_name', 'tool_input.command']
+
 def read_hook_input():
     """Read JSON input from stdin."""
     try:
-        data = json.load(sys.stdin)
+        if hook_input is not None:
+            data = hook_input.read_fields(INPUT_FIELDS, tools=['Bash'])
+        else:
+            data = json.load(sys.stdin)
         return data.get('tool_name'), data.get('tool_input', {})
     except (json.JSONDecodeError, KeyError) as e:
         print(f"Hook error: {e}", file=sys.stderr)
@@ -110,56 +147,390 @@ def block_execution(message):
     sys.exit(2)
 
 
+def build_prefix_trie(prefixes):
+    """Character trie of lowercased prefixes; END marks where a prefix ends."""
+    trie = {}
+    for prefix in prefixes:
+        node = trie
+        for char in prefix.lower():
+            node = node.setdefault(char, {})
+        node[END] = True
+    return trie
+
+
+def leading_char(pattern):
+    """The literal character a rule must start with, or None if it can vary."""
+    if pattern[:1] == '\\' and pattern[1:2] and not pattern[1].isalnum():
+        first, rest = pattern[1], pattern[2:]
+    elif pattern[:1] and pattern[0] not in '.^$*+?{}[]\\|()':
+        first, rest = pattern[0], pattern[1:]
+    else:
+        return None
+    if rest[:1] in ('?', '*', '{'):
+        return None  # Optional first character
+    return first
+
+
+def build_matcher(blocked, warnings):
+    """
+    Compile all rules into one regex, scanned once per command.
+
+    Every rule becomes a zero-width lookahead alternative with a named group
+    (b<i> for blocked, w<i> for warnings), so rules never consume text and
+    hide each other. At each position the first matching alternative is
+    reported, which makes the lowest-numbered match over the whole scan the
+    same rule the per-pattern loop would have found first. Rules must not
+    use numbered backreferences.
+
+    When every rule starts with a literal character, a one-character class
+    of those is checked first, so most positions are skipped at once.
+    """
+    rules = [('b', i, pattern) for i, (pattern, _) in enumerate(blocked)]
+    rules += [('w', i, pattern) for i, (pattern, _) in enumerate(warnings)]
+    combined = '|'.join(f'(?=(?P<{kind}{i}>{pattern}))' for kind, i, pattern in rules)
+    firsts = [leading_char(pattern) for _, _, pattern in rules]
+    if firsts and None not in firsts:
+        combined = f"(?=[{re.escape(''.join(sorted(set(firsts))))}])(?:{combined})"
+    return re.compile(combined, re.IGNORECASE)
+
+
+try:
+    RULE_MATCHER = build_matcher(ALWAYS_BLOCKED, WARN_PATTERNS)
+except re.error as e:
+    # A pack rule that doesn't combine with the others: never run without the built-in ones
+    print(f"Rule pack warning: {e}; using the built-in rules only", file=sys.stderr)
+    ALWAYS_BLOCKED = _builtin_rules['ALWAYS_BLOCKED']
+    WARN_PATTERNS = _builtin_rules['WARN_PATTERNS']
+    ALWAYS_ALLOWED_PREFIXES = _builtin_rules['ALWAYS_ALLOWED_PREFIXES']
+    RULE_MATCHER = build_matcher(ALWAYS_BLOCKED, WARN_PATTERNS)
+
+END = None
+ALLOWED_TRIE = build_prefix_trie(ALWAYS_ALLOWED_PREFIXES)
+RULESET_HASH = hashlib.sha256(json.dumps(
+    [ALWAYS_BLOCKED, WARN_PATTERNS, ALWAYS_ALLOWED_PREFIXES]).encode()).hexdigest()[:16]
+
+
 def is_allowed_command(command):
-    """Check if command starts with an always-allowed prefix."""
-    command_lower = command.strip().lower()
-    for prefix in ALWAYS_ALLOWED_PREFIXES:
-        if command_lower.startswith(prefix.lower()):
+    """Check if command starts with an always-allowed prefix (one trie walk)."""
+    node = ALLOWED_TRIE
+    if END in node:
+        return True  # An empty prefix allows everything
+    for char in command.strip().lower():
+        node = node.get(char)
+        if node is None:
+            return False
+        if END in node:
             return True
     return False
 
 
+def first_matches(command):
+    """Indices of the first matching blocked and warning rules (len(list) if none)."""
+    first_block = len(ALWAYS_BLOCKED)
+    first_warn = len(WARN_PATTERNS)
+    for match in RULE_MATCHER.finditer(command):
+        name = match.lastgroup
+        index = int(name[1:])
+        if name[0] == 'b':
+            first_block = min(first_block, index)
+            if first_block == 0:
+                break
+        else:
+            first_warn = min(first_warn, index)
+    return first_block, first_warn
+
+
 def check_dangerous_patterns(command):
     """
     Check command against dangerous patterns.
 
+    Blocked rules win over warnings, and earlier rules over later ones, as
+    if each list were checked in order.
+
     Returns: (is_blocked: bool, reason: str, is_warning: bool)
     """
+    return verdict(*first_matches(command))
+
+
+def check_texts(texts):
+    """check_dangerous_patterns() over several texts: the first rule matching any of them."""
+    first_block = len(ALWAYS_BLOCKED)
+    first_warn = len(WARN_PATTERNS)
+    for text in texts:
+        block, warn = first_matches(text)
+        first_block = min(first_block, block)
+        first_warn = min(first_warn, warn)
+    return verdict(first_block, first_warn)
+
+
+def verdict(first_block, first_warn):
+    """(is_blocked, reason, is_warning) for first_matches() indices."""
     # Check always-blocked patterns first
-    for pattern, reason in ALWAYS_BLOCKED:
-        if re.search(pattern, command, re.IGNORECASE):
-            return True, reason, False
+    if first_block < len(ALWAYS_BLOCKED):
+        return True, ALWAYS_BLOCKED[first_block][1], False
 
     # Check warning patterns (allowed but flagged)
-    for pattern, reason in WARN_PATTERNS:
-        if re.search(pattern, command, re.IGNORECASE):
-            return False, reason, True
+    if first_warn < len(WARN_PATTERNS):
+        return False, WARN_PATTERNS[first_warn][1], True
 
     return False, "", False
 
 
-def main():
-    # Check for escape hatch
+HEREDOC_PATTERN = re.compile(r"""<<(-?)[ \t]*(?:'([^'\n]*)'|"([^"\n]*)"|\\?([^\s;&|<>()'"]+))""")
+# The only heredoc consumers whose body is skipped, and only with stdout in a file.
+# Not a rule pack list: everything else (ssh, xargs, source, docker exec, ...) may run it.
+HEREDOC_FILE_WRITERS = ('cat', 'tee')
+# Stdout redirected to a file: >f, >>f, 1>f, &>f (not >&2, not >(...) or /dev/stdout)
+STDOUT_TO_FILE = re.compile(r'(?:^|\s)[1&]?>>?\s*(?![&>(<|;]|/dev/(?:stdout|fd/|tty)|/proc/)\S')
+# Leading words that aren't the command itself
+COMMAND_PREFIX_WORDS = {'sudo', 'env', 'command', 'exec', 'nohup', 'time', 'nice',
+                        'if', 'then', 'else', 'elif', 'do', 'while', 'until', '!', '{'}
+ASSIGNMENT_PATTERN = re.compile(r'^[A-Za-z_][A-Za-z0-9_]*=')
+# Without any of these a command is one segment and needs no scan
+SEPARATOR_CHARS = re.compile(r'[|&;()`\n<#]')
+
+
+def split_command(command):
+    """
+    Split a shell command into simple-command segments, without a shell.
+
+    Splits on |, ||, &&, ;, &, newlines, ( ) subshells, $( ) and backtick
+    substitutions. Quotes and backslash escapes are respected, # comments
+    dropped, and heredoc bodies cut out (read up to their delimiter line).
+    Redirections like 2>&1 and &> don't split.
+
+    Returns:
+        tuple: (segments [{"text", "op"}] where op is the operator before the
+        segment, heredocs [{"segment", "start", "end", "body"}] with the
+        body's character span in `command`)
+    """
+    if not SEPARATOR_CHARS.search(command):
+        text = command.strip()
+        return ([{"text": text, "op": None}] if text else []), []
+
+    segments = []
+    heredocs = []
+    pending = []  # (delimiter, strip_tabs, segment index) waiting for the next newline
+    buf = []
+    op = None
+    quote = None
+    i = 0
+    n = len(command)
+
+    def flush(next_op):
+        nonlocal buf, op
+        text = ''.join(buf).strip()
+        if text.startswith('{ '):
+            text = text[2:].lstrip()
+        if text and text != '}':
+            segments.append({"text": text, "op": op})
+        buf = []
+        op = next_op
+
+    while i < n:
+        c = command[i]
+        if quote == "'":
+            buf.append(c)
+            if c == "'":
+                quote = None
+            i += 1
+        elif c == '\\' and i + 1 < n:
+            buf.append(command[i:i + 2])
+            i += 2
+        elif quote == '"':
+            buf.append(c)
+            if c == '"':
+                quote = None
+            i += 1
+        elif c in '\'"':
+            quote = c
+            buf.append(c)
+            i += 1
+        elif c == '#' and (not buf or buf[-1][-1:].isspace()):
+            end = command.find('\n', i)
+            i = n if end == -1 else end
+        elif c == '\n':
+            flush('\n')
+            i += 1
+            for delimiter, strip_tabs, index in pending:
+                start = i
+                body = []
+                while i < n:
+                    end = command.find('\n', i)
+                    line = command[i:n if end == -1 else end]
+                    i = n if end == -1 else end + 1
+                    if (line.lstrip('\t') if strip_tabs else line) == delimiter:
+                        break
+                    body.append(line)
+                heredocs.append({"segment": index, "start": start, "end": i,
+                                 "body": '\n'.join(body)})
+            pending = []
+        elif command.startswith('<<', i) and not command.startswith('<<<', i):
+            match = HEREDOC_PATTERN.match(command, i)
+            if match:
+                delimiter = next(g for g in match.groups()[1:] if g is not None)
+                pending.append((delimiter, match.group(1) == '-', len(segments)))
+                buf.append(match.group(0))
+                i = match.end()
+            else:
+                buf.append('<<')
+                i += 2
+        elif c == '|':
+            double = command.startswith('||', i)
+            flush('||' if double else '|')
+            i += 2 if double or command.startswith('|&', i) else 1
+        elif c == '&':
+            if command.startswith('&&', i):
+                flush('&&')
+                i += 2
+            elif (buf and buf[-1][-1:] in '<>') or command.startswith('&>', i):
+                buf.append(c)  # Redirection (2>&1, &>file), not an operator
+                i += 1
+            else:
+                flush('&')
+                i += 1
+        elif c == ';':
+            flush(';')
+            i += 2 if command.startswith(';;', i) else 1
+        elif c in '()`':
+            if c == '(' and buf and buf[-1] == '$':
+                buf.pop()  # $( ... ): the substitution is its own segment
+            flush(c)
+            i += 1
+        else:
+            buf.append(c)
+            i += 1
+
+    flush(None)
+    return segments, heredocs
+
+
+def command_word(text):
+    """The command a segment runs (basename), skipping sudo/env/VAR=value prefixes."""
+    for word in text.split():
+        if word in COMMAND_PREFIX_WORDS or ASSIGNMENT_PATTERN.match(word) or word.startswith('-'):
+            continue
+        return os.path.basename(word.strip('\'"'))
+    return ''
+
+
+def writes_to_file(segments, group, index):
+    """
+    True if the heredoc of segments[index] only ends up in a file: the
+    segment is plain `cat`/`tee` (or `sudo tee`) with stdout redirected to
+    a file, and it isn't piped into a later segment.
+    """
+    text = segments[index]['text']
+    words = text.split()
+    if words[0] == 'sudo':
+        words = words[1:]
+    return (bool(words) and words[0] in HEREDOC_FILE_WRITERS
+            and group[-1] == index
+            and bool(STDOUT_TO_FILE.search(text)))
+
+
+def pipelines(segments):
+    """Group segment indices into pipelines (segments joined by |)."""
+    groups = []
+    for index, segment in enumerate(segments):
+        if segment['op'] == '|' and groups:
+            groups[-1].append(index)
+        else:
+            groups.append([index])
+    return groups
+
+
+def analyze_command(command, depth=0):
+    """
+    Segment a command for the allowlist and the rule scan.
+
+    A heredoc body is analyzed as a command too (up to 3 levels deep; deeper
+    bodies are still scanned as part of the full text), since the consumer
+    may run it (bash, ssh, source, xargs, docker exec -i, ...). Only bodies
+    that writes_to_file() are removed before scanning, so long file-writing
+    heredocs cost nothing.
+
+    Returns:
+        tuple: (allowed: bool, texts to scan: [full command without skipped
+        heredoc bodies, then each pipeline])
+    """
+    segments, heredocs = split_command(command)
+    groups = pipelines(segments)
+    pipeline_of = {index: group for group in groups for index in group}
+
+    allowed = bool(segments)
+    texts = []
+    kept = []  # heredoc spans to cut, in order
+    for heredoc in heredocs:
+        index = heredoc['segment']
+        if index < len(segments) and writes_to_file(segments, pipeline_of[index], index):
+            kept.append((heredoc['start'], heredoc['end']))
+            continue
+        allowed = False
+        if depth < 3:
+            texts += analyze_command(heredoc['body'], depth + 1)[1]
+
+    for segment in segments:
+        text = segment['text']
+        if not is_allowed_command(text) or '$(' in text or '`' in text:
+            allowed = False
+
+    stripped = []
+    position = 0
+    for start, end in kept:
+        stripped.append(command[position:start])
+        position = end
+    stripped.append(command[position:])
+    texts.insert(0, ''.join(stripped))
+    if len(segments) > 1:
+        texts += [' | '.join(segments[i]['text'] for i in group) for group in groups]
+    return allowed, texts
+
+
+def cache_key(tool_name, tool_input):
+    """
+    What the verdict depends on, for hook_dispatch.py's verdict cache: the
+    exact command text (rules are whitespace- and case-sensitive in places).
+    None while the escape hatch is set, so its allows aren't reused.
+    """
     if os.environ.get('ALLOW_DANGEROUS_COMMANDS') == '1':
-        allow_execution()
+        return None
+    if tool_name != 'Bash':
+        return None
+    return tool_input.get('command') or None
 
-    tool_name, tool_input = read_hook_input()
+
+def ruleset_hash():
+    """Digest of the rule lists (rule packs included), part of every verdict cache key."""
+    return RULESET_HASH
+
+
+def evaluate(tool_name, tool_input):
+    """
+    Check one tool call (used by main() and by hook_dispatch.py in-process).
+
+    Returns: (exit_code: int, message: str)
+    """
+    # Check for escape hatch
+    if os.environ.get('ALLOW_DANGEROUS_COMMANDS') == '1':
+        return 0, ""
 
     # Only check Bash tool
     if tool_name != 'Bash':
-        allow_execution()
+        return 0, ""
 
     # Get command from tool input
     command = tool_input.get('command', '')
     if not command:
-        allow_execution()
+        return 0, ""
 
-    # Early exit for safe commands (performance optimization)
-    if is_allowed_command(command):
-        allow_execution()
+    # Early exit when every segment is a safe command (performance optimization)
+    allowed, texts = analyze_command(command)
+    if allowed:
+        return 0, ""
 
-    # Check for dangerous patterns
-    is_blocked, reason, is_warning = check_dangerous_patterns(command)
+    # Check for dangerous patterns (whole command and each pipeline)
+    is_blocked, reason, is_warning = check_texts(texts)
 
     if is_blocked:
         error_message = f"""
@@ -185,10 +556,24 @@ Alternative approaches:
 To modify the blocklist:
   Edit ~/.claude/hooks/dangerous-commands-blocker.py
 """
-        block_execution(error_message)
+        return 2, error_message
 
     # Warnings are logged but not blocked (could add stderr output here if desired)
 
+    return 0, ""
+
+
+def main():
+    # Check for escape hatch
+    if os.environ.get('ALLOW_DANGEROUS_COMMANDS') == '1':
+        allow_execution()
+
+    tool_name, tool_input = read_hook_input()
+
+    exit_code, message = evaluate(tool_name, tool_input)
+    if exit_code == 2:
+        block_execution(message)
+
     allow_execution()
 
 
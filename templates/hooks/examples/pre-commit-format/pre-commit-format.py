@@ -11,9 +11,20 @@ import json
 import subprocess
 from pathlib import Path
 
+try:
+    import hook_input
+except ImportError:  # Optional: streaming stdin reader (hook_input.py next to this hook)
+    hook_input = None
+
+# Only these fields are decoded from stdin when hook_input.py is available
+INPUT_FIELDS = ['tool_name', 'tool_input.command']
+
 def read_hook_input():
     try:
-        data = json.load(sys.stdin)
+        if hook_input is not None:
+            data = hook_input.read_fields(INPUT_FIELDS, tools=['Bash'])
+        else:
+            data = json.load(sys.stdin)
         return data.get('tool_name'), data.get('tool_input', {})
     except (json.JSONDecodeError, KeyError) as e:
         print(f"Hook error: {e}", file=sys.stderr)
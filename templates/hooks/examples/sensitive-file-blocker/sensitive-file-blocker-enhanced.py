@@ -7,6 +7,11 @@ PreToolUse hook that blocks access to sensitive files using multiple detection s
 2. Extension-based detection (certificates, keys)
 3. Keyword pattern matching (paths containing 'secrets', 'credentials', etc.)
 
+The rules are compiled into lookup tables and one pattern regex at load
+time. Paths are checked as given (with ./ and ../ collapsed) and, if that
+passes, as their real path, so `./a/../.env` and symlinks pointing at
+secrets are caught too.
+
 Based on patterns from TheDecipherist/claude-code-mastery, adapted for internal use.
 
 Exit codes:
@@ -18,7 +23,20 @@ Exit codes:
 import sys
 import json
 import os
+import hashlib
+import posixpath
 import re
+import time
+
+try:
+    import hook_input
+except ImportError:  # Optional: streaming stdin reader (hook_input.py next to this hook)
+    hook_input = None
+
+try:
+    import rule_packs
+except ImportError:  # Optional: JSON/TOML rule packs (rule_packs.py next to this hook)
+    rule_packs = None
 
 # =============================================================================
 # CONFIGURATION - Edit these lists for your needs
@@ -101,14 +119,38 @@ BLOCKED_PATH_PATTERNS = [
 # Set to True to also block Read operations on sensitive files
 BLOCK_READ_OPERATIONS = False
 
+# How long a resolved real path is reused (a long-lived hook server sees new symlinks after this)
+REALPATH_TTL_SECONDS = 2.0
+
 # =============================================================================
 # IMPLEMENTATION
 # =============================================================================
 
+# Lists above, extended by rule packs when rule_packs.py is available
+RULE_PACK_STAMP = None
+_builtin_rules = {
+    'BLOCKED_FILENAMES': BLOCKED_FILENAMES,
+    'BLOCKED_EXTENSIONS': BLOCKED_EXTENSIONS,
+    'BLOCKED_PATH_PATTERNS': BLOCKED_PATH_PATTERNS,
+}
+if rule_packs is not None:
+    _rules, RULE_PACK_STAMP = rule_packs.load(
+        'sensitive-file-blocker-enhanced', __file__, _builtin_rules,
+        regex={'BLOCKED_PATH_PATTERNS'})
+    BLOCKED_FILENAMES = _rules['BLOCKED_FILENAMES']
+    BLOCKED_EXTENSIONS = _rules['BLOCKED_EXTENSIONS']
+    BLOCKED_PATH_PATTERNS = _rules['BLOCKED_PATH_PATTERNS']
+
+# Only these fields are decoded from stdin when hook_input.py is available
+INPUT_FIELDS = ['tool_name', 'tool_input.file_path']
+
 def read_hook_input():
     """Read JSON input from stdin."""
     try:
-        data = json.load(sys.stdin)
+        if hook_input is not None:
+            data = hook_input.read_fields(INPUT_FIELDS)
+        else:
+            data = json.load(sys.stdin)
         return data.get('tool_name'), data.get('tool_input', {})
     except (json.JSONDecodeError, KeyError) as e:
         print(f"Hook error: {e}", file=sys.stderr)
@@ -126,23 +168,108 @@ def block_execution(message):
     sys.exit(2)
 
 
-def get_filename(path):
-    """Extract just the filename from a path."""
-    return os.path.basename(path)
+def leading_char(pattern):
+    """The literal character a pattern must start with, or None if it can vary."""
+    if '|' in pattern:
+        return None  # An alternative may start with anything
+    if pattern[:1] == '\\' and pattern[1:2] and not pattern[1].isalnum():
+        first, rest = pattern[1], pattern[2:]
+    elif pattern[:1] and pattern[0] not in '.^$*+?{}[]\\|()':
+        first, rest = pattern[0], pattern[1:]
+    else:
+        return None
+    if rest[:1] in ('?', '*', '{'):
+        return None  # Optional first character
+    return first
+
+
+def build_pattern_matcher(patterns):
+    """
+    Compile BLOCKED_PATH_PATTERNS into one alternation, scanned once per path.
 
+    Most paths match nothing, so this only answers whether any pattern
+    matches; classify() then names the first one in list order. When every
+    pattern starts with a literal character, positions not starting with
+    one of those are skipped at once.
+    """
+    if not patterns:
+        return re.compile(r'(?!)')
+    combined = '|'.join(f'(?:{pattern})' for pattern in patterns)
+    firsts = [leading_char(pattern) for pattern in patterns]
+    if None not in firsts:
+        combined = f"(?=[{re.escape(''.join(sorted(set(firsts))))}])(?:{combined})"
+    return re.compile(combined, re.IGNORECASE)
+
+
+try:
+    PATTERN_MATCHER = build_pattern_matcher(BLOCKED_PATH_PATTERNS)
+except re.error as e:
+    # A pack rule that doesn't combine with the others: never run without the built-in ones
+    print(f"Rule pack warning: {e}; using the built-in rules only", file=sys.stderr)
+    BLOCKED_FILENAMES = _builtin_rules['BLOCKED_FILENAMES']
+    BLOCKED_EXTENSIONS = _builtin_rules['BLOCKED_EXTENSIONS']
+    BLOCKED_PATH_PATTERNS = _builtin_rules['BLOCKED_PATH_PATTERNS']
+    PATTERN_MATCHER = build_pattern_matcher(BLOCKED_PATH_PATTERNS)
+
+# Entries with a '/' match the end of a path (/home/me/.aws/credentials)
+PATH_SUFFIXES = tuple(sorted('/' + name for name in BLOCKED_FILENAMES if '/' in name))
+LOWER_EXTENSIONS = {ext.lower() for ext in BLOCKED_EXTENSIONS}
+COMPILED_PATTERNS = [re.compile(pattern, re.IGNORECASE) for pattern in BLOCKED_PATH_PATTERNS]
+RULESET_HASH = hashlib.sha256(json.dumps([
+    sorted(BLOCKED_FILENAMES), sorted(BLOCKED_EXTENSIONS), BLOCKED_PATH_PATTERNS]).encode()).hexdigest()[:16]
+
+
+def classify(path):
+    """
+    First matching reason for a normalized path, or "".
 
-def get_extension(path):
-    """Extract the file extension (including the dot)."""
-    _, ext = os.path.splitext(path)
-    return ext.lower()
+    Checks filename, path suffix, extension, then patterns, in that order.
+    The first three are set and suffix lookups; the patterns are one scan,
+    and only a path that matches is checked pattern by pattern for the reason.
+    """
+    filename = path.rpartition('/')[2]
+    if filename in BLOCKED_FILENAMES:
+        return f"Blocked filename: {filename}"
+    rooted = '/' + path
+    if rooted.endswith(PATH_SUFFIXES):
+        entry = next(suffix for suffix in PATH_SUFFIXES if rooted.endswith(suffix))
+        return f"Blocked path: {entry[1:]}"
+    # Same rule as os.path.splitext: leading dots don't start an extension
+    _, dot, ext = filename.lstrip('.').rpartition('.')
+    ext = '.' + ext.lower()
+    if dot and ext in LOWER_EXTENSIONS:
+        return f"Blocked extension: {ext}"
+    if PATTERN_MATCHER.search(path):
+        for pattern, compiled in zip(BLOCKED_PATH_PATTERNS, COMPILED_PATTERNS):
+            if compiled.search(path):
+                return f"Blocked pattern: {pattern}"
+    return ""
 
 
 def normalize_path(path):
-    """Normalize path for consistent matching."""
-    # Remove leading ./ and normalize separators
-    path = path.lstrip('./')
+    """Normalize path for consistent matching (separators, ./ and ../ segments)."""
     path = path.replace('\\', '/')
-    return path
+    return posixpath.normpath(path) if path else path
+
+
+_realpaths = {}
+
+
+def canonical_path(file_path):
+    """
+    Absolute path with symlinks resolved, memoized per path for
+    REALPATH_TTL_SECONDS (evaluate() and cache_key() both need it).
+    """
+    absolute = os.path.abspath(os.path.expanduser(file_path))
+    now = time.monotonic()
+    cached = _realpaths.get(absolute)
+    if cached is not None and now - cached[0] < REALPATH_TTL_SECONDS:
+        return cached[1]
+    real = normalize_path(os.path.realpath(absolute))
+    if len(_realpaths) >= 1024:
+        _realpaths.clear()
+    _realpaths[absolute] = (now, real)
+    return real
 
 
 def is_sensitive_file(file_path):
@@ -152,38 +279,53 @@ def is_sensitive_file(file_path):
     2. Extension match
     3. Path pattern match
 
+    The path as given is checked first, then its real path (symlinks
+    resolved, relative paths made absolute).
+
     Returns: (is_sensitive: bool, reason: str)
     """
     normalized = normalize_path(file_path)
-    filename = get_filename(normalized)
-    extension = get_extension(normalized)
+    reason = classify(normalized)
+    if reason:
+        return True, reason
 
-    # Strategy 1: Exact filename match
-    if filename in BLOCKED_FILENAMES:
-        return True, f"Blocked filename: {filename}"
+    real = canonical_path(file_path)
+    if real != normalized:
+        reason = classify(real)
+        if reason:
+            return True, f"{reason} (resolves to {real})"
+
+    return False, ""
 
-    # Also check if full relative path matches (for nested paths like .aws/credentials)
-    if normalized in BLOCKED_FILENAMES:
-        return True, f"Blocked path: {normalized}"
 
-    # Strategy 2: Extension match
-    if extension in BLOCKED_EXTENSIONS:
-        return True, f"Blocked extension: {extension}"
+def cache_key(tool_name, tool_input):
+    """
+    What the verdict depends on, for hook_dispatch.py's verdict cache: tool,
+    file path as given, and its real path (so a changed symlink is a new
+    key). None while the escape hatch is set.
+    """
+    if os.environ.get('ALLOW_SENSITIVE_ACCESS') == '1':
+        return None
+    file_path = tool_input.get('file_path')
+    if not file_path:
+        return None
+    return f"{tool_name}\0{file_path}\0{canonical_path(file_path)}"
 
-    # Strategy 3: Path pattern match
-    for pattern in BLOCKED_PATH_PATTERNS:
-        if re.search(pattern, normalized, re.IGNORECASE):
-            return True, f"Blocked pattern: {pattern}"
 
-    return False, ""
+def ruleset_hash():
+    """Digest of the rule lists (rule packs included), part of every verdict cache key."""
+    return RULESET_HASH
 
 
-def main():
+def evaluate(tool_name, tool_input):
+    """
+    Check one tool call (used by main() and by hook_dispatch.py in-process).
+
+    Returns: (exit_code: int, message: str)
+    """
     # Check for escape hatch
     if os.environ.get('ALLOW_SENSITIVE_ACCESS') == '1':
-        allow_execution()
-
-    tool_name, tool_input = read_hook_input()
+        return 0, ""
 
     # Determine which tools to check
     tools_to_check = ['Edit', 'Write']
@@ -191,12 +333,12 @@ def main():
         tools_to_check.append('Read')
 
     if tool_name not in tools_to_check:
-        allow_execution()
+        return 0, ""
 
     # Get file path from tool input
     file_path = tool_input.get('file_path', '')
     if not file_path:
-        allow_execution()
+        return 0, ""
 
     # Check if file is sensitive
     is_sensitive, reason = is_sensitive_file(file_path)
@@ -228,7 +370,21 @@ Alternative approaches:
 - Store secrets in environment variables
 - Use a secrets manager (AWS Secrets Manager, HashiCorp Vault)
 """
-        block_execution(error_message)
+        return 2, error_message
+
+    return 0, ""
+
+
+def main():
+    # Check for escape hatch
+    if os.environ.get('ALLOW_SENSITIVE_ACCESS') == '1':
+        allow_execution()
+
+    tool_name, tool_input = read_hook_input()
+
+    exit_code, message = evaluate(tool_name, tool_input)
+    if exit_code == 2:
+        block_execution(message)
 
     allow_execution()
 
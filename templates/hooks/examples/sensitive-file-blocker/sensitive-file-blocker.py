@@ -10,6 +10,11 @@ import sys
 import json
 import os
 
+try:
+    import hook_input
+except ImportError:  # Optional: streaming stdin reader (hook_input.py next to this hook)
+    hook_input = None
+
 # Configure blocked files (relative to project root)
 BLOCKED_FILES = [
     '.env.production',
@@ -18,9 +23,15 @@ BLOCKED_FILES = [
     'credentials.json',
 ]
 
+# Only these fields are decoded from stdin when hook_input.py is available
+INPUT_FIELDS = ['tool_name', 'tool_input.file_path']
+
 def read_hook_input():
     try:
-        data = json.load(sys.stdin)
+        if hook_input is not None:
+            data = hook_input.read_fields(INPUT_FIELDS)
+        else:
+            data = json.load(sys.stdin)
         return data.get('tool_name'), data.get('tool_input', {})
     except (json.JSONDecodeError, KeyError) as e:
         print(f"Hook error: {e}", file=sys.stderr)
@@ -33,21 +44,20 @@ def block_execution(message):
     print(message, file=sys.stderr)
     sys.exit(2)
 
-def main():
+def evaluate(tool_name, tool_input):
+    """Check one tool call. Returns (exit_code, message); used by main() and hook_dispatch.py."""
     # Check for escape hatch
     if os.environ.get('ALLOW_SENSITIVE_EDIT') == '1':
-        allow_execution()
-
-    tool_name, tool_input = read_hook_input()
+        return 0, ""
 
     # Only check Edit and Write tools
     if tool_name not in ['Edit', 'Write']:
-        allow_execution()
+        return 0, ""
 
     # Get file path
     file_path = tool_input.get('file_path', '')
     if not file_path:
-        allow_execution()
+        return 0, ""
 
     # Normalize path (remove leading ./)
     file_path = file_path.lstrip('./')
@@ -69,7 +79,20 @@ To edit anyway (use caution):
 To modify blocklist:
   Edit ~/.claude/hooks/sensitive-file-blocker.py
 """
-        block_execution(error_message)
+        return 2, error_message
+
+    return 0, ""
+
+def main():
+    # Check for escape hatch
+    if os.environ.get('ALLOW_SENSITIVE_EDIT') == '1':
+        allow_execution()
+
+    tool_name, tool_input = read_hook_input()
+
+    exit_code, message = evaluate(tool_name, tool_input)
+    if exit_code == 2:
+        block_execution(message)
 
     allow_execution()
 
@@ -0,0 +1,254 @@
+#!/usr/bin/env python3
+"""
+Hook Input Reader
+
+Shared stdin reader for hooks that only need a few fields. `json.load(sys.stdin)`
+decodes the whole tool input, so a Write of a multi-MB generated file
+allocates the entire `content` string just so a hook can read `file_path`.
+
+read_fields() scans stdin in fixed-size chunks and decodes only the requested
+keys. Other values, however large, are skipped over the raw bytes without
+being decoded. Once every requested key is found, the rest of
+stdin is drained in chunks and discarded, so the writer never blocks on a
+full pipe. Memory stays at one chunk plus the requested values, whatever
+the payload size.
+
+Usage (copy next to the hooks; they fall back to json.load without it):
+    try:
+        import hook_input
+    except ImportError:  # Optional: streaming stdin reader
+        hook_input = None
+
+    data = hook_input.read_fields(['tool_name', 'tool_input.file_path'])
+    data.get('tool_name'), data.get('tool_input', {})
+
+    # Bash-only hook: stop at tool_name for any other tool
+    data = hook_input.read_fields(['tool_name', 'tool_input.command'], tools=['Bash'])
+
+Cost then depends on where the requested keys sit, not on payload size:
+Claude Code sends `file_path` before `content`, so a Write is decided after
+its first few hundred bytes and the rest is only drained.
+
+The result has the shape of the full payload, limited to the requested
+keys. Requested keys that aren't present are simply missing. Malformed
+input raises json.JSONDecodeError, as json.load would.
+"""
+
+import json
+import re
+import sys
+
+CHUNK_SIZE = 256 * 1024
+
+WHITESPACE = re.compile(rb'[ \t\n\r]*')
+SCALAR = re.compile(rb'[^,}\]\s]*')
+SCALAR_START = b'-0123456789tfn'
+
+
+class _Scanner:
+    """Chunked byte cursor over a binary stream."""
+
+    def __init__(self, stream, chunk_size):
+        self.stream = stream
+        self.chunk_size = chunk_size
+        self.buf = b''
+        self.pos = 0
+        self.offset = 0  # Stream offset of buf[0], for error positions
+        self.eof = False
+        self.capture = None  # Bytes list while materializing a value
+
+    def fill(self):
+        """Drop consumed bytes and read one more chunk. Returns False at EOF."""
+        if self.eof:
+            return False
+        if self.capture is not None:
+            self.capture.append(self.buf[:self.pos])
+        self.offset += self.pos
+        self.buf, self.pos = self.buf[self.pos:], 0
+        chunk = self.stream.read(self.chunk_size)
+        if not chunk:
+            self.eof = True
+            return False
+        self.buf += chunk
+        return True
+
+    def error(self, message):
+        return json.JSONDecodeError(message, '', self.offset + self.pos)
+
+    def peek(self):
+        """Next non-whitespace byte (not consumed), or b'' at EOF."""
+        while True:
+            self.pos = WHITESPACE.match(self.buf, self.pos).end()
+            if self.pos < len(self.buf):
+                return self.buf[self.pos:self.pos + 1]
+            if not self.fill():
+                return b''
+
+    def expect(self, char):
+        if self.peek() != char:
+            raise self.error(f"Expecting {char.decode()!r}")
+        self.pos += 1
+
+    def skip_string(self):
+        """Skip a string, opening quote at pos, without decoding it."""
+        self.pos += 1
+        window = 64  # Most strings are short; grow the scanned slice for long ones
+        while True:
+            # Blank out escaped backslashes, then escaped quotes (same length):
+            # the first quote left is the closing one. bytes.replace and find
+            # run at memory speed, unlike a regex over escape sequences.
+            stop = min(len(self.buf), self.pos + window)
+            body = self.buf[self.pos:stop].replace(b'\\\\', b'__').replace(b'\\"', b'__')
+            end = body.find(b'"')
+            if end >= 0:
+                self.pos += end + 1
+                return
+            # Slice ended inside the string; a lone trailing backslash starts
+            # an escape, so it stays unconsumed
+            self.pos = stop - body.endswith(b'\\')
+            window = max(2, min(window * 8, self.chunk_size))
+            if stop == len(self.buf) and not self.fill():
+                raise self.error("Unterminated string")
+
+    def skip_value(self):
+        """Skip any JSON value starting at the next non-whitespace byte."""
+        char = self.peek()
+        if char == b'"':
+            self.skip_string()
+        elif char in (b'{', b'['):
+            closing = b'}' if char == b'{' else b']'
+            self.pos += 1
+            if self.peek() == closing:
+                self.pos += 1
+                return
+            while True:
+                if char == b'{':
+                    if self.peek() != b'"':
+                        raise self.error("Expecting property name")
+                    self.skip_string()
+                    self.expect(b':')
+                self.skip_value()
+                separator = self.peek()
+                self.pos += 1
+                if separator == closing:
+                    return
+                if separator != b',':
+                    raise self.error(f"Expecting ',' or {closing.decode()!r}")
+        elif char and char in SCALAR_START:
+            while True:
+                self.pos = SCALAR.match(self.buf, self.pos).end()
+                if self.pos < len(self.buf) or not self.fill():
+                    break
+        else:
+            raise self.error("Expecting value")
+
+    def read_value(self):
+        """Decode the value at the next non-whitespace byte."""
+        self.peek()
+        self.capture = []
+        start = self.pos
+        try:
+            self.skip_value()
+        finally:
+            parts, self.capture = self.capture, None
+        if parts:
+            parts[0] = parts[0][start:]
+            raw = b''.join(parts) + self.buf[:self.pos]
+        else:
+            raw = self.buf[start:self.pos]
+        return json.loads(raw)
+
+    def read_key(self):
+        if self.peek() != b'"':
+            raise self.error("Expecting property name")
+        return self.read_value()
+
+    def drain(self):
+        """Read the rest of the stream without keeping it."""
+        self.buf, self.pos = b'', 0
+        while not self.eof:
+            if not self.stream.read(self.chunk_size):
+                self.eof = True
+
+
+def _parse_fields(fields):
+    """['tool_name', 'tool_input.file_path'] -> {'tool_name': True, 'tool_input': {'file_path': True}}"""
+    wanted = {}
+    for field in fields:
+        top, _, sub = field.partition('.')
+        if not sub:
+            wanted[top] = True
+        elif wanted.get(top) is not True:
+            wanted.setdefault(top, {})[sub] = True
+    return wanted
+
+
+def _read_object(scanner, wanted, result, stop_early=True, stop_at=None):
+    """
+    Scan an object, decoding the wanted keys into result.
+
+    With stop_early, returns as soon as every wanted key is found, leaving
+    the rest of the object unread. Otherwise scans to its closing brace.
+    stop_at(key, value) returning True also ends the scan early.
+
+    Returns: True if every wanted key was found
+    """
+    remaining = set(wanted)
+    scanner.expect(b'{')
+    if scanner.peek() == b'}':
+        scanner.pos += 1
+        return not remaining
+    while True:
+        key = scanner.read_key()
+        scanner.expect(b':')
+        want = wanted.get(key)
+        if want is True:
+            result[key] = scanner.read_value()
+            remaining.discard(key)
+            if stop_at is not None and stop_at(key, result[key]):
+                return True
+        elif want and scanner.peek() == b'{':
+            result[key] = {}
+            last = stop_early and remaining == {key}
+            if _read_object(scanner, want, result[key], stop_early=last):
+                remaining.discard(key)
+        else:
+            scanner.skip_value()
+        if not remaining and stop_early:
+            return True
+        separator = scanner.peek()
+        scanner.pos += 1
+        if separator == b'}':
+            return not remaining
+        if separator != b',':
+            raise scanner.error("Expecting ',' or '}'")
+
+
+def read_fields(fields, stream=None, tools=None, chunk_size=CHUNK_SIZE):
+    """
+    Decode only the requested keys of a JSON object on stdin.
+
+    Args:
+        fields: Top-level keys ('tool_name') and one level into an object
+            ('tool_input.file_path'); a bare 'tool_input' decodes all of it
+        stream: Binary stream (default: sys.stdin.buffer)
+        tools: Tool names the hook handles; for any other tool_name the scan
+            stops there (a Bash-only hook skips a Write's content entirely)
+        chunk_size: Bytes read per chunk
+
+    Returns:
+        dict: {'tool_name': ..., 'tool_input': {'file_path': ...}}, found keys only
+
+    Raises:
+        json.JSONDecodeError: Input is not a JSON object, or malformed where scanned
+    """
+    scanner = _Scanner(stream if stream is not None else sys.stdin.buffer, chunk_size)
+    result = {}
+    try:
+        stop_at = None
+        if tools is not None:
+            stop_at = lambda key, value: key == 'tool_name' and value not in tools
+        _read_object(scanner, _parse_fields(fields), result, stop_at=stop_at)
+    finally:
+        scanner.drain()
+    return result
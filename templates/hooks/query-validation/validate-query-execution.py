@@ -18,11 +18,51 @@ import os
 import hashlib
 from pathlib import Path
 
+try:
+    import hook_input
+except ImportError:  # Optional: streaming stdin reader (hook_input.py next to this hook)
+    hook_input = None
+
+try:
+    import rule_packs
+except ImportError:  # Optional: JSON/TOML rule packs (rule_packs.py next to this hook)
+    rule_packs = None
+
+
+# Commands that are never query executions (early exit)
+NON_QUERY_PREFIXES = ('ls', 'cd', 'cat', 'grep', 'find', 'echo',
+                      'pwd', 'mkdir', 'rm', 'cp', 'mv', 'touch',
+                      'head', 'tail', 'wc', 'sort', 'uniq', 'git')
+
+# Query execution patterns (refined to avoid false positives)
+QUERY_RUNNER_PATTERNS = [
+    r'python3?\s+run_validation_query\.py',  # Our validation query runner
+    r'python3?\s+run_query\.py',             # Generic query runner
+    r'python3?\s+.*athena_client\.py',       # Direct athena client usage
+    r'python3?\s+-m\s+core\.athena_client',  # Module-based execution
+]
+
+# Lists above, extended by rule packs when rule_packs.py is available
+RULE_PACK_STAMP = None
+if rule_packs is not None:
+    _rules, RULE_PACK_STAMP = rule_packs.load('validate-query-execution', __file__, {
+        'NON_QUERY_PREFIXES': NON_QUERY_PREFIXES,
+        'QUERY_RUNNER_PATTERNS': QUERY_RUNNER_PATTERNS,
+    }, loosening={'NON_QUERY_PREFIXES'}, regex={'QUERY_RUNNER_PATTERNS'})
+    NON_QUERY_PREFIXES = _rules['NON_QUERY_PREFIXES']
+    QUERY_RUNNER_PATTERNS = _rules['QUERY_RUNNER_PATTERNS']
+
+# Only these fields are decoded from stdin when hook_input.py is available
+INPUT_FIELDS = ['tool_name', 'tool_input.command']
+
 
 def read_hook_input():
     """Read JSON input from stdin."""
     try:
-        data = json.load(sys.stdin)
+        if hook_input is not None:
+            data = hook_input.read_fields(INPUT_FIELDS, tools=['Bash'])
+        else:
+            data = json.load(sys.stdin)
         return data.get('tool_name'), data.get('tool_input', {})
     except (json.JSONDecodeError, KeyError) as e:
         print(f"Hook error: Failed to parse input: {e}", file=sys.stderr)
@@ -37,20 +77,10 @@ def is_query_execution(command):
     """
     # Early exit for common non-query commands
     command_stripped = command.strip()
-    if command_stripped.startswith(('ls', 'cd', 'cat', 'grep', 'find', 'echo',
-                                    'pwd', 'mkdir', 'rm', 'cp', 'mv', 'touch',
-                                    'head', 'tail', 'wc', 'sort', 'uniq', 'git')):
+    if command_stripped.startswith(NON_QUERY_PREFIXES):
         return False
 
-    # Query execution patterns (refined to avoid false positives)
-    patterns = [
-        r'python3?\s+run_validation_query\.py',  # Our validation query runner
-        r'python3?\s+run_query\.py',             # Generic query runner
-        r'python3?\s+.*athena_client\.py',       # Direct athena client usage
-        r'python3?\s+-m\s+core\.athena_client',  # Module-based execution
-    ]
-
-    return any(re.search(pattern, command) for pattern in patterns)
+    return any(re.search(pattern, command) for pattern in QUERY_RUNNER_PATTERNS)
 
 
 def extract_query_path_from_command(command):
@@ -98,33 +128,37 @@ def block_execution(message):
     sys.exit(2)
 
 
-def main():
+def evaluate(tool_name, tool_input):
+    """
+    Check one tool call (used by main() and by hook_dispatch.py in-process).
+
+    A found marker is consumed (one-time use), as in main().
+
+    Returns: (exit_code: int, message: str)
+    """
     # Check for escape hatch (emergency bypass)
     if os.environ.get('SKIP_QUERY_VALIDATION') == '1':
-        allow_execution()
-
-    # Read hook input
-    tool_name, tool_input = read_hook_input()
+        return 0, ""
 
     # Only intercept Bash commands
     if tool_name != 'Bash':
-        allow_execution()
+        return 0, ""
 
     # Get command from tool_input
     command = tool_input.get('command', '')
     if not command:
-        allow_execution()
+        return 0, ""
 
     # Check if this is a query execution command
     if not is_query_execution(command):
-        allow_execution()
+        return 0, ""
 
     # Extract query path from command
     query_path = extract_query_path_from_command(command)
     if not query_path:
         # Query execution command but no .sql file found
         # This might be a different kind of query execution, allow for now
-        allow_execution()
+        return 0, ""
 
     # Check for validation marker
     marker_exists, marker_path = check_validation_marker(query_path)
@@ -136,7 +170,7 @@ def main():
         except Exception as e:
             print(f"Hook warning: Failed to delete marker: {e}", file=sys.stderr)
 
-        allow_execution()
+        return 0, ""
     else:
         # No marker - block execution
         error_message = f"""
@@ -164,7 +198,22 @@ Why validation is required:
 
 See CLAUDE.md and QUERY_WORKFLOW.md for details.
 """
-        block_execution(error_message)
+        return 2, error_message
+
+
+def main():
+    # Check for escape hatch (emergency bypass)
+    if os.environ.get('SKIP_QUERY_VALIDATION') == '1':
+        allow_execution()
+
+    # Read hook input
+    tool_name, tool_input = read_hook_input()
+
+    exit_code, message = evaluate(tool_name, tool_input)
+    if exit_code == 2:
+        block_execution(message)
+
+    allow_execution()
 
 
 if __name__ == '__main__':
@@ -0,0 +1,101 @@
+#!/usr/bin/env bash
+# test-rule-packs.sh — Rule pack merging, precedence and caching (rule_packs.py)
+set -euo pipefail
+
+HOOKS_DIR="$(cd "$(dirname "$0")/.." && pwd)"
+BLOCKER="$HOOKS_DIR/examples/dangerous-commands-blocker/dangerous-commands-blocker.py"
+FILES="$HOOKS_DIR/examples/sensitive-file-blocker/sensitive-file-blocker-enhanced.py"
+WORK="$(mktemp -d)"
+trap 'rm -rf "$WORK"' EXIT
+USER_RULES="$WORK/home/.claude/hooks/rules"
+PROJECT_RULES="$WORK/project/.claude/hooks/rules"
+mkdir -p "$USER_RULES" "$PROJECT_RULES"
+PASS=0; FAIL=0
+
+run_hook() {
+  # run_hook HOOK TOOL FIELD VALUE -> exit code, stderr in $WORK/stderr
+  local actual=0
+  python3 -c 'import json, sys; print(json.dumps({"tool_name": sys.argv[1], "tool_input": {sys.argv[2]: sys.argv[3]}}))' "$2" "$3" "$4" \
+    | env -u ALLOW_DANGEROUS_COMMANDS -u ALLOW_SENSITIVE_ACCESS HOME="$WORK/home" \
+        CLAUDE_PROJECT_DIR="$WORK/project" PYTHONPATH="$HOOKS_DIR" python3 "$1" >/dev/null 2>"$WORK/stderr" || actual=$?
+  echo "$actual"
+}
+
+check() {
+  local desc="$1" expected="$2" actual="$3"
+  if [[ "$actual" == "$expected" ]]; then
+    echo "  PASS: $desc"
+    ((++PASS))
+  else
+    echo "  FAIL: $desc (expected=$expected actual=$actual)"
+    ((++FAIL))
+  fi
+}
+
+cat > "$USER_RULES/10-team.toml" <<'EOF'
+[dangerous-commands-blocker]
+ALWAYS_BLOCKED = [['terraform\s+destroy', "terraform destroy removes infrastructure"]]
+ALWAYS_ALLOWED_PREFIXES = ["make lint"]
+
+[dangerous-commands-blocker.remove]
+WARN_PATTERNS = ['git\s+reset\s+--hard']
+
+[sensitive-file-blocker-enhanced]
+BLOCKED_EXTENSIONS = [".age"]
+EOF
+cat > "$PROJECT_RULES/project.json" <<'EOF'
+{
+  "dangerous-commands-blocker": {
+    "ALWAYS_BLOCKED": [["kubectl\\s+delete\\s+ns", "deletes a namespace"], ["(broken", "bad regex"],
+                       ["(?i)kubectl\\s+drain", "global flag mid-expression once joined"]],
+    "ALWAYS_ALLOWED_PREFIXES": ["rm"],
+    "remove": {"ALWAYS_BLOCKED": ["rm\\s+-rf\\s+[/~]"]}
+  }
+}
+EOF
+
+echo "=== Merged rules ==="
+check "user pack blocks terraform destroy" 2 "$(run_hook "$BLOCKER" Bash command 'terraform destroy -auto-approve')"
+grep -q "terraform destroy removes infrastructure" "$WORK/stderr" && check "reason from the pack" 0 0 || check "reason from the pack" 0 1
+check "project pack blocks kubectl delete ns" 2 "$(run_hook "$BLOCKER" Bash command 'kubectl delete ns prod')"
+check "built-in rules still apply" 2 "$(run_hook "$BLOCKER" Bash command 'rm -rf ~')"
+check "user pack extends file blocker" 2 "$(run_hook "$FILES" Write file_path 'keys/prod.age')"
+check "unrelated paths allowed" 0 "$(run_hook "$FILES" Write file_path 'src/app.py')"
+
+echo "=== Project packs only tighten ==="
+check "project remove ignored: rm -rf / still blocked" 2 "$(run_hook "$BLOCKER" Bash command 'rm -rf /')"
+check "project allowlist ignored: rm -rf ~ still blocked" 2 "$(run_hook "$BLOCKER" Bash command 'rm -rf ~')"
+
+echo "=== Warnings and cache ==="
+rm -rf "$WORK/home/.claude/hooks/.rule-cache"
+run_hook "$BLOCKER" Bash command 'ls' >/dev/null
+check "rebuild warns about invalid entries" 4 "$(grep -c 'Rule pack warning' "$WORK/stderr" || true)"
+run_hook "$BLOCKER" Bash command 'ls' >/dev/null
+check "cached run is silent" 0 "$(grep -c 'Rule pack warning' "$WORK/stderr" || true)"
+check "cache file written" 1 "$(ls "$WORK/home/.claude/hooks/.rule-cache" | wc -l | tr -d ' ')"
+sed -i.bak 's/removes infrastructure/wipes infrastructure!/' "$USER_RULES/10-team.toml" && rm -f "$USER_RULES/10-team.toml.bak"
+run_hook "$BLOCKER" Bash command 'terraform destroy' >/dev/null
+grep -q "wipes infrastructure!" "$WORK/stderr" && check "edited pack rebuilds the cache" 0 0 || check "edited pack rebuilds the cache" 0 1
+
+echo "=== Rules that don't combine fall back to the built-in ones ==="
+# A cache written before entries were checked in their combined form
+HOME="$WORK/home" CLAUDE_PROJECT_DIR="$WORK/project" PYTHONPATH="$HOOKS_DIR" python3 - "$BLOCKER" <<'PY'
+import marshal, sys, rule_packs
+stamp = rule_packs.make_stamp(sys.argv[1])
+path = rule_packs.cache_path('dangerous-commands-blocker', stamp)
+_, merged, warnings = marshal.loads(open(path, 'rb').read())
+merged['ALWAYS_BLOCKED'] = [('(?i)kubectl', 'stale entry')] + list(merged['ALWAYS_BLOCKED'])
+rule_packs.write_cache(path, stamp, merged, warnings)
+PY
+check "rm -rf / still blocked" 2 "$(run_hook "$BLOCKER" Bash command 'rm -rf /')"
+grep -q "using the built-in rules only" "$WORK/stderr" && check "fallback is reported" 0 0 || check "fallback is reported" 0 1
+
+echo "=== rule_packs.py check ==="
+actual=0
+HOME="$WORK/home" CLAUDE_PROJECT_DIR="$WORK/project" python3 "$HOOKS_DIR/rule_packs.py" check "$BLOCKER" "$FILES" >"$WORK/report" 2>&1 || actual=$?
+check "check exits 1 on warnings" 1 "$actual"
+check "check lists both levels" 2 "$(python3 -c 'import json, sys; print(len({s["level"] for s in json.load(open(sys.argv[1]))[0]["sources"]}))' "$WORK/report")"
+
+echo ""
+echo "Results: $PASS passed, $FAIL failed"
+[[ $FAIL -eq 0 ]]
@@ -0,0 +1,117 @@
+#!/usr/bin/env bash
+# test-sensitive-files.sh — Fixture and differential tests for sensitive-file-blocker-enhanced.py
+set -euo pipefail
+
+HOOKS_DIR="$(cd "$(dirname "$0")/.." && pwd)"
+HOOK="$HOOKS_DIR/examples/sensitive-file-blocker/sensitive-file-blocker-enhanced.py"
+WORK="$(mktemp -d)"
+trap 'rm -rf "$WORK"' EXIT
+PASS=0; FAIL=0
+
+assert_exit() {
+  local desc="$1" expected="$2" path="$3" tool="${4:-Write}" actual
+  actual=0
+  python3 -c 'import json, sys; print(json.dumps({"tool_name": sys.argv[2], "tool_input": {"file_path": sys.argv[1], "content": "x"}}))' "$path" "$tool" \
+    | (cd "$WORK" && env -u ALLOW_SENSITIVE_ACCESS python3 "$HOOK" >/dev/null 2>&1) || actual=$?
+  if [[ "$actual" == "$expected" ]]; then
+    echo "  PASS: $desc"
+    ((++PASS))
+  else
+    echo "  FAIL: $desc (expected=$expected actual=$actual)"
+    ((++FAIL))
+  fi
+}
+
+mkdir -p "$WORK/config" "$WORK/docs"
+touch "$WORK/.env" "$WORK/docs/notes.md"
+ln -s "$WORK/.env" "$WORK/settings.txt"
+
+echo "=== Blocked (exit 2) ==="
+assert_exit "exact filename" 2 ".env.production"
+assert_exit "absolute path to .env" 2 "/srv/app/.env"
+assert_exit "nested entry as a suffix" 2 "/home/me/.aws/credentials"
+assert_exit "extension, any case" 2 "certs/server.PEM"
+assert_exit "path pattern" 2 "/repo/config/secrets/db.txt"
+assert_exit "filename pattern" 2 "config/master.key"
+assert_exit "Windows separators" 2 'C:\app\.env.local'
+
+echo "=== Normalization and real paths (exit 2) ==="
+assert_exit "leading ./" 2 "./.env"
+assert_exit "../ segments" 2 "./docs/../.env"
+assert_exit "symlink to .env" 2 "settings.txt"
+assert_exit "relative path under secrets/" 2 "secrets/token.txt"
+
+echo "=== Allowed (exit 0) ==="
+assert_exit "source file" 0 "src/app.py"
+assert_exit "docs next to .env" 0 "docs/notes.md"
+assert_exit "example env file" 0 ".env.example"
+assert_exit "dotfile named like an extension" 0 ".pem"
+assert_exit "key extension not last" 0 "backup.key.txt"
+assert_exit "Read is allowed by default" 0 ".env" Read
+
+echo "=== Escape hatch ==="
+actual=0
+echo '{"tool_name":"Write","tool_input":{"file_path":".env"}}' \
+  | ALLOW_SENSITIVE_ACCESS=1 python3 "$HOOK" >/dev/null 2>&1 || actual=$?
+if [[ "$actual" == "0" ]]; then echo "  PASS: ALLOW_SENSITIVE_ACCESS=1 → allow"; ((++PASS)); else echo "  FAIL: escape hatch (actual=$actual)"; ((++FAIL)); fi
+
+echo "=== Differential: compiled classifier vs sequential checks ==="
+# Reference = the straightforward implementation (set lookups, splitext,
+# one re.search per pattern) over the hook's own rule lists.
+if python3 - "$HOOK" <<'PY'
+import importlib.util
+import os
+import random
+import re
+import sys
+
+spec = importlib.util.spec_from_file_location('blocker', sys.argv[1])
+hook = importlib.util.module_from_spec(spec)
+spec.loader.exec_module(hook)
+
+def reference_classify(path):
+    filename = os.path.basename(path)
+    if filename in hook.BLOCKED_FILENAMES:
+        return f"Blocked filename: {filename}"
+    for entry in sorted(hook.BLOCKED_FILENAMES):
+        if '/' in entry and (path == entry or path.endswith('/' + entry)):
+            return f"Blocked path: {entry}"
+    ext = os.path.splitext(path)[1].lower()
+    if ext in hook.BLOCKED_EXTENSIONS:
+        return f"Blocked extension: {ext}"
+    for pattern in hook.BLOCKED_PATH_PATTERNS:
+        if re.search(pattern, path, re.IGNORECASE):
+            return f"Blocked pattern: {pattern}"
+    return ""
+
+parts = sorted(hook.BLOCKED_FILENAMES) + [
+    'src', 'app.py', 'README.md', 'config', 'secrets', 'Credentials', '.ssh', 'private_keys',
+    'x.pem', 'a.KEY', '.key', 'b.key.bak', 'api-key.txt', 'SecretKey', 'master.key', 'x.secrets.y',
+    '.env.example', 'env', '..', '.', 'a.b.c', 'cert.Crt', 'dir.pem', '',
+]
+rng = random.Random(49)
+corpus = list(parts)
+for _ in range(20000):
+    path = '/'.join(rng.choice(parts) for _ in range(rng.randint(1, 5)))
+    corpus.append(rng.choice(['', '/', './']) + path)
+
+mismatches = 0
+for path in corpus:
+    normalized = hook.normalize_path(path)
+    if hook.classify(normalized) != reference_classify(normalized):
+        mismatches += 1
+        print(f"    mismatch: {normalized!r}: {hook.classify(normalized)!r} vs {reference_classify(normalized)!r}")
+print(f"    {len(corpus)} paths, {mismatches} mismatches")
+sys.exit(1 if mismatches else 0)
+PY
+then
+  echo "  PASS: identical reasons"
+  ((++PASS))
+else
+  echo "  FAIL: compiled classifier differs from reference"
+  ((++FAIL))
+fi
+
+echo ""
+echo "Results: $PASS passed, $FAIL failed"
+[[ $FAIL -eq 0 ]]
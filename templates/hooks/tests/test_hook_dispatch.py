@@ -0,0 +1,84 @@
+"""Subprocess hooks in the dispatcher chain: how they start and how their stdout counts."""
+
+import json
+import os
+import shutil
+import stat
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+
+HOOKS_DIR = Path(__file__).resolve().parent.parent
+DISPATCHER = HOOKS_DIR / 'dispatcher' / 'hook_dispatch.py'
+COMMAND_FILTER = HOOKS_DIR.parent / 'security' / 'tier-2-team' / 'pretooluse-command-filter.sh'
+
+DENY = {"hookSpecificOutput": {"hookEventName": "PreToolUse", "permissionDecision": "deny",
+                               "permissionDecisionReason": "denied by policy"}}
+ASK = {"hookSpecificOutput": {"hookEventName": "PreToolUse", "permissionDecision": "ask"}}
+ALLOW = {"hookSpecificOutput": {"hookEventName": "PreToolUse", "permissionDecision": "allow"}}
+
+
+def write_hook(path, body, executable=False):
+    path.write_text(body)
+    if executable:
+        path.chmod(path.stat().st_mode | stat.S_IXUSR)
+    return path
+
+
+def dispatch(tmp_path, hooks, command='ls'):
+    """Run hook_dispatch.py on one Bash call. Returns: (exit code, stdout, stderr)"""
+    config = tmp_path / 'hook_dispatch.json'
+    config.write_text(json.dumps({"hooks": hooks}))
+    payload = json.dumps({"tool_name": "Bash", "tool_input": {"command": command}})
+    proc = subprocess.run([sys.executable, str(DISPATCHER)], input=payload.encode(),
+                          capture_output=True, env=dict(os.environ, HOOK_DISPATCH_CONFIG=str(config)))
+    return proc.returncode, proc.stdout.decode(), proc.stderr.decode()
+
+
+def test_shell_hook_denying_on_stdout_blocks(tmp_path):
+    # Not executable: started by its shebang, not with the Python interpreter
+    write_hook(tmp_path / 'deny.sh', f"#!/bin/sh\ncat >/dev/null\necho '{json.dumps(DENY)}'\n")
+    code, stdout, stderr = dispatch(tmp_path, [{"path": "deny.sh"}])
+    assert code == 2
+    assert "denied by policy" in stderr
+    assert stdout == ""
+
+
+def test_python_hook_denying_on_stdout_blocks(tmp_path):
+    write_hook(tmp_path / 'deny.py', f"import json\nprint(json.dumps({DENY!r}))\n")
+    code, _, stderr = dispatch(tmp_path, [{"path": "deny.py"}])
+    assert code == 2
+    assert "denied by policy" in stderr
+
+
+def test_legacy_block_decision_blocks(tmp_path):
+    write_hook(tmp_path / 'block', "#!/bin/sh\necho '{\"decision\": \"block\", \"reason\": \"no\"}'\n",
+               executable=True)
+    assert dispatch(tmp_path, [{"path": "block"}])[0] == 2
+
+
+def test_command_entry_runs_through_the_shell(tmp_path):
+    code, _, stderr = dispatch(tmp_path, [{"command": "echo blocked by command >&2; exit 2"}])
+    assert (code, stderr.strip()) == (2, "blocked by command")
+
+
+def test_strictest_pass_through_decision_is_printed(tmp_path):
+    write_hook(tmp_path / 'allow.sh', f"#!/bin/sh\necho '{json.dumps(ALLOW)}'\n")
+    write_hook(tmp_path / 'ask.sh', f"#!/bin/sh\necho '{json.dumps(ASK)}'\n")
+    code, stdout, _ = dispatch(tmp_path, [{"path": "allow.sh"}, {"path": "ask.sh"}])
+    assert code == 0
+    assert json.loads(stdout) == ASK
+
+
+def test_plain_stdout_is_not_a_decision(tmp_path):
+    write_hook(tmp_path / 'chatty.sh', "#!/bin/sh\necho hello\n")
+    assert dispatch(tmp_path, [{"path": "chatty.sh"}])[:2] == (0, "")
+
+
+@pytest.mark.skipif(shutil.which('jq') is None or shutil.which('bash') is None,
+                    reason="pretooluse-command-filter.sh needs bash and jq")
+def test_repo_command_filter_still_blocks(tmp_path):
+    hooks = [{"path": str(COMMAND_FILTER), "tools": ["Bash"]}]
+    assert dispatch(tmp_path, hooks, 'rm -rf /tmp/x')[0] == 2
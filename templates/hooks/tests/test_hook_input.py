@@ -0,0 +1,70 @@
+"""hook_input.read_fields: chunked decoding of only the requested stdin keys."""
+
+import io
+import json
+import sys
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+import hook_input  # noqa: E402
+
+TRICKY = ['a\\"b', 'ends with a backslash \\', '\\\\"', '"', 'tab\there', 'ünïcode ☃', '\\\\\\"x']
+
+
+def payload(content, file_path='src/app.py', tool_name='Write'):
+    data = {"session_id": "s", "tool_name": tool_name,
+            "tool_input": {"content": content, "note": {"nested": [content, 1, None]},
+                           "file_path": file_path}}
+    return json.dumps(data, ensure_ascii=False).encode('utf-8'), data
+
+
+@pytest.mark.parametrize('chunk_size', [1, 2, 3, 5, 7, 64])
+def test_escapes_across_chunk_boundaries(chunk_size):
+    for text in TRICKY:
+        raw, data = payload(text * 5, file_path=text)
+        stream = io.BytesIO(raw)
+        result = hook_input.read_fields(['tool_name', 'tool_input.file_path', 'session_id'],
+                                        stream, chunk_size=chunk_size)
+        assert result == {"session_id": "s", "tool_name": "Write",
+                          "tool_input": {"file_path": data['tool_input']['file_path']}}
+        assert stream.tell() == len(raw)  # Drained
+
+        whole = hook_input.read_fields(['tool_input'], io.BytesIO(raw), chunk_size=chunk_size)
+        assert whole == {"tool_input": data['tool_input']}
+
+
+def test_other_tools_stop_at_tool_name():
+    # The content after tool_name is malformed: it must not even be scanned
+    raw = b'{"tool_name": "Write", "tool_input": {"content": "unterminated'
+    stream = io.BytesIO(raw)
+    assert hook_input.read_fields(['tool_name', 'tool_input.command'], stream,
+                                  tools=['Bash'], chunk_size=4) == {"tool_name": "Write"}
+    assert stream.tell() == len(raw)
+
+    raw, _ = payload('x', tool_name='Bash')
+    raw = raw.replace(b'"file_path"', b'"command"')
+    assert hook_input.read_fields(['tool_name', 'tool_input.command'], io.BytesIO(raw),
+                                  tools=['Bash']) == {"tool_name": "Bash", "tool_input": {"command": "src/app.py"}}
+
+
+def test_missing_keys_are_left_out():
+    raw, _ = payload('x')
+    assert hook_input.read_fields(['tool_input.command', 'cwd'], io.BytesIO(raw)) == {"tool_input": {}}
+
+
+@pytest.mark.parametrize('raw', [
+    b'',
+    b'[]',
+    b'{"tool_name": "Write" "tool_input": {}}',
+    b'{"tool_input": {"content": "no end',
+    b'{"tool_input": {"content": "x", "file_path": }}',
+    b'{tool_name: "Write"}',
+    b'{"tool_input": {"content": ["a", "b"}, "file_path": "p"}}',
+])
+def test_malformed_input_raises_like_json_load(raw):
+    stream = io.BytesIO(raw)
+    with pytest.raises(json.JSONDecodeError):
+        hook_input.read_fields(['tool_name', 'tool_input.file_path'], stream, chunk_size=3)
+    assert stream.tell() == len(raw)
@@ -0,0 +1,101 @@
+"""Resident hook server: requests are read by their announced length, with a timeout."""
+
+import json
+import os
+import socket
+import sys
+import threading
+import time
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / 'dispatcher'))
+import hook_client  # noqa: E402
+import hook_server  # noqa: E402
+
+PAYLOAD = json.dumps({"tool_name": "Bash", "tool_input": {"command": "ls"}}).encode()
+
+
+@pytest.fixture
+def server(tmp_path, monkeypatch):
+    """A server on a temporary socket with an empty chain. Returns: the socket path"""
+    config = tmp_path / 'hook_dispatch.json'
+    config.write_text(json.dumps({"hooks": []}))
+    monkeypatch.setenv('HOOK_DISPATCH_CONFIG', str(config))
+    monkeypatch.setenv('HOOK_SERVER_SOCKET', str(tmp_path / 'hook.sock'))
+    monkeypatch.setattr(hook_server.HookRequestHandler, 'timeout', 0.2)
+    instance = hook_server.HookServer(tmp_path / 'hook.sock')
+    thread = threading.Thread(target=instance.serve_forever, daemon=True)
+    thread.start()
+    yield tmp_path / 'hook.sock'
+    instance.shutdown()
+    instance.server_close()
+
+
+def send(sock_path, data, close_write=True):
+    """Send raw bytes to the server. Returns: (exit code, stdout, stderr) as the client parses them"""
+    client = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    client.settimeout(5)
+    client.connect(str(sock_path))
+    client.sendall(data)
+    if close_write:
+        client.shutdown(socket.SHUT_WR)
+    reply = b''.join(iter(lambda: client.recv(65536), b''))
+    client.close()
+    status, _, rest = reply.decode().partition('\n')
+    output, _, message = rest.partition('\n')
+    return int(status), json.loads(output), message
+
+
+def header(length, **fields):
+    fields = dict({"cwd": os.getcwd(), "env": dict(os.environ), "length": length}, **fields)
+    return json.dumps(fields).encode() + b'\n'
+
+
+def test_client_round_trip(server):
+    assert hook_client.ask_server(PAYLOAD) == (0, '', '')
+
+
+def test_stalled_client_times_out_and_the_next_one_is_served(server):
+    code, _, message = send(server, header(len(PAYLOAD)) + PAYLOAD[:10], close_write=False)
+    assert code == 1
+    assert 'timed out' in message
+    assert hook_client.ask_server(PAYLOAD) == (0, '', '')
+
+
+def test_short_request_is_rejected(server):
+    code, _, message = send(server, header(len(PAYLOAD)) + PAYLOAD[:10])
+    assert (code, 'truncated' in message) == (1, True)
+
+
+def test_oversized_length_is_rejected_without_reading(server):
+    code, _, message = send(server, header(hook_server.MAX_INPUT_BYTES + 1))
+    assert (code, 'bad input length' in message) == (1, True)
+
+
+def test_missing_length_is_rejected(server):
+    code, _, message = send(server, json.dumps({"cwd": os.getcwd(), "env": {}}).encode() + b'\n' + PAYLOAD)
+    assert (code, 'bad input length' in message) == (1, True)
+
+
+def test_slow_answer_is_waited_for_not_evaluated_again(server, monkeypatch):
+    monkeypatch.setattr(hook_client, 'evaluate_locally', lambda raw: pytest.fail("evaluated twice"))
+    evaluate = hook_server.evaluate_as_client
+
+    def slow(*args):
+        time.sleep(0.5)
+        return evaluate(*args)
+
+    monkeypatch.setattr(hook_server, 'evaluate_as_client', slow)
+    monkeypatch.setattr(hook_client, 'CONNECT_TIMEOUT_SECONDS', 0.1)
+    assert hook_client.ask_server(PAYLOAD) == (0, '', '')
+
+    monkeypatch.setattr(hook_client, 'RESPONSE_TIMEOUT_SECONDS', 0.1)
+    code, message, _ = hook_client.ask_server(PAYLOAD)
+    assert (code, "didn't answer" in message) == (1, True)
+
+
+def test_unreachable_server_falls_back(tmp_path, monkeypatch):
+    monkeypatch.setenv('HOOK_SERVER_SOCKET', str(tmp_path / 'missing.sock'))
+    assert hook_client.ask_server(PAYLOAD) is None
@@ -0,0 +1,92 @@
+"""Verdict cache: repeated calls are answered from SQLite until the hook or its rules change."""
+
+import json
+import os
+import sys
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / 'dispatcher'))
+import hook_dispatch  # noqa: E402
+
+HOOK = '''
+import hashlib
+import os
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+RULES = os.path.join(HERE, 'rules.txt')
+
+
+def ruleset_hash():
+    with open(RULES, 'rb') as f:
+        return hashlib.sha256(f.read()).hexdigest()
+
+
+def cache_key(tool_name, tool_input):
+    if os.environ.get('ALLOW_EVERYTHING') == '1':
+        return None
+    return tool_input.get('command')
+
+
+def evaluate(tool_name, tool_input):
+    with open(os.path.join(HERE, 'evaluations.log'), 'a') as f:
+        f.write('.')
+    with open(RULES) as f:
+        if tool_input['command'] in f.read().split():
+            return 2, 'blocked by rules.txt'
+    return 0, ''
+'''
+
+
+@pytest.fixture
+def chain(tmp_path):
+    """A one-hook chain with the verdict cache in tmp_path. Returns: the chain"""
+    (tmp_path / 'hook.py').write_text(HOOK)
+    (tmp_path / 'rules.txt').write_text('reboot\n')
+    config = tmp_path / 'hook_dispatch.json'
+    config.write_text(json.dumps({"verdict_cache": {"path": str(tmp_path / 'verdicts.sqlite')},
+                                  "hooks": ["hook.py"]}))
+    return hook_dispatch.load_config(config)
+
+
+def call(chain, command):
+    payload = json.dumps({"tool_name": "Bash", "tool_input": {"command": command}}).encode()
+    return hook_dispatch.handle(payload, chain)[0]
+
+
+def evaluations(tmp_path):
+    log = tmp_path / 'evaluations.log'
+    return len(log.read_text()) if log.exists() else 0
+
+
+def test_repeated_calls_hit_the_cache(tmp_path, chain):
+    assert [call(chain, 'reboot'), call(chain, 'ls')] == [2, 0]
+    assert [call(chain, 'reboot'), call(chain, 'ls')] == [2, 0]
+    assert evaluations(tmp_path) == 2
+    assert (chain[0]['cache'].hits, chain[0]['cache'].misses) == (2, 2)
+
+
+def test_ruleset_change_misses(tmp_path, chain):
+    assert call(chain, 'ls') == 0
+    (tmp_path / 'rules.txt').write_text('reboot\nls\n')
+    assert call(chain, 'ls') == 2
+    assert evaluations(tmp_path) == 2
+
+
+def test_hook_file_change_misses(tmp_path, chain):
+    assert call(chain, 'ls') == 0
+    hook_path = tmp_path / 'hook.py'
+    hook_path.write_text(HOOK.replace("return 0, ''", "return 0, 'edited'"))
+    mtime_ns = hook_path.stat().st_mtime_ns + 1_000_000_000
+    os.utime(hook_path, ns=(mtime_ns, mtime_ns))  # Coarse mtime filesystems
+    assert call(chain, 'ls') == 0
+    assert evaluations(tmp_path) == 2
+
+
+def test_uncacheable_calls_always_evaluate(tmp_path, chain, monkeypatch):
+    monkeypatch.setenv('ALLOW_EVERYTHING', '1')
+    call(chain, 'ls')
+    call(chain, 'ls')
+    assert evaluations(tmp_path) == 2
+    assert chain[0]['cache'].hits == 0
@@ -13,11 +13,14 @@ Usage:
 
 import argparse
 import json
+import os
 import re
 import sys
 from datetime import datetime
 from pathlib import Path
 
+from backlog_schema import load_schema
+
 
 def find_project_root():
     """Find the project root directory (where backlog/ exists)."""
@@ -86,8 +89,9 @@ def scan_backlog(project_root):
     if not backlog_dir.exists():
         return {"error": f"backlog/ not found in {project_root}", "items": []}
 
+    schema = load_schema()
     items = []
-    type_dirs = ['feature', 'bug', 'tech-debt', 'research']
+    type_dirs = schema.values('type')
 
     for type_dir in type_dirs:
         type_path = backlog_dir / type_dir
@@ -112,20 +116,22 @@ def scan_backlog(project_root):
                 })
                 continue
 
+            frontmatter = schema.coerce(frontmatter)
+            status = frontmatter['status']  # coerce() passes invalid values (a list) through
             items.append({
-                "id": frontmatter.get('id', item_dir.name),
-                "title": frontmatter.get('title', item_dir.name),
-                "type": frontmatter.get('type', type_dir),
-                "status": frontmatter.get('status', 'planned'),
-                "priority": frontmatter.get('priority', 'P3'),
+                "id": frontmatter.get('id') or item_dir.name,
+                "title": frontmatter.get('title') or item_dir.name,
+                "type": frontmatter.get('type') or type_dir,
+                "status": status.lower() if isinstance(status, str) else status,
+                "priority": frontmatter['priority'],
                 "effort_estimate": frontmatter.get('effort_estimate'),
                 "effort_actual": frontmatter.get('effort_actual'),
                 "created": frontmatter.get('created'),
                 "started": frontmatter.get('started'),
                 "completed": frontmatter.get('completed'),
-                "blocked_by": frontmatter.get('blocked_by', []),
-                "related": frontmatter.get('related', []),
-                "tags": frontmatter.get('tags', []),
+                "blocked_by": frontmatter['blocked_by'],
+                "related": frontmatter['related'],
+                "tags": frontmatter['tags'],
                 "path": str(plan_path.relative_to(project_root))
             })
 
@@ -134,7 +140,7 @@ def scan_backlog(project_root):
 
 def categorize_items(items):
     """Categorize items by status and priority."""
-    priority_order = {'P0': 0, 'P1': 1, 'P2': 2, 'P3': 3}
+    schema = load_schema()
 
     in_progress = []
     blocked = []
@@ -145,7 +151,8 @@ def categorize_items(items):
         if item.get('_error'):
             continue
 
-        status = item.get('status', 'planned').lower()
+        status = item.get('status', 'planned')
+        status = status.lower() if isinstance(status, str) else None
         priority = item.get('priority', 'P3')
 
         if status == 'in_progress':
@@ -160,7 +167,7 @@ def categorize_items(items):
 
     # Sort each category by priority
     for lst in [in_progress, blocked, ready_high, backlog]:
-        lst.sort(key=lambda x: priority_order.get(x.get('priority', 'P3'), 9))
+        lst.sort(key=lambda x: schema.rank('priority', x.get('priority')))
 
     return {
         "in_progress": in_progress,
@@ -245,6 +252,24 @@ def generate_markdown(categories, items):
     return '\n'.join(lines)
 
 
+def write_index(index_path, markdown):
+    """
+    Write _INDEX.md atomically (temp file + rename).
+
+    Concurrent --write runs and set-status updates never leave a torn index;
+    plan.md files are read without locks because set-status replaces them
+    atomically too.
+    """
+    tmp_path = index_path.with_name(f'.{index_path.name}.{os.getpid()}.tmp')
+    try:
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            f.write(markdown)
+        os.replace(tmp_path, index_path)
+    finally:
+        if tmp_path.exists():
+            tmp_path.unlink()
+
+
 def main():
     parser = argparse.ArgumentParser(description='Generate backlog index')
     parser.add_argument('--json', action='store_true', help='Output JSON instead of markdown')
@@ -279,8 +304,7 @@ def main():
 
         if args.write:
             index_path = project_root / 'backlog' / '_INDEX.md'
-            with open(index_path, 'w', encoding='utf-8') as f:
-                f.write(markdown)
+            write_index(index_path, markdown)
             print(f"Written to {index_path}")
         else:
             print(markdown)
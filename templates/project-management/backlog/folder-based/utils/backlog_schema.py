@@ -0,0 +1,281 @@
+#!/usr/bin/env python3
+"""
+Backlog Schema
+
+Compiles backlog_schema.json (the frontmatter contract from _TEMPLATE.md) into
+a validator shared by backlog_validate.py, backlog_index.py, backlog_search.py
+and active_features_manager.py, so every utility accepts the same values.
+
+The compiled form uses frozensets for enum fields, precompiled regexes for
+format checks and per-type coercers, so each field check is O(1). It is cached
+in __pycache__/ next to the schema and rebuilt whenever the schema's mtime
+changes.
+
+Usage:
+    python3 .claude/utils/backlog_schema.py          # Print compiled schema as JSON
+    python3 .claude/utils/backlog_schema.py --field status
+"""
+
+import argparse
+import json
+import os
+import pickle
+import re
+import sys
+from datetime import date
+from pathlib import Path
+
+
+SCHEMA_PATH = Path(__file__).resolve().parent / 'backlog_schema.json'
+CACHE_FORMAT = 1
+FIELD_TYPES = ('str', 'date', 'list')
+
+_loaded = {}
+
+
+def coerce_str(value):
+    """Coerce a scalar frontmatter value to a stripped string."""
+    if isinstance(value, list):
+        raise ValueError("expected a single value, got a list")
+    return str(value).strip()
+
+
+def coerce_date(value):
+    """Coerce a frontmatter value to an ISO date string (YYYY-MM-DD)."""
+    text = str(value).strip()
+    date.fromisoformat(text)
+    return text
+
+
+def coerce_list(value):
+    """Coerce a frontmatter value to a list of strings."""
+    if value is None:
+        return []
+    if isinstance(value, list):
+        return [str(v) for v in value]
+    return [v.strip() for v in str(value).split(',') if v.strip()]
+
+
+COERCERS = {
+    'str': coerce_str,
+    'date': coerce_date,
+    'list': coerce_list,
+}
+
+
+class CompiledSchema:
+    """Frontmatter schema compiled for constant-time field checks."""
+
+    def __init__(self, spec):
+        self.version = spec['version']
+        self.fields = spec['fields']
+        self.required = spec['required']
+        self.choices = spec['choices']
+        self.defaults = spec['defaults']
+        self.field_types = spec['field_types']
+        self.allowed = {name: frozenset(values) for name, values in self.choices.items()}
+        self.ranks = {name: {v: i for i, v in enumerate(values)}
+                      for name, values in self.choices.items()}
+        self.patterns = {name: re.compile(source)
+                         for name, source in spec['patterns'].items()}
+        self.coercers = {name: COERCERS[t] for name, t in self.field_types.items()}
+
+    def values(self, field):
+        """Return the allowed values for an enum field, in schema order."""
+        return list(self.choices.get(field, ()))
+
+    def is_allowed(self, field, value):
+        """Check an enum value. Fields without an enum accept anything."""
+        allowed = self.allowed.get(field)
+        return allowed is None or value in allowed
+
+    def rank(self, field, value, missing=9):
+        """Position of value in the field's enum (for sorting by priority etc.)."""
+        return self.ranks.get(field, {}).get(value, missing)
+
+    def default(self, field, fallback=None):
+        """Default value for a field, as declared in the schema."""
+        value = self.defaults.get(field, fallback)
+        return list(value) if isinstance(value, list) else value
+
+    def coerce(self, frontmatter):
+        """
+        Return a copy of frontmatter with known fields coerced to their type.
+
+        Values that fail coercion are kept as-is; validate() reports them.
+        """
+        result = dict(frontmatter)
+        for name, coercer in self.coercers.items():
+            value = result.get(name)
+            if value is None:
+                if name in self.defaults:
+                    result[name] = self.default(name)
+                continue
+            try:
+                result[name] = coercer(value)
+            except ValueError:
+                pass
+        return result
+
+    def validate(self, frontmatter):
+        """
+        Validate parsed frontmatter against the schema.
+
+        Returns:
+            tuple: (errors, warnings) as lists of strings
+        """
+        errors = []
+        warnings = []
+
+        for field in self.required:
+            if frontmatter.get(field) is None:
+                errors.append(f"Missing required field: {field}")
+
+        for field, allowed in self.allowed.items():
+            value = frontmatter.get(field)
+            if value and (not isinstance(value, str) or value not in allowed):
+                errors.append(
+                    f"Invalid {field}: {value} (must be one of {list(self.choices[field])})")
+
+        for field, coercer in self.coercers.items():
+            value = frontmatter.get(field)
+            if value is None:
+                continue
+            try:
+                value = coercer(value)
+            except ValueError as e:
+                warnings.append(f"Invalid {field} '{value}': {e}")
+                continue
+            pattern = self.patterns.get(field)
+            if pattern and value and not pattern.match(value):
+                warnings.append(
+                    f"Invalid {field} format: '{value}' (expected {pattern.pattern})")
+
+        return errors, warnings
+
+
+def compile_spec(raw):
+    """Normalize a parsed backlog_schema.json into a picklable spec dict."""
+    fields = raw.get('fields')
+    if not isinstance(fields, dict) or not fields:
+        raise ValueError("Schema has no 'fields' mapping")
+
+    spec = {
+        'version': raw.get('version', 1),
+        'fields': tuple(fields),
+        'required': tuple(name for name, f in fields.items() if f.get('required')),
+        'choices': {},
+        'defaults': {},
+        'field_types': {},
+        'patterns': {},
+    }
+
+    for name, field in fields.items():
+        field_type = field.get('type', 'str')
+        if field_type not in FIELD_TYPES:
+            raise ValueError(f"Field '{name}' has unknown type '{field_type}'")
+        spec['field_types'][name] = field_type
+        if 'values' in field:
+            spec['choices'][name] = tuple(field['values'])
+        if 'default' in field:
+            spec['defaults'][name] = field['default']
+        if 'pattern' in field:
+            re.compile(field['pattern'])
+            spec['patterns'][name] = field['pattern']
+
+    return spec
+
+
+def _cache_path(schema_path):
+    return schema_path.parent / '__pycache__' / f'{schema_path.name}.pickle'
+
+
+def _read_cache(cache_path, stamp):
+    try:
+        with open(cache_path, 'rb') as f:
+            cached = pickle.load(f)
+    except (OSError, pickle.UnpicklingError, EOFError, AttributeError):
+        return None
+    if not isinstance(cached, dict) or cached.get('stamp') != stamp:
+        return None
+    return cached.get('spec')
+
+
+def _write_cache(cache_path, stamp, spec):
+    """Best-effort atomic cache write; a read-only install just skips caching."""
+    try:
+        cache_path.parent.mkdir(exist_ok=True)
+        tmp_path = cache_path.with_name(f'{cache_path.name}.{os.getpid()}.tmp')
+        with open(tmp_path, 'wb') as f:
+            pickle.dump({'stamp': stamp, 'spec': spec}, f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp_path, cache_path)
+    except OSError:
+        pass
+
+
+def load_schema(schema_path=None):
+    """
+    Load the compiled backlog schema.
+
+    Compiled once per process, and cached on disk keyed by the schema file's
+    mtime and size so later processes skip parsing and normalization.
+
+    Args:
+        schema_path: Override path to a schema JSON file
+
+    Returns:
+        CompiledSchema
+    """
+    schema_path = Path(schema_path) if schema_path else SCHEMA_PATH
+    st = schema_path.stat()
+    stamp = (CACHE_FORMAT, st.st_mtime_ns, st.st_size)
+
+    key = str(schema_path)
+    loaded = _loaded.get(key)
+    if loaded and loaded[0] == stamp:
+        return loaded[1]
+
+    cache_path = _cache_path(schema_path)
+    spec = _read_cache(cache_path, stamp)
+    if spec is None:
+        with open(schema_path, 'r', encoding='utf-8') as f:
+            spec = compile_spec(json.load(f))
+        _write_cache(cache_path, stamp, spec)
+
+    schema = CompiledSchema(spec)
+    _loaded[key] = (stamp, schema)
+    return schema
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Show the compiled backlog schema')
+    parser.add_argument('--field', help='Show a single field')
+    args = parser.parse_args()
+
+    try:
+        schema = load_schema()
+    except (OSError, ValueError) as e:
+        print(json.dumps({"error": f"Failed to load schema: {e}"}, indent=2))
+        sys.exit(1)
+
+    fields = {}
+    for name in schema.fields:
+        fields[name] = {
+            "type": schema.field_types[name],
+            "required": name in schema.required,
+            "values": schema.values(name) or None,
+            "pattern": schema.patterns[name].pattern if name in schema.patterns else None,
+            "default": schema.default(name),
+        }
+
+    if args.field:
+        if args.field not in fields:
+            print(json.dumps({"error": f"Unknown field: {args.field}"}, indent=2))
+            sys.exit(1)
+        fields = {args.field: fields[args.field]}
+
+    print(json.dumps({"version": schema.version, "fields": fields}, indent=2))
+
+
+if __name__ == '__main__':
+    main()
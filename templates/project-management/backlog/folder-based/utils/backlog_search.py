@@ -19,6 +19,8 @@ import sys
 from difflib import SequenceMatcher
 from pathlib import Path
 
+from backlog_schema import load_schema
+
 
 def find_project_root():
     """Find the project root directory."""
@@ -86,7 +88,8 @@ def scan_all_items(project_root):
     if not backlog_dir.exists():
         return items
 
-    type_dirs = ['feature', 'bug', 'tech-debt', 'research']
+    schema = load_schema()
+    type_dirs = schema.values('type')
 
     for type_dir in type_dirs:
         type_path = backlog_dir / type_dir
@@ -105,13 +108,15 @@ def scan_all_items(project_root):
             if not frontmatter:
                 continue
 
+            frontmatter = schema.coerce(frontmatter)
+            status = frontmatter['status']  # coerce() passes invalid values (a list) through
             items.append({
-                "id": frontmatter.get('id', item_dir.name),
-                "title": frontmatter.get('title', item_dir.name),
-                "type": frontmatter.get('type', type_dir),
-                "status": frontmatter.get('status', 'planned'),
-                "priority": frontmatter.get('priority', 'P3'),
-                "tags": frontmatter.get('tags', []),
+                "id": frontmatter.get('id') or item_dir.name,
+                "title": frontmatter.get('title') or item_dir.name,
+                "type": frontmatter.get('type') or type_dir,
+                "status": status.lower() if isinstance(status, str) else status,
+                "priority": frontmatter['priority'],
+                "tags": frontmatter['tags'],
                 "path": str(plan_path.relative_to(project_root))
             })
 
@@ -187,11 +192,12 @@ def check_duplicate(items, title, threshold=0.85):
 
 
 def main():
+    schema = load_schema()
     parser = argparse.ArgumentParser(description='Search backlog items')
     parser.add_argument('query', nargs='?', help='Search query')
-    parser.add_argument('--type', choices=['feature', 'bug', 'tech-debt', 'research'],
+    parser.add_argument('--type', choices=schema.values('type'),
                         help='Filter by type')
-    parser.add_argument('--status', choices=['planned', 'in_progress', 'blocked', 'complete'],
+    parser.add_argument('--status', choices=schema.values('status'),
                         help='Filter by status')
     parser.add_argument('--check-duplicate', metavar='TITLE',
                         help='Check if title is a duplicate')
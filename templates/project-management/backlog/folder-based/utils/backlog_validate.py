@@ -4,7 +4,7 @@ Backlog Validator
 
 Validates backlog items for:
 - Required frontmatter fields
-- Valid field values (status, priority, type)
+- Valid field values (status, priority, type) from backlog_schema.json
 - Circular dependency detection
 - Orphaned folders (no plan.md)
 
@@ -19,11 +19,7 @@ import re
 import sys
 from pathlib import Path
 
-
-REQUIRED_FIELDS = ['id', 'title', 'type', 'status', 'priority']
-VALID_TYPES = ['feature', 'bug', 'tech-debt', 'research']
-VALID_STATUSES = ['planned', 'in_progress', 'blocked', 'complete']
-VALID_PRIORITIES = ['P0', 'P1', 'P2', 'P3']
+from backlog_schema import load_schema
 
 
 def find_project_root():
@@ -79,30 +75,12 @@ def parse_yaml_frontmatter(file_path):
         return None, str(e)
 
 
-def validate_item(item_path, frontmatter):
-    """Validate a single backlog item."""
-    errors = []
-    warnings = []
-
-    # Check required fields
-    for field in REQUIRED_FIELDS:
-        if field not in frontmatter or frontmatter[field] is None:
-            errors.append(f"Missing required field: {field}")
-
-    # Validate type
-    item_type = frontmatter.get('type')
-    if item_type and item_type not in VALID_TYPES:
-        errors.append(f"Invalid type: {item_type} (must be one of {VALID_TYPES})")
-
-    # Validate status
-    status = frontmatter.get('status')
-    if status and status not in VALID_STATUSES:
-        errors.append(f"Invalid status: {status} (must be one of {VALID_STATUSES})")
+def validate_item(item_path, frontmatter, schema=None):
+    """Validate a single backlog item against the shared backlog schema."""
+    schema = schema or load_schema()
 
-    # Validate priority
-    priority = frontmatter.get('priority')
-    if priority and priority not in VALID_PRIORITIES:
-        errors.append(f"Invalid priority: {priority} (must be one of {VALID_PRIORITIES})")
+    # Required fields, enum values (type, status, priority) and formats
+    errors, warnings = schema.validate(frontmatter)
 
     # Check id matches folder name
     folder_name = item_path.parent.name
@@ -161,8 +139,9 @@ def validate_backlog(project_root):
         results["error"] = "backlog/ directory not found"
         return results
 
+    schema = load_schema()
     items = {}
-    type_dirs = ['feature', 'bug', 'tech-debt', 'research']
+    type_dirs = schema.values('type')
 
     for type_dir in type_dirs:
         type_path = backlog_dir / type_dir
@@ -192,7 +171,7 @@ def validate_backlog(project_root):
             if frontmatter is None:
                 frontmatter = {}
 
-            errors, warnings = validate_item(plan_path, frontmatter)
+            errors, warnings = validate_item(plan_path, frontmatter, schema)
 
             if errors:
                 results["valid"] = False
@@ -204,7 +183,7 @@ def validate_backlog(project_root):
                 "warnings": warnings
             })
 
-            items[frontmatter.get('id', item_dir.name)] = frontmatter
+            items[frontmatter.get('id', item_dir.name)] = schema.coerce(frontmatter)
 
     # Check for circular dependencies
     cycles = detect_circular_dependencies(items)
@@ -0,0 +1,43 @@
+"""Shared fixtures for the utils tests: a throwaway project with a backlog/."""
+
+import json
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+
+UTILS_DIR = Path(__file__).resolve().parent.parent / 'utils'
+# Optional companion from the folder-based backlog; not on the path, so the utils run standalone
+SCHEMA_DIR = UTILS_DIR.parents[2] / 'project-management' / 'backlog' / 'folder-based' / 'utils'
+sys.path.insert(0, str(UTILS_DIR))
+
+
+def write_plan(backlog_dir, rel, status='planned', body='', **fields):
+    """Create backlog/<rel>/plan.md with frontmatter. Returns: its Path"""
+    plan_path = backlog_dir / rel / 'plan.md'
+    plan_path.parent.mkdir(parents=True, exist_ok=True)
+    lines = ['---', f'id: {Path(rel).name}', f'status: {status}']
+    lines += [f'{key}: {value}' for key, value in fields.items()]
+    plan_path.write_text('\n'.join(lines + ['---', '', body]), encoding='utf-8')
+    return plan_path
+
+
+@pytest.fixture
+def project(tmp_path, monkeypatch):
+    """Empty project root (cwd) with backlog/."""
+    (tmp_path / 'backlog').mkdir()
+    monkeypatch.chdir(tmp_path)
+    return tmp_path
+
+
+@pytest.fixture
+def run_util(project):
+    """Run a utility script in the project. Returns: parsed JSON stdout"""
+    def run(script, *args):
+        proc = subprocess.run([sys.executable, str(UTILS_DIR / script), *args],
+                              cwd=project, capture_output=True, text=True,
+                              env=dict(os.environ, PYTHONDONTWRITEBYTECODE='1'))
+        return json.loads(proc.stdout)
+    return run
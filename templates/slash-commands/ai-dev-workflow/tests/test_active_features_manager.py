@@ -0,0 +1,108 @@
+"""set-status: compare-and-swap guards, line endings and what counts as a failed write."""
+
+import importlib.util
+
+import pytest
+
+import active_features_manager as manager
+from conftest import SCHEMA_DIR, write_plan
+
+
+@pytest.fixture(autouse=True)
+def fresh_project_root(project):
+    """find_project_root() is cached per process; each test has its own project."""
+    manager.find_project_root.cache_clear()
+
+
+def status_of(plan_path):
+    return manager.parse_yaml_frontmatter(plan_path)[0]['status']
+
+
+def test_expect_mismatch_is_a_conflict(project, run_util):
+    plan_path = write_plan(project / 'backlog', 'feat-a', 'blocked')
+    result = run_util('active_features_manager.py', 'set-status', 'feat-a', 'complete', '--expect', 'planned')
+    assert (result['success'], result['conflict']) == (False, True)
+    assert (result['expected'], result['actual']) == ('planned', 'blocked')
+    assert status_of(plan_path) == 'blocked'
+
+
+def test_expect_match_applies(project, run_util):
+    plan_path = write_plan(project / 'backlog', 'feat-a', 'planned')
+    result = run_util('active_features_manager.py', 'set-status', 'feat-a', 'in_progress', '--expect', 'Planned')
+    assert result['success']
+    assert status_of(plan_path) == 'in_progress'
+
+
+def test_bulk_where_guards_against_changes_since_the_scan(project, run_util):
+    backlog_dir = project / 'backlog'
+    write_plan(backlog_dir, 'feat-a', 'in_progress')
+    plan_b = write_plan(backlog_dir, 'feat-b', 'in_progress')
+    real_apply = manager.apply_status
+
+    def apply_after_a_concurrent_edit(name, plan_path, *args, **kwargs):
+        if name == 'feat-b':
+            manager.update_frontmatter(plan_b, {'status': 'blocked'})
+        return real_apply(name, plan_path, *args, **kwargs)
+
+    manager.apply_status = apply_after_a_concurrent_edit
+    try:
+        result = manager.bulk_set_status('complete', where='status=in_progress', workers=1)
+    finally:
+        manager.apply_status = real_apply
+    assert result['succeeded'] == ['feat-a']
+    assert [(f['feature'], f['conflict']) for f in result['failed']] == [('feat-b', True)]
+    assert status_of(plan_b) == 'blocked'
+
+
+def test_update_keeps_crlf_line_endings(project):
+    plan_path = project / 'backlog' / 'feat-a' / 'plan.md'
+    plan_path.parent.mkdir()
+    plan_path.write_bytes(b'---\r\nid: feat-a\r\nstatus: planned\r\n---\r\n\r\n# Feat A\r\n')
+    assert manager.update_frontmatter(plan_path, {'status': 'in_progress', 'started': '2026-10-19'})
+    assert plan_path.read_bytes() == (b'---\r\nid: feat-a\r\nstatus: in_progress\r\n'
+                                      b'started: 2026-10-19\r\n---\r\n\r\n# Feat A\r\n')
+
+
+def test_unreadable_plan_is_a_failed_update(project):
+    plan_path = project / 'backlog' / 'feat-a' / 'plan.md'
+    plan_path.parent.mkdir()
+    plan_path.write_bytes(b'---\nstatus: \xff\n---\n')
+    assert manager.update_frontmatter(plan_path, {'status': 'complete'}) is False
+
+
+def test_errors_after_the_write_propagate(project):
+    plan_path = write_plan(project / 'backlog', 'feat-a')
+
+    def on_commit(previous, frontmatter):
+        raise RuntimeError("journal bug")
+
+    with pytest.raises(RuntimeError):
+        manager.update_frontmatter(plan_path, {'status': 'complete'}, on_commit=on_commit)
+    assert status_of(plan_path) == 'complete'
+
+
+def test_fallback_statuses_match_the_schema():
+    spec = importlib.util.spec_from_file_location('backlog_schema', SCHEMA_DIR / 'backlog_schema.py')
+    backlog_schema = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(backlog_schema)
+    assert manager.FALLBACK_STATUSES == backlog_schema.load_schema().values('status')
+
+
+def test_set_status_works_without_the_schema(project):
+    assert manager.load_schema is None  # Not installed alongside in these tests
+    plan_path = write_plan(project / 'backlog', 'feat-a')
+    assert manager.set_status('feat-a', 'blocked')['success']
+    assert status_of(plan_path) == 'blocked'
+
+
+def test_is_active_with_a_non_string_status(project):
+    write_plan(project / 'backlog', 'feat-a', 'null')
+    write_plan(project / 'backlog', 'feat-b', '[planned, blocked]')
+    assert manager.is_active('feat-a')['is_active'] is False
+    assert manager.is_active('feat-b')['status'] == ''
+
+
+def test_invalid_status_is_rejected(project):
+    write_plan(project / 'backlog', 'feat-a')
+    result = manager.set_status('feat-a', 'in-progress')
+    assert (result['success'], result['error'].split('.')[0]) == (False, "Invalid status 'in-progress'")
@@ -0,0 +1,51 @@
+"""feature_discovery: concurrent HANDOFF.md status probes and their mtime/size cache."""
+
+import feature_discovery
+from conftest import write_plan
+
+
+def make_features(project, count=12):
+    backlog_dir = project / 'backlog'
+    dirs = []
+    for i in range(count):
+        feature_dir = write_plan(backlog_dir, f'feat-{i:02}', 'in_progress').parent
+        if i % 3 == 0:
+            (feature_dir / 'HANDOFF.md').write_text(f'# feat-{i}\n\n**Status**: step {i}\n', encoding='utf-8')
+        elif i % 3 == 1:
+            (feature_dir / 'HANDOFF.md').write_text('# no status here\n', encoding='utf-8')
+        dirs.append(feature_dir)
+    return backlog_dir, dirs
+
+
+def test_concurrent_probes_match_the_serial_check(project):
+    backlog_dir, dirs = make_features(project)
+    results = feature_discovery.probe_handoffs(dirs, backlog_dir, project)
+    assert results == {d: feature_discovery.validate_handoff_status(d) for d in dirs}
+    assert results[dirs[3]] == {"valid": True, "has_handoff": True, "status": "step 3"}
+    assert results[dirs[4]]['valid'] is False
+    assert results[dirs[5]] == {"valid": True, "has_handoff": False}
+
+
+def test_unchanged_handoffs_are_not_read_again(project, monkeypatch):
+    backlog_dir, dirs = make_features(project)
+    first = feature_discovery.probe_handoffs(dirs, backlog_dir, project)
+    assert len(feature_discovery.load_status_cache(backlog_dir)) == 8
+
+    reads = []
+    validate = feature_discovery.validate_handoff_status
+    monkeypatch.setattr(feature_discovery, 'validate_handoff_status',
+                        lambda d: reads.append(d.name) or validate(d))
+    assert feature_discovery.probe_handoffs(dirs, backlog_dir, project) == first
+    assert reads == []
+
+    (dirs[0] / 'HANDOFF.md').write_text('**Status**: blocked on review\n', encoding='utf-8')
+    results = feature_discovery.probe_handoffs(dirs, backlog_dir, project)
+    assert reads == ['feat-00']
+    assert results[dirs[0]]['status'] == 'blocked on review'
+
+
+def test_dropped_features_leave_the_cache(project):
+    backlog_dir, dirs = make_features(project)
+    feature_discovery.probe_handoffs(dirs, backlog_dir, project)
+    feature_discovery.probe_handoffs(dirs[:3], backlog_dir, project)
+    assert sorted(feature_discovery.load_status_cache(backlog_dir)) == ['backlog/feat-00', 'backlog/feat-01']
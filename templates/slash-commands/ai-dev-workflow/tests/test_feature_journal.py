@@ -0,0 +1,105 @@
+"""The journal's active view: served while every stamp matches, rebuilt otherwise."""
+
+import os
+
+import feature_journal
+from conftest import write_plan
+
+
+def active_names(run_util):
+    result = run_util('active_features_manager.py', 'list')
+    return result['source'], sorted(f['name'] for f in result['features'])
+
+
+def set_status(run_util, name, status):
+    assert run_util('active_features_manager.py', 'set-status', name, status)['success']
+
+
+def journaled(project, run_util, *plans):
+    """Backlog with the given (rel, status) plans, a journal and a fresh view."""
+    backlog_dir = project / 'backlog'
+    for rel, status in plans:
+        write_plan(backlog_dir, rel, status)
+    write_plan(backlog_dir, 'feat-z')
+    set_status(run_util, 'feat-z', 'on_hold')
+    active_names(run_util)  # Rebuilds the view
+    return backlog_dir
+
+
+def test_no_view_without_a_journal(project, run_util):
+    write_plan(project / 'backlog', 'feat-a', 'in_progress')
+    assert active_names(run_util) == ('scan', ['feat-a'])
+    assert active_names(run_util) == ('scan', ['feat-a'])
+    assert not (project / 'backlog' / '.cache' / 'active.json').exists()
+
+
+def test_view_is_served_after_a_scan(project, run_util):
+    journaled(project, run_util, ('feat-a', 'in_progress'), ('feat-b', 'planned'))
+    assert active_names(run_util) == ('view', ['feat-a'])
+
+
+def test_set_status_updates_the_view(project, run_util):
+    journaled(project, run_util, ('feat-a', 'planned'))
+    set_status(run_util, 'feat-a', 'in_progress')
+    assert active_names(run_util) == ('view', ['feat-a'])
+    records = feature_journal.read_journal(project / 'backlog')
+    assert [(r['feature'], r['to']) for r in records] == [('feat-z', 'on_hold'), ('feat-a', 'in_progress')]
+
+
+def test_hand_edited_plan_is_found(project, run_util):
+    # As start-feature Option B or a teammate's change arriving with git pull does
+    backlog_dir = journaled(project, run_util, ('feat-a', 'planned'))
+    assert active_names(run_util) == ('view', [])
+    plan_path = backlog_dir / 'feat-a' / 'plan.md'
+    plan_path.write_text(plan_path.read_text().replace('planned', 'in_progress'))
+    os.utime(plan_path, ns=(1, 1))
+    assert active_names(run_util) == ('scan', ['feat-a'])
+    assert active_names(run_util) == ('view', ['feat-a'])
+    assert run_util('feature_discovery.py')['count'] == 1
+
+
+def test_hand_created_plan_is_found(project, run_util):
+    # As /start-feature does: mkdir, then write plan.md with status in_progress
+    backlog_dir = journaled(project, run_util)
+    (backlog_dir / 'feat-new').mkdir()
+    assert active_names(run_util) == ('scan', [])
+    write_plan(backlog_dir, 'feat-new', 'in_progress')
+    assert active_names(run_util) == ('scan', ['feat-new'])
+    assert active_names(run_util) == ('view', ['feat-new'])
+
+
+def test_hand_created_plan_in_a_type_folder_is_found(project, run_util):
+    backlog_dir = journaled(project, run_util, ('features/feat-a', 'in_progress'))
+    assert active_names(run_util) == ('view', ['feat-a'])
+    write_plan(backlog_dir, 'bugs/bug-1', 'in_progress')
+    assert active_names(run_util) == ('scan', ['bug-1', 'feat-a'])
+
+
+def test_edited_listed_plan_invalidates_the_view(project, run_util):
+    backlog_dir = journaled(project, run_util, ('feat-a', 'in_progress'))
+    plan_path = backlog_dir / 'feat-a' / 'plan.md'
+    plan_path.write_text(plan_path.read_text().replace('in_progress', 'complete'))
+    os.utime(plan_path, ns=(1, 1))
+    assert active_names(run_util) == ('scan', [])
+
+
+def test_readers_only_write_the_cache_dir(project, run_util):
+    write_plan(project / 'backlog', 'feat-a', 'in_progress')
+    active_names(run_util)
+    run_util('feature_discovery.py')
+    run_util('handoff_loader.py', 'feat-a')
+    hidden = sorted(p.name for p in (project / 'backlog').iterdir() if p.name.startswith('.'))
+    assert hidden == ['.cache']
+    assert (project / 'backlog' / '.cache' / '.gitignore').read_text() == '*\n'
+    assert not (project / 'backlog' / '.cache' / 'handoff_served.json').exists()
+
+
+def test_backlog_stamps_cover_every_plan(project):
+    backlog_dir = project / 'backlog'
+    write_plan(backlog_dir, 'feat-a')
+    write_plan(backlog_dir, 'bugs/bug-1')
+    (backlog_dir / 'bugs' / 'bug-2').mkdir()
+    (backlog_dir / '_archive').mkdir()
+    directories, plans = feature_journal.backlog_stamps(backlog_dir)
+    assert sorted(directories) == ['.', 'bugs', 'bugs/bug-2']
+    assert sorted(plans) == ['bugs/bug-1/plan.md', 'feat-a/plan.md']
@@ -0,0 +1,71 @@
+"""feature_resolver: ids and folder names in flat and nested layouts, and the cached map."""
+
+import os
+
+import pytest
+
+import feature_resolver
+from conftest import write_plan
+
+
+@pytest.fixture(autouse=True)
+def fresh_memo():
+    """The map is memoized per process; each test starts from the cache file."""
+    feature_resolver._memo.clear()
+
+
+def set_id(plan_path, feature_id):
+    text = plan_path.read_text(encoding='utf-8')
+    plan_path.write_text(text.replace(f'id: {plan_path.parent.name}\n', f'id: {feature_id}\n', 1),
+                         encoding='utf-8')
+
+
+def test_folder_names_resolve_in_both_layouts(project):
+    backlog_dir = project / 'backlog'
+    write_plan(backlog_dir, 'feat-a')
+    write_plan(backlog_dir, 'features/login')
+    assert feature_resolver.resolve_feature_dir('feat-a', project) == backlog_dir / 'feat-a'
+    assert feature_resolver.resolve_feature_dir('login', project) == backlog_dir / 'features' / 'login'
+    assert feature_resolver.resolve_feature_dir('features', project) is None
+    assert feature_resolver.resolve_feature_dir('missing', project) is None
+
+
+def test_frontmatter_ids_resolve_and_folder_names_win(project):
+    backlog_dir = project / 'backlog'
+    set_id(write_plan(backlog_dir, 'bugs/fix-login'), 'BUG-7')
+    set_id(write_plan(backlog_dir, 'feat-a'), 'feat-b')
+    write_plan(backlog_dir, 'feat-b')
+    assert feature_resolver.resolve_feature_dir('BUG-7', project) == backlog_dir / 'bugs' / 'fix-login'
+    assert feature_resolver.resolve_feature_dir('fix-login', project) == backlog_dir / 'bugs' / 'fix-login'
+    assert feature_resolver.resolve_feature_dir('feat-b', project) == backlog_dir / 'feat-b'
+
+
+def test_cached_map_follows_new_moved_and_renamed_features(project):
+    backlog_dir = project / 'backlog'
+    plan_path = write_plan(backlog_dir, 'feat-a')
+    assert feature_resolver.resolve_feature_dir('feat-a', project) == backlog_dir / 'feat-a'
+    assert (backlog_dir / '.cache' / feature_resolver.MAP_NAME).exists()
+
+    write_plan(backlog_dir, 'features/login')
+    assert feature_resolver.resolve_feature_dir('login', project) == backlog_dir / 'features' / 'login'
+
+    (backlog_dir / 'done').mkdir()
+    plan_path.parent.rename(backlog_dir / 'done' / 'feat-a')
+    assert feature_resolver.resolve_feature_dir('feat-a', project) == backlog_dir / 'done' / 'feat-a'
+
+    # An id entry is dropped once plan.md no longer carries it
+    login_plan = backlog_dir / 'features' / 'login' / 'plan.md'
+    set_id(login_plan, 'AUTH-1')
+    assert feature_resolver.resolve_feature_dir('AUTH-1', project) == login_plan.parent
+    text = login_plan.read_text(encoding='utf-8').replace('id: AUTH-1\n', 'id: AUTH-2\n')
+    login_plan.write_text(text, encoding='utf-8')
+    mtime_ns = login_plan.stat().st_mtime_ns + 1_000_000_000
+    os.utime(login_plan, ns=(mtime_ns, mtime_ns))  # Coarse mtime filesystems
+    assert feature_resolver.resolve_feature_dir('AUTH-1', project) is None
+
+
+def test_cli_reports_dir_and_plan_path(project, run_util):
+    write_plan(project / 'backlog', 'features/login')
+    result = run_util('feature_resolver.py', 'login')
+    assert (result['dir'], result['plan_path']) == ('backlog/features/login', 'backlog/features/login/plan.md')
+    assert 'error' in run_util('feature_resolver.py', 'missing')
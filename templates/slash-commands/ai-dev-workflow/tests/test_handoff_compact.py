@@ -0,0 +1,54 @@
+"""handoff_compact: the size threshold, what moves to the archive and what stays."""
+
+import handoff_compact
+from conftest import write_plan
+
+SESSIONS = ('2026-01-01', '2026-01-08', '2026-01-15', '2026-01-22')
+
+
+def make_handoff(project, name='feat-a'):
+    feature_dir = write_plan(project / 'backlog', name, 'in_progress').parent
+    parts = ["# Handoff: feat-a\n\n**Status**: in progress\n\n## Next Steps\n- ship it\n\n"]
+    notes = ''.join(f"- note {n} on the session store\n" for n in range(10))
+    parts += [f"## Session {day}\n- worked on step {i}\n{notes}\n" for i, day in enumerate(SESSIONS)]
+    handoff_path = feature_dir / 'HANDOFF.md'
+    handoff_path.write_text(''.join(parts), encoding='utf-8')
+    return handoff_path
+
+
+def test_at_the_threshold_nothing_moves(project):
+    handoff_path = make_handoff(project)
+    before = handoff_path.read_text(encoding='utf-8')
+    size = handoff_path.stat().st_size
+    result = handoff_compact.compact_handoff('feat-a', threshold=size, project_root=project)
+    assert (result['compacted'], result['bytes_after']) == (False, size)
+    assert handoff_path.read_text(encoding='utf-8') == before
+    assert not (handoff_path.parent / handoff_compact.ARCHIVE_NAME).exists()
+
+
+def test_just_over_the_threshold_archives_older_sessions(project):
+    handoff_path = make_handoff(project)
+    size = handoff_path.stat().st_size
+    result = handoff_compact.compact_handoff('feat-a', threshold=size - 1, project_root=project)
+    assert result['compacted'] is True
+    assert result['archived'] == ['Session 2026-01-01', 'Session 2026-01-08']
+
+    text = handoff_path.read_text(encoding='utf-8')
+    assert len(text.encode('utf-8')) == result['bytes_after'] < size
+    assert '**Status**: in progress' in text and '## Next Steps' in text
+    assert '## Session 2026-01-15' in text and '## Session 2026-01-22' in text
+    assert '## Session 2026-01-01' not in text
+    assert f"- Session 2026-01-01 (13 lines) → {handoff_compact.ARCHIVE_NAME}" in text
+
+    archive = (handoff_path.parent / handoff_compact.ARCHIVE_NAME).read_text(encoding='utf-8')
+    assert 'worked on step 0' in archive and 'worked on step 1' in archive
+    matches = handoff_compact.search_archive('feat-a', 'step 1', project_root=project)['matches']
+    assert [m['section'] for m in matches] == ['Session 2026-01-08']
+
+
+def test_dry_run_reports_without_writing(project):
+    handoff_path = make_handoff(project)
+    before = handoff_path.read_text(encoding='utf-8')
+    result = handoff_compact.compact_handoff('feat-a', force=True, dry_run=True, project_root=project)
+    assert (result['dry_run'], len(result['archived'])) == (True, 2)
+    assert handoff_path.read_text(encoding='utf-8') == before
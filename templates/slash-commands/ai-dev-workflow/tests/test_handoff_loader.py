@@ -0,0 +1,72 @@
+"""handoff_loader: budgets split across features, and --record / --since deltas."""
+
+import handoff_loader
+from conftest import write_plan
+
+LONG = '\n'.join(f'Line {i} of the approach, long enough to cost tokens.' for i in range(200))
+
+
+def make_feature(backlog_dir, rel, priority, body=LONG, **fields):
+    return write_plan(backlog_dir, rel, 'in_progress', f'# {rel}\n\n## Approach\n\n{body}\n',
+                      priority=priority, **fields)
+
+
+def test_budget_is_split_by_priority(project):
+    backlog_dir = project / 'backlog'
+    make_feature(backlog_dir, 'feat-a', 'P0')
+    make_feature(backlog_dir, 'feat-b', 'P3')
+    result = handoff_loader.load_many(['feat-b', 'feat-a'], max_tokens=1000, project_root=project)
+    allocated = result['budget']['allocated']
+    assert [f['feature_name'] for f in result['features']] == ['feat-a', 'feat-b']
+    assert allocated == {'feat-a': 800, 'feat-b': 200}
+    for feature in result['features']:
+        assert 0 < feature['budget']['kept']['tokens'] <= allocated[feature['feature_name']]
+
+
+def test_small_feature_leaves_its_surplus_to_the_others(project):
+    backlog_dir = project / 'backlog'
+    make_feature(backlog_dir, 'feat-a', 'P0', body='Short.')
+    make_feature(backlog_dir, 'feat-b', 'P3')
+    result = handoff_loader.load_many(['feat-a', 'feat-b'], max_tokens=1000, project_root=project)
+    allocated = result['budget']['allocated']
+    assert allocated['feat-a'] < 100
+    assert allocated['feat-a'] + allocated['feat-b'] == 1000
+
+
+def test_feature_named_by_id_and_folder_loads_once(project):
+    backlog_dir = project / 'backlog'
+    plan_path = make_feature(backlog_dir, 'feat-b', 'P2')
+    plan_path.write_text(plan_path.read_text().replace('id: feat-b', 'id: feat-bee'))
+    make_feature(backlog_dir, 'feat-c', 'P2')
+    result = handoff_loader.load_many(['feat-bee', 'feat-b', 'feat-c'], max_tokens=1000,
+                                      project_root=project)
+    assert result['count'] == 2
+    assert [f['feature_name'] for f in result['features']] == ['feat-bee', 'feat-c']
+    assert result['budget']['allocated'] == {'feat-bee': 500, 'feat-c': 500}
+
+
+def test_since_last_reports_unchanged_then_only_the_changed_section(project, run_util):
+    plan_path = make_feature(project / 'backlog', 'feat-a', 'P1', body='Use sessions.')
+    handoff = plan_path.parent / 'HANDOFF.md'
+    handoff.write_text("**Status:** in progress\n\n## Next Steps\n- wire login\n\n## Blockers\nNone\n",
+                       encoding='utf-8')
+    full = run_util('handoff_loader.py', 'feat-a', '--record')
+
+    same = run_util('handoff_loader.py', 'feat-a', '--since', 'last')
+    assert same == {"feature_name": "feat-a", "content_hash": full['content_hash'],
+                    "since": full['content_hash'], "unchanged": True}
+
+    handoff.write_text(handoff.read_text(encoding='utf-8').replace('wire login', 'wire logout'),
+                       encoding='utf-8')
+    delta = run_util('handoff_loader.py', 'feat-a', '--since', 'last')
+    assert (delta['unchanged'], delta['since']) == (False, full['content_hash'])
+    changed = delta['delta']['HANDOFF.md']
+    assert [s['title'] for s in changed['changed']] == ['Next Steps']
+    assert 'wire logout' in changed['changed'][0]['content']
+    assert (changed['added'], changed['removed']) == ([], [])
+    assert all(not d['changed'] and not d['added'] for name, d in delta['delta'].items()
+               if name != 'HANDOFF.md')
+
+    # The delta is the new baseline
+    assert run_util('handoff_loader.py', 'feat-a', '--since', 'last')['unchanged'] is True
+    assert run_util('handoff_loader.py', 'feat-a', '--since', 'feedface')['baseline_missing'] is True
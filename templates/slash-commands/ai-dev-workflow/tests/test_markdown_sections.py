@@ -0,0 +1,79 @@
+"""Budgeted section selection: what a --max-tokens load keeps first."""
+
+import markdown_sections
+
+PLAN = """# Session auth
+
+**Status**: in_progress
+
+## Goal
+
+Cookie sessions instead of JWTs.
+
+## Approach
+
+Server-side store with rotation.
+"""
+
+HANDOFF = """# Handoff
+
+## Session 2026-01-05
+
+Old work notes.
+
+### Next Steps
+
+- Old step that was done long ago
+
+## Session 2026-02-10
+
+Current work notes.
+
+### Next Steps
+
+- Wire the refresh endpoint
+"""
+
+
+def parse(text, source):
+    return markdown_sections.parse_sections(text.splitlines(keepends=True), source)
+
+
+def labels(sections):
+    return [s.label for s in sections]
+
+
+def test_old_sessions_rank_after_the_plan_and_the_newest_session():
+    sections = parse(HANDOFF, 'HANDOFF.md') + parse(PLAN, 'plan.md')
+    order = labels(s for s in markdown_sections.rank(sections) if not s.lead)
+    assert order.index('HANDOFF.md: Session 2026-02-10 > Next Steps') == 0
+    old = order.index('HANDOFF.md: Session 2026-01-05 > Next Steps')
+    assert old > order.index('plan.md: Goal')
+    assert old > order.index('plan.md: Approach')
+    assert old > order.index('HANDOFF.md: Session 2026-02-10')
+
+
+def test_kept_subsection_brings_its_heading_lines():
+    sections = parse(HANDOFF, 'HANDOFF.md')
+    lead = sum(s.tokens for s in sections if s.lead)
+    next_steps = next(s for s in sections if s.label == 'HANDOFF.md: Session 2026-02-10 > Next Steps')
+    budget = lead + next_steps.tokens + markdown_sections.estimate_tokens(len('## Session 2026-02-10\n'))
+    kept, dropped, truncated = markdown_sections.select_sections(sections, budget)
+    text = markdown_sections.render(kept)
+    assert text.endswith('## Session 2026-02-10\n### Next Steps\n\n- Wire the refresh endpoint\n')
+    assert 'Current work notes' not in text
+    assert 'HANDOFF.md: Session 2026-02-10' in labels(dropped)  # the rest of that section
+    assert truncated is None
+
+
+def test_named_subsection_brings_its_heading_lines():
+    sections = parse(HANDOFF, 'HANDOFF.md')
+    kept, _, _ = markdown_sections.select_sections(sections, names=['Next Steps'])
+    assert markdown_sections.render(kept).count('## Session') == 2
+
+
+def test_unbudgeted_selection_keeps_everything():
+    sections = parse(HANDOFF, 'HANDOFF.md')
+    kept, dropped, truncated = markdown_sections.select_sections(sections)
+    assert markdown_sections.render(kept) == HANDOFF
+    assert (dropped, truncated) == ([], None)
@@ -0,0 +1,129 @@
+"""plan_validator: opt-in drift, the verdict cache and git baselines."""
+
+import subprocess
+import threading
+
+import plan_validator
+from conftest import write_plan
+
+PLAN_BODY = "# Login\n\n## Goal\nBuild the login flow with sessions\n\n## Approach\n- Redis session store\n"
+HANDOFF = "**Status:** in progress\n\n## Session 2026-01-01\n### Next Steps\n- wire the session store\n"
+
+
+def make_feature(project, name='feat-a'):
+    plan_path = write_plan(project / 'backlog', name, 'in_progress', PLAN_BODY)
+    (plan_path.parent / 'HANDOFF.md').write_text(HANDOFF, encoding='utf-8')
+    return plan_path
+
+
+def test_drift_is_opt_in(project):
+    make_feature(project)
+    assert plan_validator.validate_plan('feat-a', project)['drift'] is None
+    assert not (project / 'backlog' / '.cache' / 'drift_idf.json').exists()
+    assert plan_validator.validate_plan('feat-a', project, drift=True)['drift']['score'] is not None
+
+
+def test_verdict_key_covers_content_thresholds_and_code(monkeypatch):
+    key = plan_validator.content_key(PLAN_BODY, HANDOFF, None)
+    assert key == plan_validator.content_key(PLAN_BODY, HANDOFF, None)
+    assert key != plan_validator.content_key(PLAN_BODY, HANDOFF + 'x', None)
+    assert key != plan_validator.content_key(PLAN_BODY, None, None)
+    assert key != plan_validator.content_key(PLAN_BODY, HANDOFF, (0.5, 0.9))
+    monkeypatch.setattr(plan_validator, '_code_digest', 'edited-validator')
+    assert key != plan_validator.content_key(PLAN_BODY, HANDOFF, None)
+
+
+def test_cached_verdicts_reuse_drift_until_the_backlog_changes(project, monkeypatch):
+    import drift_score
+    make_feature(project, 'feat-a')
+    make_feature(project, 'feat-b')
+    calls = []
+    score = drift_score.score_drift
+    monkeypatch.setattr(drift_score, 'score_drift', lambda *a, **k: calls.append(1) or score(*a, **k))
+
+    def sweep():
+        drift_score._models.clear()  # One fit per process, as in separate runs
+        calls.clear()
+        return plan_validator.validate_many(['feat-a', 'feat-b'], project_root=project, drift=True)
+
+    first = sweep()
+    assert (first['cached'], len(calls)) == (0, 2)
+    second = sweep()
+    assert (second['cached'], len(calls)) == (2, 0)
+    assert second['table'] == first['table']
+
+    # Another feature's HANDOFF.md changes the IDF: verdicts stay cached, drift is rescored
+    other = make_feature(project, 'feat-c').parent / 'HANDOFF.md'
+    other.write_text(HANDOFF + "- unrelated words\n", encoding='utf-8')
+    third = sweep()
+    assert (third['cached'], len(calls)) == (2, 2)
+
+
+def test_stale_code_digest_misses_the_cache(project, monkeypatch):
+    make_feature(project)
+    plan_validator.validate_many(['feat-a'], project_root=project)
+    assert plan_validator.validate_many(['feat-a'], project_root=project)['cached'] == 1
+    monkeypatch.setattr(plan_validator, '_code_digest', 'edited-validator')
+    assert plan_validator.validate_many(['feat-a'], project_root=project)['cached'] == 0
+
+
+def git(root, *args):
+    subprocess.run(['git', '-c', 'user.name=t', '-c', 'user.email=t@t', *args],
+                   cwd=root, check=True, capture_output=True)
+
+
+def committed_project(project, names=('feat-a',)):
+    for name in names:
+        make_feature(project, name)
+    git(project, 'init', '-q')
+    git(project, 'add', '-A')
+    git(project, 'commit', '-qm', 'plans')
+
+
+def test_blob_store_skips_non_blob_bodies(project):
+    committed_project(project)
+    store = plan_validator.GitBlobStore(project)
+    try:
+        assert store.blob('HEAD', 'backlog/feat-a') is None  # a tree
+        assert store.blob('HEAD', 'backlog/missing.md') is None
+        sha, text = store.blob('HEAD', 'backlog/feat-a/plan.md')
+        assert sha == plan_validator.git_blob_sha(text)
+        assert text.endswith(PLAN_BODY)
+        assert store.blob('HEAD', 'backlog') is None
+        assert store.blob('HEAD', 'backlog/feat-a/HANDOFF.md')[1] == HANDOFF
+    finally:
+        store.close()
+
+
+def test_baseline_sweep_saves_the_baseline_cache_once(project, monkeypatch):
+    committed_project(project, ('feat-a', 'feat-b'))
+    saves = []
+    save = plan_validator.save_baseline_cache
+    monkeypatch.setattr(plan_validator, 'save_baseline_cache',
+                        lambda *a: saves.append(threading.current_thread()) or save(*a))
+
+    first = plan_validator.validate_many(['feat-a', 'feat-b'], baseline='HEAD', project_root=project)
+    assert saves == [threading.main_thread()]
+    assert [f['baseline']['cached'] for f in first['features']] == [False, False]
+    assert len(plan_validator.load_baseline_cache(project)) == 2
+
+    second = plan_validator.validate_many(['feat-a', 'feat-b'], baseline='HEAD', project_root=project)
+    assert len(saves) == 1
+    assert [f['baseline']['cached'] for f in second['features']] == [True, True]
+
+
+def test_same_named_nested_features_get_their_own_verdicts(project):
+    make_feature(project, 'features/login')
+    bug = make_feature(project, 'bugs/login').parent / 'HANDOFF.md'
+    bug.write_text(HANDOFF + "\n🚫 blocked on the auth service\n", encoding='utf-8')
+
+    names = plan_validator.all_feature_names(project)
+    assert sorted(names) == ['bugs/login', 'features/login']
+    first = plan_validator.validate_many(names, project_root=project)
+    categories = {f['feature_name']: f['category'] for f in first['features']}
+    assert categories['features/login'] != categories['bugs/login']
+    assert sorted(plan_validator.load_verdict_cache(project)) == ['bugs/login', 'features/login']
+
+    second = plan_validator.validate_many(names, project_root=project)
+    assert second['cached'] == 2
+    assert {f['feature_name']: f['category'] for f in second['features']} == categories
@@ -0,0 +1,38 @@
+"""resume_bundle: one process gives the same answers as the three separate utilities."""
+
+from conftest import write_plan
+
+PLAN_BODY = "# Login\n\n## Goal\nBuild the login flow\n\n## Approach\n- Redis session store\n"
+HANDOFF = "**Status:** in progress\n\n## Session 2026-01-01\n### Next Steps\n- wire the session store\n"
+
+
+def make_feature(project, name, status='in_progress'):
+    plan_path = write_plan(project / 'backlog', name, status, PLAN_BODY)
+    (plan_path.parent / 'HANDOFF.md').write_text(HANDOFF, encoding='utf-8')
+
+
+def test_single_active_feature_is_selected_and_matches_the_utilities(project, run_util):
+    make_feature(project, 'feat-a')
+    make_feature(project, 'feat-b', 'planned')
+    bundle = run_util('resume_bundle.py')
+    assert (bundle['feature_name'], bundle['selected_by']) == ('feat-a', 'auto')
+    assert bundle['discovery'] == run_util('feature_discovery.py')
+    assert bundle['context'] == run_util('handoff_loader.py', 'feat-a')
+    assert bundle['validation'] == run_util('plan_validator.py', 'feat-a')
+
+
+def test_several_active_features_return_discovery_only(project, run_util):
+    make_feature(project, 'feat-a')
+    make_feature(project, 'feat-b')
+    bundle = run_util('resume_bundle.py')
+    assert (bundle['feature_name'], bundle['context'], bundle['validation']) == (None, None, None)
+    assert bundle['discovery']['count'] == 2
+
+    named = run_util('resume_bundle.py', 'feat-b')
+    assert (named['feature_name'], named['selected_by']) == ('feat-b', 'argument')
+    assert named['validation']['category'] == 'valid'
+
+
+def test_unknown_feature_is_reported_by_the_validator(project, run_util):
+    bundle = run_util('resume_bundle.py', 'missing')
+    assert bundle['validation']['issues'] == ['Feature not found']
@@ -7,23 +7,66 @@ Replaces the old .active-features index file approach.
 
 Usage:
     python3 .claude/utils/active_features_manager.py list
+    python3 .claude/utils/active_features_manager.py list --rescan   # Ignore the journal view
     python3 .claude/utils/active_features_manager.py is-active "feature-name"
     python3 .claude/utils/active_features_manager.py set-status "feature-name" "in_progress"
     python3 .claude/utils/active_features_manager.py set-status "feature-name" "complete"
+    python3 .claude/utils/active_features_manager.py set-status "feature-name" "complete" --set effort_actual=6h
+    python3 .claude/utils/active_features_manager.py set-status "feature-name" "in_progress" --expect planned
+    python3 .claude/utils/active_features_manager.py set-status --where "status=in_progress,tag=infra" complete
+    printf "feat-a\nfeat-b\n" | python3 .claude/utils/active_features_manager.py set-status --stdin complete
 
 Output: JSON to stdout
     {"success": true, "message": "...", "features": [...]}
     {"success": false, "error": "..."}
 """
 
+import argparse
 import json
+import os
 import re
 import sys
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import ExitStack, contextmanager
+from datetime import date
+from functools import lru_cache
 from pathlib import Path
 
+try:
+    import fcntl
+except ImportError:  # Windows: no advisory locks, writes are still atomic
+    fcntl = None
 
+try:
+    from backlog_schema import load_schema
+except ImportError:  # backlog_schema.py not copied: built-in status list
+    load_schema = None
+
+try:
+    import feature_journal
+except ImportError:  # feature_journal.py not copied: no journal, list always scans
+    feature_journal = None
+
+try:
+    import feature_resolver
+except ImportError:  # feature_resolver.py not copied: flat backlog/<name>/ layout only
+    feature_resolver = None
+
+# Used when backlog_schema.py isn't installed alongside; tests check it matches backlog_schema.json
+FALLBACK_STATUSES = ['planned', 'in_progress', 'blocked', 'complete', 'on_hold']
+
+# Seconds set-status waits for another session's lock before giving up
+LOCK_TIMEOUT = 10.0
+
+# Concurrent plan.md updates for bulk set-status
+BULK_WORKERS = 8
+
+
+@lru_cache(maxsize=None)
 def find_project_root():
-    """Find the project root directory (where backlog/ should exist)."""
+    """Find the project root directory (where backlog/ should exist). Cached per process."""
     current = Path.cwd()
 
     # Try current directory first
@@ -44,6 +87,48 @@ def get_backlog_dir():
     return find_project_root() / 'backlog'
 
 
+def parse_frontmatter_content(content):
+    """
+    Parse YAML frontmatter from already-read markdown content.
+    
+    Returns:
+        tuple: (frontmatter_dict, frontmatter_end_pos)
+    """
+    if not content.startswith('---'):
+        return {}, 0
+    
+    end_match = re.search(r'\n---\s*\n', content[3:])
+    if not end_match:
+        return {}, 0
+    
+    yaml_content = content[3:end_match.start() + 3]
+    frontmatter_end = end_match.end() + 3
+    
+    frontmatter = {}
+    for line in yaml_content.strip().split('\n'):
+        if ':' in line:
+            key, value = line.split(':', 1)
+            key = key.strip()
+            value = value.strip()
+            
+            # Remove inline comments (the template annotates status/priority)
+            if '#' in value and not value.startswith(('[', '"', "'")):
+                value = value.split('#')[0].strip()
+            
+            if (value.startswith('"') and value.endswith('"')) or \
+               (value.startswith("'") and value.endswith("'")):
+                value = value[1:-1]
+            
+            if value.lower() in ('null', 'none', '~', ''):
+                value = None
+            elif value.startswith('[') and value.endswith(']'):
+                value = [v.strip().strip('"\'') for v in value[1:-1].split(',') if v.strip()]
+            
+            frontmatter[key] = value
+    
+    return frontmatter, frontmatter_end
+
+
 def parse_yaml_frontmatter(file_path):
     """
     Parse YAML frontmatter from a markdown file.
@@ -55,114 +140,269 @@ def parse_yaml_frontmatter(file_path):
         with open(file_path, 'r', encoding='utf-8') as f:
             content = f.read()
         
-        if not content.startswith('---'):
-            return {}, content, 0
-        
-        end_match = re.search(r'\n---\s*\n', content[3:])
-        if not end_match:
-            return {}, content, 0
-        
-        yaml_content = content[3:end_match.start() + 3]
-        frontmatter_end = end_match.end() + 3
-        
-        frontmatter = {}
-        for line in yaml_content.strip().split('\n'):
-            if ':' in line:
-                key, value = line.split(':', 1)
-                key = key.strip()
-                value = value.strip()
-                
-                if (value.startswith('"') and value.endswith('"')) or \
-                   (value.startswith("'") and value.endswith("'")):
-                    value = value[1:-1]
-                
-                if value.lower() in ('null', 'none', '~', ''):
-                    value = None
-                elif value.startswith('[') and value.endswith(']'):
-                    value = [v.strip().strip('"\'') for v in value[1:-1].split(',') if v.strip()]
-                
-                frontmatter[key] = value
-        
+        frontmatter, frontmatter_end = parse_frontmatter_content(content)
         return frontmatter, content, frontmatter_end
         
     except Exception as e:
         return {"_error": str(e)}, "", 0
 
 
-def update_frontmatter_field(file_path, field, value):
+class LockTimeout(Exception):
+    """Raised when a feature lock is not acquired within the timeout."""
+
+
+class StatusConflict(Exception):
+    """Raised when a compare-and-swap expectation does not match the file."""
+
+    def __init__(self, field, expected, actual):
+        super().__init__(f"Expected {field} '{expected}' but found '{actual}'")
+        self.field = field
+        self.expected = expected
+        self.actual = actual
+
+
+@contextmanager
+def feature_lock(file_path, timeout=LOCK_TIMEOUT):
+    """
+    Hold an exclusive advisory lock on the directory containing file_path.
+    
+    Writers (set-status) take this lock around read-modify-write. Readers
+    don't need it: writes land via atomic rename, so a reader always sees a
+    complete file. The directory is locked rather than plan.md itself because
+    the rename replaces plan.md's inode.
+    
+    Waits with backoff up to `timeout` seconds, then raises LockTimeout.
+    Without fcntl (native Windows) this is a no-op.
     """
-    Update a field in the YAML frontmatter.
+    if fcntl is None:
+        yield
+        return
     
+    fd = os.open(Path(file_path).parent, os.O_RDONLY)
+    try:
+        deadline = time.monotonic() + timeout
+        delay = 0.005
+        while True:
+            try:
+                fcntl.flock(fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+                break
+            except BlockingIOError:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    raise LockTimeout(f"Timed out after {timeout}s waiting for lock on {Path(file_path).parent}")
+                time.sleep(min(delay, remaining))
+                delay = min(delay * 2, 0.1)
+        try:
+            yield
+        finally:
+            fcntl.flock(fd, fcntl.LOCK_UN)
+    finally:
+        os.close(fd)
+
+
+def format_yaml_value(value):
+    """Format a Python value as a single-line YAML frontmatter value."""
+    if value is None:
+        return 'null'
+    if isinstance(value, list):
+        return '[' + ', '.join(value) + ']'
+    if isinstance(value, bool):
+        return 'true' if value else 'false'
+    return str(value)
+
+
+def patch_frontmatter(content, updates):
+    """
+    Apply field updates to the frontmatter of already-read file content.
+
+    Only the frontmatter region is rebuilt; the body is spliced back in
+    unchanged from its known offset. The frontmatter keeps the file's line
+    endings (CRLF or LF).
+
     Args:
-        file_path: Path to markdown file
-        field: Field name to update
-        value: New value
-        
+        content: Full markdown file content
+        updates: dict of {field: value}
+
     Returns:
-        bool: True if successful
+        str: New file content, or None if the file has no frontmatter
+    """
+    if not content.startswith('---'):
+        return None
+
+    # Match only the closing --- line so blank lines after it stay in the body
+    end_match = re.search(r'\n---[ \t]*\r?\n', content[3:])
+    if not end_match:
+        return None
+
+    yaml_content = content[3:end_match.start() + 3]
+    body_offset = end_match.end() + 3
+    newline = '\r\n' if end_match.group().endswith('\r\n') else '\n'
+
+    pending = {field: format_yaml_value(value) for field, value in updates.items()}
+    lines = yaml_content.replace('\r\n', '\n').split('\n')
+
+    # One pass over the frontmatter lines, replacing fields in place
+    for i, line in enumerate(lines):
+        key = line.split(':', 1)[0].strip() if ':' in line else None
+        if key in pending:
+            lines[i] = f'{key}: {pending.pop(key)}'
+
+    new_yaml = newline.join(lines).rstrip()
+    # Fields not already present are added before the closing ---
+    for field, yaml_value in pending.items():
+        new_yaml += f'{newline}{field}: {yaml_value}'
+
+    return '---' + new_yaml + newline + '---' + newline + content[body_offset:]
+
+
+def atomic_write(file_path, content, fsync=False):
+    """
+    Write content via a temp file in the same directory plus rename.
+
+    Readers see either the old or the new file, never a partial write.
+    Line endings are written as they are in content.
+    With fsync=True the data and the directory entry are flushed to disk.
     """
+    file_path = Path(file_path)
+    fd, tmp_path = tempfile.mkstemp(dir=file_path.parent, prefix=f'.{file_path.name}.', suffix='.tmp')
     try:
-        with open(file_path, 'r', encoding='utf-8') as f:
-            content = f.read()
-        
-        if not content.startswith('---'):
-            return False
-        
-        end_match = re.search(r'\n---\s*\n', content[3:])
-        if not end_match:
+        with os.fdopen(fd, 'w', encoding='utf-8', newline='') as f:
+            f.write(content)
+            if fsync:
+                f.flush()
+                os.fsync(f.fileno())
+        try:
+            os.chmod(tmp_path, file_path.stat().st_mode & 0o7777)
+        except FileNotFoundError:
+            pass
+        os.replace(tmp_path, file_path)
+    except BaseException:
+        try:
+            os.unlink(tmp_path)
+        except OSError:
+            pass
+        raise
+
+    if fsync:
+        dir_fd = os.open(file_path.parent, os.O_RDONLY)
+        try:
+            os.fsync(dir_fd)
+        finally:
+            os.close(dir_fd)
+
+
+def update_frontmatter(file_path, updates, fsync=False, expect=None, timeout=LOCK_TIMEOUT,
+                       on_commit=None):
+    """
+    Update several frontmatter fields with one read and one atomic write.
+    
+    The read-modify-write runs under feature_lock(), so concurrent sessions
+    cannot lose each other's updates.
+    
+    Args:
+        file_path: Path to markdown file
+        updates: dict of {field: value}
+        fsync: Flush the new file to disk before returning
+        expect: Optional dict of {field: value} that must match the current
+            frontmatter (compare-and-swap); checked under the lock
+        timeout: Seconds to wait for the lock
+        on_commit: Optional callback(previous_frontmatter, new_frontmatter),
+            run after the write while the lock is still held
+    
+    Returns:
+        bool: True if successful, False if the file couldn't be read or
+        written or has no frontmatter
+    
+    Raises:
+        StatusConflict: an `expect` value didn't match
+        LockTimeout: the lock wasn't acquired within `timeout`
+        Anything on_commit raises (the new file is already in place)
+    """
+    with ExitStack() as stack:
+        try:
+            stack.enter_context(feature_lock(file_path, timeout))
+            with open(file_path, 'r', encoding='utf-8', newline='') as f:
+                content = f.read()
+        except (OSError, UnicodeDecodeError):
             return False
         
-        yaml_end = end_match.start() + 3
-        yaml_content = content[3:yaml_end]
-        rest_of_file = content[end_match.end() + 3:]
-        
-        # Format value for YAML
-        if value is None:
-            yaml_value = 'null'
-        elif isinstance(value, list):
-            yaml_value = '[' + ', '.join(value) + ']'
-        elif isinstance(value, bool):
-            yaml_value = 'true' if value else 'false'
-        else:
-            yaml_value = str(value)
-        
-        # Check if field exists
-        field_pattern = re.compile(rf'^{re.escape(field)}:\s*.*$', re.MULTILINE)
-        
-        if field_pattern.search(yaml_content):
-            # Update existing field
-            new_yaml = field_pattern.sub(f'{field}: {yaml_value}', yaml_content)
-        else:
-            # Add new field before closing ---
-            new_yaml = yaml_content.rstrip() + f'\n{field}: {yaml_value}\n'
+        current, _ = parse_frontmatter_content(content)
+        if expect:
+            for field, expected in expect.items():
+                actual = current.get(field)
+                actual = actual.lower() if isinstance(actual, str) else actual
+                if actual != expected:
+                    raise StatusConflict(field, expected, actual)
         
-        # Reconstruct file
-        new_content = '---' + new_yaml + '---\n' + rest_of_file
-        
-        with open(file_path, 'w', encoding='utf-8') as f:
-            f.write(new_content)
+        new_content = patch_frontmatter(content, updates)
+        if new_content is None:
+            return False
         
+        try:
+            atomic_write(file_path, new_content, fsync=fsync)
+        except (OSError, UnicodeEncodeError):
+            return False
+        if on_commit is not None:
+            on_commit(current, parse_frontmatter_content(new_content)[0])
         return True
-        
-    except Exception:
-        return False
+
+
+def update_frontmatter_field(file_path, field, value):
+    """
+    Update a single field in the YAML frontmatter.
+    
+    Kept for existing callers; prefer update_frontmatter() for several fields.
+    
+    Returns:
+        bool: True if successful
+    """
+    return update_frontmatter(file_path, {field: value})
+
+
+def feature_dirs(backlog_dir):
+    """All feature directories, in flat and (with feature_resolver) nested layouts."""
+    if feature_resolver is not None:
+        return list(feature_resolver.iter_feature_dirs(backlog_dir))
+    return [item for item in backlog_dir.iterdir()
+            if item.is_dir() and not item.name.startswith('_')]
+
+
+def feature_plan_path(feature_name):
+    """
+    Path to a feature's plan.md, by folder name or frontmatter id.
+    
+    Uses feature_resolver's cached map when available (either layout);
+    otherwise assumes backlog/<name>/plan.md.
+    """
+    if feature_resolver is not None:
+        feature_dir = feature_resolver.resolve_feature_dir(feature_name, find_project_root())
+        if feature_dir is None:
+            return get_backlog_dir() / feature_name / 'plan.md'
+        return feature_dir / 'plan.md'
+    return get_backlog_dir() / feature_name / 'plan.md'
 
 
 def feature_exists(feature_name):
     """Check if feature directory exists."""
-    backlog_dir = get_backlog_dir()
-    feature_path = backlog_dir / feature_name
+    feature_path = feature_plan_path(feature_name).parent
     return feature_path.exists() and feature_path.is_dir()
 
 
-def list_features():
+def list_features(rescan=False):
     """
     List all active features (status: in_progress).
     
+    Served from the journal's materialized view (backlog/.cache/active.json)
+    when it is valid; otherwise every plan.md is scanned and the view rebuilt.
+    
+    Args:
+        rescan: Ignore the view and scan every plan.md
+    
     Returns:
         dict: JSON result with feature list
     """
-    backlog_dir = get_backlog_dir()
+    project_root = find_project_root()
+    backlog_dir = project_root / 'backlog'
     
     if not backlog_dir.exists():
         return {
@@ -170,23 +410,34 @@ def list_features():
             "error": f"backlog/ directory not found"
         }
     
-    features = []
+    active = None
+    if feature_journal is not None and not rescan:
+        active = feature_journal.load_active_view(backlog_dir, project_root)
+    source = "view" if active is not None else "scan"
     
-    for item in backlog_dir.iterdir():
-        if item.is_dir() and not item.name.startswith('_'):
+    if active is None:
+        scanned = feature_journal.scan_state(backlog_dir) if feature_journal else None
+        active = []
+        for item in feature_dirs(backlog_dir):
             plan_path = item / 'plan.md'
             if plan_path.exists():
                 frontmatter, _, _ = parse_yaml_frontmatter(plan_path)
-                status = frontmatter.get('status', '').lower()
+                status = status_of(frontmatter)
                 
                 if status == 'in_progress':
-                    features.append({
-                        "name": item.name,
-                        "id": frontmatter.get('id', item.name),
-                        "title": frontmatter.get('title'),
-                        "priority": frontmatter.get('priority'),
-                        "effort_estimate": frontmatter.get('effort_estimate')
-                    })
+                    active.append((item.name, plan_path, frontmatter))
+        if feature_journal is not None:
+            feature_journal.rebuild_active_view(backlog_dir, project_root, active, scanned)
+    
+    features = []
+    for name, _, frontmatter in active:
+        features.append({
+            "name": name,
+            "id": frontmatter.get('id', name),
+            "title": frontmatter.get('title'),
+            "priority": frontmatter.get('priority'),
+            "effort_estimate": frontmatter.get('effort_estimate')
+        })
     
     # Sort by priority
     priority_order = {'P0': 0, 'P1': 1, 'P2': 2, 'P3': 3, None: 9}
@@ -195,6 +446,7 @@ def list_features():
     return {
         "success": True,
         "count": len(features),
+        "source": source,
         "features": features
     }
 
@@ -206,8 +458,7 @@ def is_active(feature_name):
     Returns:
         dict: JSON result with active status
     """
-    backlog_dir = get_backlog_dir()
-    plan_path = backlog_dir / feature_name / 'plan.md'
+    plan_path = feature_plan_path(feature_name)
     
     if not plan_path.exists():
         return {
@@ -216,7 +467,7 @@ def is_active(feature_name):
         }
     
     frontmatter, _, _ = parse_yaml_frontmatter(plan_path)
-    status = frontmatter.get('status', '').lower()
+    status = status_of(frontmatter)
     
     return {
         "success": True,
@@ -226,55 +477,373 @@ def is_active(feature_name):
     }
 
 
-def set_status(feature_name, new_status):
-    """
-    Set feature status in frontmatter.
+def valid_statuses():
+    """Allowed status values, from the shared backlog schema when available."""
+    if load_schema is None:
+        return FALLBACK_STATUSES
+    try:
+        return load_schema().values('status')
+    except (OSError, ValueError):
+        return FALLBACK_STATUSES
+
+
+def status_of(frontmatter):
+    """Lower-cased status, or '' when it is missing or not a string (null, a list)."""
+    status = frontmatter.get('status')
+    return status.lower() if isinstance(status, str) else ''
+
+
+def check_status(new_status):
+    """Error result for a status the schema doesn't allow, or None if it's valid."""
+    statuses = valid_statuses()
+    if new_status not in statuses:
+        return {
+            "success": False,
+            "error": f"Invalid status '{new_status}'. Valid: {', '.join(statuses)}"
+        }
+    return None
+
+
+def status_updates(new_status, extra_fields=None):
+    """Build the frontmatter updates for a status change (status + timestamp + extras)."""
+    updates = {'status': new_status}
+    today = date.today().isoformat()
+    if new_status == 'in_progress':
+        updates['started'] = today
+    elif new_status == 'complete':
+        updates['completed'] = today
+    updates.update(extra_fields or {})
+    return updates
+
+
+def journal_callback(feature_name, plan_path):
+    """Build the on_commit hook that records a transition in the feature journal."""
+    if feature_journal is None:
+        return None
     
-    Valid statuses: planned, in_progress, complete, on_hold
+    project_root = find_project_root()
+    backlog_dir = project_root / 'backlog'
     
-    Returns:
-        dict: JSON result
+    def on_commit(previous, frontmatter):
+        try:
+            # Journal under the folder name so the view matches full-scan results
+            feature_journal.record_transition(
+                backlog_dir, project_root, plan_path.parent.name, plan_path, previous, frontmatter)
+        except OSError:
+            # The status change itself succeeded; listing falls back to a rescan
+            # because the plan.md mtime no longer matches the view.
+            pass
+    
+    return on_commit
+
+
+def apply_status(feature_name, plan_path, updates, fsync=False, expect=None, timeout=LOCK_TIMEOUT):
     """
-    valid_statuses = ['planned', 'in_progress', 'complete', 'on_hold']
+    Apply prepared status updates to one plan.md (locked, atomic, journaled).
     
-    if new_status.lower() not in valid_statuses:
+    Returns:
+        dict: JSON result for this feature
+    """
+    try:
+        updated = update_frontmatter(
+            plan_path, updates, fsync=fsync,
+            expect={'status': expect.lower()} if expect else None,
+            timeout=timeout,
+            on_commit=journal_callback(feature_name, plan_path))
+    except StatusConflict as e:
         return {
             "success": False,
-            "error": f"Invalid status '{new_status}'. Valid: {', '.join(valid_statuses)}"
+            "conflict": True,
+            "error": f"Status conflict for '{feature_name}': {e}",
+            "feature": feature_name,
+            "expected": e.expected,
+            "actual": e.actual
         }
-    
-    backlog_dir = get_backlog_dir()
-    plan_path = backlog_dir / feature_name / 'plan.md'
-    
-    if not plan_path.exists():
+    except LockTimeout as e:
         return {
             "success": False,
-            "error": f"Feature not found: {feature_name}"
+            "error": str(e),
+            "feature": feature_name
         }
     
-    if update_frontmatter_field(plan_path, 'status', new_status.lower()):
-        # Also update timestamps
-        from datetime import date
-        today = date.today().isoformat()
-        
-        if new_status.lower() == 'in_progress':
-            update_frontmatter_field(plan_path, 'started', today)
-        elif new_status.lower() == 'complete':
-            update_frontmatter_field(plan_path, 'completed', today)
-        
+    if updated:
         return {
             "success": True,
-            "message": f"Set '{feature_name}' status to '{new_status}'",
+            "message": f"Set '{feature_name}' status to '{updates['status']}'",
             "feature": feature_name,
-            "status": new_status.lower()
+            "status": updates['status'],
+            "updated": updates
         }
     else:
         return {
             "success": False,
-            "error": f"Failed to update frontmatter in {plan_path}"
+            "error": f"Failed to update frontmatter in {plan_path}",
+            "feature": feature_name
         }
 
 
+def set_status(feature_name, new_status, extra_fields=None, fsync=False,
+               expect=None, timeout=LOCK_TIMEOUT):
+    """
+    Set feature status in frontmatter.
+    
+    Valid statuses come from backlog_schema.json:
+    planned, in_progress, blocked, complete, on_hold
+    
+    The status, its started/completed timestamp and any extra fields are
+    written together in a single atomic update, under the feature lock.
+    
+    Args:
+        feature_name: Feature directory name
+        new_status: New status value
+        extra_fields: Optional dict of additional {field: value} to set
+        fsync: Flush plan.md to disk before returning
+        expect: Only apply if the current status equals this (compare-and-swap)
+        timeout: Seconds to wait for a concurrent writer's lock
+    
+    Returns:
+        dict: JSON result ("conflict": true when `expect` didn't match)
+    """
+    new_status = new_status.lower()
+    invalid = check_status(new_status)
+    if invalid:
+        return invalid
+    
+    plan_path = feature_plan_path(feature_name)
+    
+    if not plan_path.exists():
+        return {
+            "success": False,
+            "error": f"Feature not found: {feature_name}"
+        }
+    
+    updates = status_updates(new_status, extra_fields)
+    return apply_status(feature_name, plan_path, updates, fsync=fsync, expect=expect, timeout=timeout)
+
+
+def parse_where(expression):
+    """
+    Parse a --where filter like 'status=in_progress,tag=infra,priority=P0|P1'.
+    
+    Conditions are ANDed; '|' separates alternative values for one field.
+    
+    Returns:
+        tuple: (list of (field, frozenset of values), error string or None)
+    """
+    conditions = []
+    for part in expression.split(','):
+        if not part.strip():
+            continue
+        field, sep, values = part.partition('=')
+        field = field.strip()
+        if not sep or not field:
+            return None, f"Invalid --where condition '{part}'. Expected field=value"
+        if field == 'tag':
+            field = 'tags'
+        conditions.append((field, frozenset(v.strip() for v in values.split('|') if v.strip())))
+    if not conditions:
+        return None, "Empty --where filter"
+    return conditions, None
+
+
+def matches_where(frontmatter, conditions):
+    """Check parsed frontmatter against parse_where() conditions."""
+    for field, values in conditions:
+        actual = frontmatter.get(field)
+        if isinstance(actual, list):
+            if values.isdisjoint(actual):
+                return False
+        elif field == 'status':
+            if (actual or '').lower() not in values:
+                return False
+        elif actual not in values:
+            return False
+    return True
+
+
+def scan_features(backlog_dir):
+    """
+    Index every feature once: {name: (plan_path, frontmatter)}.
+    
+    Bulk operations resolve all their targets from this single pass instead
+    of looking each feature up separately.
+    """
+    index = {}
+    for item in feature_dirs(backlog_dir):
+        plan_path = item / 'plan.md'
+        if plan_path.exists():
+            frontmatter, _, _ = parse_yaml_frontmatter(plan_path)
+            if not frontmatter.get('_error'):
+                index.setdefault(item.name, (plan_path, frontmatter))
+    return index
+
+
+def bulk_set_status(new_status, names=None, where=None, extra_fields=None, fsync=False,
+                    expect=None, timeout=LOCK_TIMEOUT, workers=BULK_WORKERS):
+    """
+    Set the status of many features in one process.
+    
+    Targets come from an explicit list of names, a --where filter, or both
+    (names filtered by the condition). They are resolved from one scan of
+    the backlog, then updated concurrently; each file is still locked and
+    written atomically on its own. When the filter pins a single status and
+    no --expect is given, that status is used as the compare-and-swap guard
+    so features changed since the scan are reported as conflicts.
+    
+    Returns:
+        dict: JSON summary with per-feature successes and failures
+    """
+    new_status = new_status.lower()
+    invalid = check_status(new_status)
+    if invalid:
+        return invalid
+    
+    conditions = None
+    if where:
+        conditions, error = parse_where(where)
+        if error:
+            return {"success": False, "error": error}
+    
+    backlog_dir = get_backlog_dir()
+    if not backlog_dir.exists():
+        return {"success": False, "error": "backlog/ directory not found"}
+    
+    index = scan_features(backlog_dir)
+    failed = []
+    targets = []
+    
+    for name in (names if names is not None else sorted(index)):
+        entry = index.get(name)
+        if entry is None and feature_resolver is not None:
+            # Not a folder name; maybe a frontmatter id
+            entry = index.get(feature_plan_path(name).parent.name)
+        if entry is None:
+            failed.append({"feature": name, "success": False, "error": f"Feature not found: {name}"})
+        elif conditions is None or matches_where(entry[1], conditions):
+            targets.append((name, entry[0]))
+    
+    if expect is None and conditions:
+        pinned = [values for field, values in conditions if field == 'status' and len(values) == 1]
+        if pinned:
+            expect = next(iter(pinned[0]))
+    
+    updates = status_updates(new_status, extra_fields)
+    results = []
+    if targets:
+        with ThreadPoolExecutor(max_workers=max(1, min(workers, len(targets)))) as pool:
+            futures = [pool.submit(apply_status, name, plan_path, updates,
+                                   fsync=fsync, expect=expect, timeout=timeout)
+                       for name, plan_path in targets]
+            results = [future.result() for future in futures]
+    
+    succeeded = [r['feature'] for r in results if r.get('success')]
+    failed.extend(r for r in results if not r.get('success'))
+    
+    return {
+        "success": not failed,
+        "message": f"Set {len(succeeded)} of {len(succeeded) + len(failed)} feature(s) to '{new_status}'",
+        "status": new_status,
+        "where": where,
+        "expect": expect,
+        "matched": len(targets),
+        "succeeded": succeeded,
+        "failed": failed
+    }
+
+
+def read_feature_names(stream):
+    """Read feature names from stdin: whitespace separated, '#' starts a comment."""
+    names = []
+    for line in stream:
+        line = line.split('#', 1)[0]
+        names.extend(line.split())
+    return names
+
+
+def parse_field_assignments(assignments):
+    """
+    Parse --set key=value pairs into an updates dict.
+    
+    Enum fields (status, priority, type) are checked against the backlog
+    schema when it is available.
+    
+    Returns:
+        tuple: (updates dict, error string or None)
+    """
+    schema = None
+    if load_schema is not None:
+        try:
+            schema = load_schema()
+        except (OSError, ValueError):
+            schema = None
+    
+    updates = {}
+    for assignment in assignments:
+        key, sep, value = assignment.partition('=')
+        key = key.strip()
+        if not sep or not key or not re.fullmatch(r'[A-Za-z_][\w-]*', key):
+            return None, f"Invalid --set '{assignment}'. Expected key=value"
+        if key == 'status':
+            return None, "Use the positional <status> argument instead of --set status=..."
+        value = value.strip()
+        if schema and value and not schema.is_allowed(key, value):
+            return None, f"Invalid {key} '{value}'. Valid: {', '.join(schema.values(key))}"
+        updates[key] = value
+    return updates, None
+
+
+class JsonArgumentParser(argparse.ArgumentParser):
+    """ArgumentParser that raises instead of printing usage, so errors stay JSON."""
+
+    def error(self, message):
+        raise ValueError(message)
+
+
+def parse_set_status_args(argv):
+    """
+    Parse set-status arguments, returning (args, error string or None).
+    
+    Single form: <feature> <status>. Bulk forms take only <status> plus
+    --where and/or --stdin (or '-' as the feature name).
+    """
+    parser = JsonArgumentParser(prog='active_features_manager.py set-status', add_help=False)
+    parser.add_argument('targets', nargs='+', metavar='[FEATURE] STATUS')
+    parser.add_argument('--set', action='append', default=[], metavar='KEY=VALUE',
+                        help='Extra frontmatter field to set (repeatable)')
+    parser.add_argument('--fsync', action='store_true',
+                        help='Flush plan.md to disk before returning')
+    parser.add_argument('--expect', metavar='OLD_STATUS',
+                        help='Only update if the current status is OLD_STATUS')
+    parser.add_argument('--timeout', type=float, default=LOCK_TIMEOUT,
+                        help=f'Seconds to wait for the feature lock (default: {LOCK_TIMEOUT})')
+    parser.add_argument('--where', metavar='FILTER',
+                        help="Bulk: update every feature matching e.g. 'status=in_progress,tag=infra'")
+    parser.add_argument('--stdin', action='store_true',
+                        help='Bulk: read feature names from stdin')
+    parser.add_argument('--workers', type=int, default=BULK_WORKERS,
+                        help=f'Bulk: concurrent updates (default: {BULK_WORKERS})')
+    
+    try:
+        args, unknown = parser.parse_known_args(argv)
+    except ValueError as e:
+        return None, str(e)
+    if unknown:
+        return None, f"Unknown arguments: {' '.join(unknown)}"
+    
+    if args.targets[0] == '-':
+        args.stdin = True
+        args.targets = args.targets[1:]
+    args.bulk = bool(args.where or args.stdin)
+    
+    expected = 1 if args.bulk else 2
+    if len(args.targets) != expected:
+        return None, ("Usage: set-status <feature-name> <status> | "
+                      "set-status --where FILTER <status> | set-status --stdin <status>")
+    args.feature = None if args.bulk else args.targets[0]
+    args.status = args.targets[-1]
+    return args, None
+
+
 def main():
     """Main entry point."""
     if len(sys.argv) < 2:
@@ -288,7 +857,7 @@ def main():
     command = sys.argv[1].lower()
 
     if command == "list":
-        result = list_features()
+        result = list_features(rescan='--rescan' in sys.argv[2:])
 
     elif command == "is-active":
         if len(sys.argv) < 3:
@@ -298,11 +867,21 @@ def main():
         result = is_active(sys.argv[2])
 
     elif command == "set-status":
-        if len(sys.argv) < 4:
-            result = {"success": False, "error": "Usage: set-status <feature-name> <status>"}
-            print(json.dumps(result, indent=2))
-            sys.exit(1)
-        result = set_status(sys.argv[2], sys.argv[3])
+        args, error = parse_set_status_args(sys.argv[2:])
+        extra_fields = None
+        if not error:
+            extra_fields, error = parse_field_assignments(args.set)
+        if error:
+            result = {"success": False, "error": error}
+        elif args.bulk:
+            names = read_feature_names(sys.stdin) if args.stdin else None
+            result = bulk_set_status(args.status, names=names, where=args.where,
+                                     extra_fields=extra_fields, fsync=args.fsync,
+                                     expect=args.expect, timeout=args.timeout,
+                                     workers=args.workers)
+        else:
+            result = set_status(args.feature, args.status, extra_fields, fsync=args.fsync,
+                                expect=args.expect, timeout=args.timeout)
 
     # Legacy commands - show deprecation notice
     elif command in ("add", "remove"):
@@ -0,0 +1,349 @@
+#!/usr/bin/env python3
+"""
+Drift Score
+
+Numeric plan drift for plan_validator.py: the TF-IDF cosine similarity
+between a plan's Goal/Approach text and the most recent sections of its
+HANDOFF.md. The drift score is 1 - similarity (0 = same words, 1 = nothing
+in common). It complements the keyword checks, which only fire on phrases
+like "pivot" or "switching to".
+
+IDF is fitted across every plan.md and HANDOFF.md in the backlog. Each
+file's term set is cached in backlog/.cache/drift_idf.json with its mtime/size, so
+a refit only re-reads files that changed. Vectors are scored with NumPy
+when it's installed, with a pure-Python fallback giving the same numbers.
+
+Usage:
+    python3 .claude/utils/drift_score.py <feature-name>
+    python3 .claude/utils/drift_score.py --refit     # Rebuild the IDF cache
+"""
+
+import argparse
+import hashlib
+import json
+import math
+import os
+import re
+import sys
+import threading
+from collections import Counter
+from pathlib import Path
+
+try:
+    import numpy as np
+except ImportError:  # NumPy not installed: pure-Python cosine
+    np = None
+
+try:
+    import feature_resolver
+except ImportError:  # feature_resolver.py not copied: flat backlog/<name>/ layout only
+    feature_resolver = None
+
+try:
+    import markdown_sections
+except ImportError:  # markdown_sections.py not copied: score the whole handoff
+    markdown_sections = None
+
+
+CACHE_DIR = '.cache'
+MODEL_NAME = 'drift_idf.json'
+MODEL_FORMAT = 1
+CORPUS_FILES = ('plan.md', 'HANDOFF.md')
+
+# Latest handoff chunks (dated sessions, else last top-level sections) compared to the plan
+RECENT_CHUNKS = 2
+
+# Drift score at or above which the drift category becomes update / invalid
+UPDATE_THRESHOLD = 0.80
+INVALID_THRESHOLD = 0.95
+
+TOKEN_PATTERN = re.compile(r'[a-z][a-z0-9_]+')
+STOPWORDS = frozenset('''
+    a about after all also an and any are as at be been before being but by can
+    could did do does done for from had has have how if in into is it its just
+    may more most must no not now of on once only or other our out over same
+    should so some such than that the their them then there these they this
+    those to too under until up use used using via was we were what when where
+    which while who will with would yes you your
+    md todo tbd etc see note notes
+'''.split())
+
+
+def tokenize(text):
+    """Lowercased word tokens without stopwords or 1-letter words."""
+    return [t for t in TOKEN_PATTERN.findall((text or '').lower()) if t not in STOPWORDS]
+
+
+def find_project_root():
+    """Find the project root directory (where backlog/ or .claude/ exists)."""
+    current = Path.cwd()
+
+    # Try current directory first
+    if (current / 'backlog').exists() or (current / '.claude').exists():
+        return current
+
+    # Walk up to find backlog or .claude directory
+    for parent in current.parents:
+        if (parent / 'backlog').exists() or (parent / '.claude').exists():
+            return parent
+
+    # Fallback: assume we're in project root
+    return current
+
+
+def iter_feature_dirs(backlog_dir):
+    """Feature directories in the backlog (flat layout only without feature_resolver)."""
+    if feature_resolver is not None:
+        yield from feature_resolver.iter_feature_dirs(backlog_dir)
+        return
+    for entry in sorted(os.scandir(backlog_dir), key=lambda e: e.name):
+        if entry.is_dir() and not entry.name.startswith(('_', '.')):
+            yield Path(entry.path)
+
+
+class IdfModel:
+    """Document frequencies over the backlog's plan.md and HANDOFF.md files."""
+
+    def __init__(self, docs, df, digest=None):
+        self.docs = docs
+        self.df = df
+        self.digest = digest  # Changes whenever a corpus file does (for caching scores)
+
+    def idf(self, term):
+        """Smoothed IDF; terms never seen in the backlog get the maximum weight."""
+        return math.log((1 + self.docs) / (1 + self.df.get(term, 0))) + 1
+
+    def weights(self, text):
+        """{term: tf * idf} for a text."""
+        counts = Counter(tokenize(text))
+        return {term: count * self.idf(term) for term, count in counts.items()}
+
+
+def cache_dir(backlog_dir):
+    """backlog/.cache/, created on first write with a .gitignore that ignores all of it."""
+    path = backlog_dir / CACHE_DIR
+    if not path.is_dir():
+        path.mkdir(exist_ok=True)
+        (path / '.gitignore').write_text('*\n', encoding='utf-8')
+    return path
+
+
+def _load_model_cache(backlog_dir):
+    try:
+        with open(backlog_dir / CACHE_DIR / MODEL_NAME, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+    except (OSError, ValueError):
+        return {}
+    if not isinstance(data, dict) or data.get('format') != MODEL_FORMAT:
+        return {}
+    return data.get('files', {})
+
+
+def _save_model_cache(backlog_dir, files):
+    try:
+        cache_path = cache_dir(backlog_dir) / MODEL_NAME
+        tmp_path = cache_path.with_name(f'{MODEL_NAME}.{os.getpid()}.{threading.get_ident()}.tmp')
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump({"format": MODEL_FORMAT, "files": files}, f)
+        os.replace(tmp_path, cache_path)
+    except OSError:
+        pass  # Read-only checkout: fit in memory only
+
+
+def fit_model(project_root, refit=False):
+    """
+    Fit IDF across the backlog, re-reading only files whose mtime/size changed.
+
+    Returns:
+        tuple: (IdfModel, {"files", "reread"} fit stats)
+    """
+    backlog_dir = project_root / 'backlog'
+    cached = {} if refit else _load_model_cache(backlog_dir)
+    files = {}
+    reread = 0
+
+    if backlog_dir.is_dir():
+        for feature_dir in iter_feature_dirs(backlog_dir):
+            for name in CORPUS_FILES:
+                path = feature_dir / name
+                try:
+                    st = path.stat()
+                except OSError:
+                    continue
+                rel = path.relative_to(project_root).as_posix()
+                stamp = [st.st_mtime_ns, st.st_size]
+                entry = cached.get(rel)
+                if entry is None or entry.get('stamp') != stamp:
+                    try:
+                        terms = sorted(set(tokenize(path.read_text(encoding='utf-8'))))
+                    except (OSError, UnicodeDecodeError):
+                        continue
+                    entry = {"stamp": stamp, "terms": terms}
+                    reread += 1
+                files[rel] = entry
+
+    if reread or set(files) != set(cached):
+        _save_model_cache(backlog_dir, files)
+
+    df = Counter()
+    for entry in files.values():
+        df.update(entry['terms'])
+    digest = hashlib.sha256(json.dumps(
+        sorted((rel, entry['stamp']) for rel, entry in files.items())).encode('utf-8')).hexdigest()[:16]
+    return IdfModel(len(files), df, digest), {"files": len(files), "reread": reread}
+
+
+_models = {}
+_models_lock = threading.Lock()
+
+
+def load_model(project_root):
+    """Fitted model for a project, fitted once per process (shared by threads)."""
+    key = str(project_root)
+    with _models_lock:
+        if key not in _models:
+            _models[key] = fit_model(project_root)[0]
+        return _models[key]
+
+
+def recent_text(handoff_content, chunks=RECENT_CHUNKS):
+    """
+    Text of the newest handoff chunks: the latest dated sessions, or the
+    last top-level sections when none are dated. The lead (title, status)
+    is left out. Without markdown_sections the whole handoff is used.
+    """
+    if not handoff_content:
+        return ''
+    if markdown_sections is None:
+        return handoff_content
+    sections = [s for s in markdown_sections.parse_sections(handoff_content.splitlines(True))
+                if not s.lead]
+    newest = {}
+    for section in sections:
+        key = markdown_sections.recency(section)
+        newest[section.root] = max(newest.get(section.root, key), key)
+    roots = set(sorted(newest, key=newest.get, reverse=True)[:chunks])
+    return ''.join(s.text() for s in sections if s.root in roots)
+
+
+def cosine_matrix(rows, columns):
+    """
+    Cosine similarity of every weight dict in `rows` against every one in
+    `columns`. One matrix product with NumPy, dict dot products without.
+
+    Returns:
+        list: [[similarity]] with one row per entry of `rows`
+    """
+    if np is not None:
+        vocab = {}
+        for weights in (*rows, *columns):
+            for term in weights:
+                vocab.setdefault(term, len(vocab))
+
+        def matrix(dicts):
+            m = np.zeros((len(dicts), max(len(vocab), 1)))
+            for i, weights in enumerate(dicts):
+                for term, weight in weights.items():
+                    m[i, vocab[term]] = weight
+            norms = np.linalg.norm(m, axis=1, keepdims=True)
+            return np.divide(m, norms, out=np.zeros_like(m), where=norms > 0)
+
+        return (matrix(rows) @ matrix(columns).T).tolist()
+
+    def norm(weights):
+        return math.sqrt(sum(w * w for w in weights.values()))
+
+    result = []
+    for a in rows:
+        row = []
+        for b in columns:
+            na, nb = norm(a), norm(b)
+            if not na or not nb:
+                row.append(0.0)
+                continue
+            small, large = (a, b) if len(a) <= len(b) else (b, a)
+            row.append(sum(w * large.get(t, 0.0) for t, w in small.items()) / (na * nb))
+        result.append(row)
+    return result
+
+
+def drift_category(score, update=UPDATE_THRESHOLD, invalid=INVALID_THRESHOLD):
+    """valid / update / invalid for a drift score."""
+    if score >= invalid:
+        return "invalid"
+    if score >= update:
+        return "update"
+    return "valid"
+
+
+def score_drift(goal, approach, handoff_content, model,
+                update=UPDATE_THRESHOLD, invalid=INVALID_THRESHOLD):
+    """
+    Score drift between a plan's goal/approach and the handoff's recent sections.
+
+    Args:
+        goal: Goal text from the plan (or None)
+        approach: Approach text from the plan (or None)
+        handoff_content: Full HANDOFF.md text
+        model: IdfModel from load_model()/fit_model()
+        update: Drift score at or above which the category is "update"
+        invalid: Drift score at or above which the category is "invalid"
+
+    Returns:
+        dict or None: {"score", "category", "goal_similarity",
+        "approach_similarity", "shared_terms", "thresholds", "vectorized"},
+        or None when there is nothing to compare
+    """
+    plan_text = '\n'.join(t for t in (goal, approach) if t)
+    recent = recent_text(handoff_content)
+    if not plan_text or not recent:
+        return None
+
+    rows = [model.weights(plan_text), model.weights(goal), model.weights(approach)]
+    handoff = model.weights(recent)
+    (combined,), (goal_sim,), (approach_sim,) = cosine_matrix(rows, [handoff])
+
+    shared = sorted(set(rows[0]) & set(handoff),
+                    key=lambda t: rows[0][t] * handoff[t], reverse=True)
+    score = round(1 - combined, 3)
+    return {
+        "score": score,
+        "category": drift_category(score, update, invalid),
+        "goal_similarity": round(goal_sim, 3) if goal else None,
+        "approach_similarity": round(approach_sim, 3) if approach else None,
+        "shared_terms": shared[:8],
+        "thresholds": {"update": update, "invalid": invalid},
+        "vectorized": np is not None
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description='TF-IDF drift between plan and handoff')
+    parser.add_argument('feature', nargs='?', help='Feature name or id')
+    parser.add_argument('--refit', action='store_true', help='Re-read every file for the IDF fit')
+    args = parser.parse_args()
+
+    project_root = find_project_root()
+    model, stats = fit_model(project_root, refit=args.refit)
+    if not args.feature:
+        print(json.dumps({"fit": stats, "terms": len(model.df)}, indent=2))
+        sys.exit(0)
+
+    # Goal/approach extraction lives in plan_validator
+    import plan_validator
+    feature_dir = plan_validator.resolve_feature_dir(project_root, args.feature)
+    try:
+        plan = (feature_dir / 'plan.md').read_text(encoding='utf-8')
+        handoff = (feature_dir / 'HANDOFF.md').read_text(encoding='utf-8')
+    except (OSError, UnicodeDecodeError) as e:
+        print(json.dumps({"feature_name": args.feature, "error": str(e)}, indent=2))
+        sys.exit(1)
+
+    drift = score_drift(plan_validator.extract_goal(plan),
+                        plan_validator.extract_approach(plan), handoff, model)
+    print(json.dumps({"feature_name": args.feature, "fit": stats, "drift": drift}, indent=2))
+    sys.exit(0)
+
+
+if __name__ == '__main__':
+    main()
@@ -7,16 +7,36 @@ YAML frontmatter. Features with status: in_progress are considered active.
 
 Usage:
     python3 .claude/utils/feature_discovery.py
+    python3 .claude/utils/feature_discovery.py --rescan   # Ignore the journal view
 
 Output:
     JSON with feature count and structured feature data
 """
 
 import json
+import os
 import re
 import sys
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 
+try:
+    import feature_journal
+except ImportError:  # feature_journal.py not copied: always scan
+    feature_journal = None
+
+try:
+    import feature_resolver
+except ImportError:  # feature_resolver.py not copied: flat backlog/<name>/ layout only
+    feature_resolver = None
+
+
+# HANDOFF.md status probes run concurrently; results are cached by mtime/size
+PROBE_WORKERS = 8
+CACHE_DIR = '.cache'
+STATUS_CACHE_NAME = 'handoff_status.json'
+STATUS_CACHE_FORMAT = 1
+
 
 def find_project_root():
     """Find the project root directory (where backlog/ or .claude/ exists)."""
@@ -88,6 +108,35 @@ def parse_yaml_frontmatter(file_path):
         return {"_error": str(e)}
 
 
+STATUS_PATTERN = re.compile(r'\*\*Status\*\*:\s*(.+)')
+
+
+def handoff_status_from_lines(lines):
+    """
+    Extract the **Status**: line from the first lines of a HANDOFF.md.
+    
+    Args:
+        lines: First 10 lines of HANDOFF.md
+        
+    Returns:
+        dict: {"valid": bool, "has_handoff": True, "error"/"status": str}
+    """
+    for line in lines:
+        match = STATUS_PATTERN.search(line)
+        if match:
+            return {
+                "valid": True,
+                "has_handoff": True,
+                "status": match.group(1).strip()
+            }
+    
+    return {
+        "valid": False,
+        "has_handoff": True,
+        "error": "Missing **Status:** line in first 10 lines of HANDOFF.md"
+    }
+
+
 def validate_handoff_status(feature_dir):
     """
     Validate HANDOFF.md has proper Status line in first 10 lines.
@@ -109,23 +158,7 @@ def validate_handoff_status(feature_dir):
     try:
         with open(handoff_path, 'r', encoding='utf-8') as f:
             lines = [f.readline() for _ in range(10)]
-        
-        status_pattern = re.compile(r'\*\*Status\*\*:\s*(.+)')
-        
-        for line in lines:
-            match = status_pattern.search(line)
-            if match:
-                return {
-                    "valid": True,
-                    "has_handoff": True,
-                    "status": match.group(1).strip()
-                }
-        
-        return {
-            "valid": False,
-            "has_handoff": True,
-            "error": "Missing **Status:** line in first 10 lines of HANDOFF.md"
-        }
+        return handoff_status_from_lines(lines)
         
     except Exception as e:
         return {
@@ -135,14 +168,127 @@ def validate_handoff_status(feature_dir):
         }
 
 
-def discover_features():
+def cache_dir(backlog_dir):
+    """backlog/.cache/, created on first write with a .gitignore that ignores all of it."""
+    path = backlog_dir / CACHE_DIR
+    if not path.is_dir():
+        path.mkdir(exist_ok=True)
+        (path / '.gitignore').write_text('*\n', encoding='utf-8')
+    return path
+
+
+def load_status_cache(backlog_dir):
+    """Read cached HANDOFF.md status probes ({relative path: entry})."""
+    try:
+        with open(backlog_dir / CACHE_DIR / STATUS_CACHE_NAME, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+    except (OSError, ValueError):
+        return {}
+    if not isinstance(data, dict) or data.get('format') != STATUS_CACHE_FORMAT:
+        return {}
+    return data.get('entries', {})
+
+
+def save_status_cache(backlog_dir, entries):
+    """Best-effort atomic write of the status cache (skipped on read-only checkouts)."""
+    try:
+        cache_path = cache_dir(backlog_dir) / STATUS_CACHE_NAME
+        tmp_path = cache_path.with_name(f'{STATUS_CACHE_NAME}.{os.getpid()}.tmp')
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump({"format": STATUS_CACHE_FORMAT, "entries": entries}, f, indent=2)
+        os.replace(tmp_path, cache_path)
+    except OSError:
+        pass
+
+
+def probe_handoff(feature_dir, cached=None):
+    """
+    Stat HANDOFF.md and only read it when the cached probe is stale.
+    
+    Args:
+        feature_dir: Path to feature directory
+        cached: Cache entry from a previous run ({"stamp": [mtime_ns, size], "result": ...})
+        
+    Returns:
+        tuple: (validate_handoff_status() result, cache entry or None if uncacheable)
+    """
+    try:
+        st = (feature_dir / 'HANDOFF.md').stat()
+    except FileNotFoundError:
+        return {"valid": True, "has_handoff": False}, None
+    except OSError:
+        return validate_handoff_status(feature_dir), None
+    
+    stamp = [st.st_mtime_ns, st.st_size]
+    if cached and cached.get('stamp') == stamp:
+        return cached['result'], cached
+    
+    result = validate_handoff_status(feature_dir)
+    if result.get('error', '').startswith('Failed to read'):
+        return result, None
+    return result, {"stamp": stamp, "result": result}
+
+
+def probe_handoffs(feature_dirs, backlog_dir, project_root, workers=PROBE_WORKERS):
+    """
+    Probe the Status line of many HANDOFF.md files concurrently.
+    
+    Unchanged files (same mtime and size as last run) are answered from
+    backlog/.cache/handoff_status.json, so they cost one stat and no read. Misses
+    are read on a thread pool, which overlaps the I/O wait on slow disks.
+    
+    Args:
+        feature_dirs: Feature directories to probe
+        backlog_dir: Path to backlog/ (holds the cache)
+        project_root: Project root (cache keys are relative to it)
+        workers: Thread pool size
+        
+    Returns:
+        dict: {feature_dir: validate_handoff_status() result}
+    """
+    cache = load_status_cache(backlog_dir)
+    keys = [str(d.relative_to(project_root)) for d in feature_dirs]
+    
+    def probe(index):
+        return probe_handoff(feature_dirs[index], cache.get(keys[index]))
+    
+    if len(feature_dirs) > 1:
+        with ThreadPoolExecutor(max_workers=min(workers, len(feature_dirs))) as pool:
+            probes = list(pool.map(probe, range(len(feature_dirs))))
+    else:
+        probes = [probe(i) for i in range(len(feature_dirs))]
+    
+    results = {}
+    entries = {}
+    for feature_dir, key, (result, entry) in zip(feature_dirs, keys, probes):
+        results[feature_dir] = result
+        if entry is not None:
+            entries[key] = entry
+    
+    # Only active features are kept, so finished ones drop out of the cache
+    if entries != cache:
+        save_status_cache(backlog_dir, entries)
+    return results
+
+
+def discover_features(rescan=False, project_root=None, handoffs=None):
     """
     Discover active features by scanning backlog/*/plan.md frontmatter.
     
+    Uses the feature journal's active view (backlog/.cache/active.json) when it is
+    valid, so plan files are only stat'ed, not read and parsed.
+    
+    Args:
+        rescan: Ignore the view and scan every plan.md
+        project_root: Project root (found from cwd if omitted)
+        handoffs: {feature_dir: HANDOFF.md content} already read by the
+            caller; those files are not opened again
+    
     Returns:
         dict: JSON structure with count and active_features list
     """
-    project_root = find_project_root()
+    project_root = project_root or find_project_root()
+    handoffs = handoffs or {}
     backlog_dir = project_root / 'backlog'
     
     if not backlog_dir.exists():
@@ -152,11 +298,22 @@ def discover_features():
             "error": f"backlog/ directory not found in {project_root}"
         }
     
-    features = []
+    # Serve the journal's materialized view when valid; else scan every plan.md
+    active = None
+    if feature_journal is not None and not rescan:
+        active = feature_journal.load_active_view(backlog_dir, project_root)
+    source = "view" if active is not None else "scan"
     
-    # Scan all directories in backlog (excluding _ prefixed files)
-    for item in backlog_dir.iterdir():
-        if item.is_dir() and not item.name.startswith('_'):
+    if active is None:
+        scanned = feature_journal.scan_state(backlog_dir) if feature_journal else None
+        active = []
+        # Scan all feature directories (flat or nested layout, excluding _ prefixed)
+        if feature_resolver is not None:
+            items = feature_resolver.iter_feature_dirs(backlog_dir)
+        else:
+            items = [item for item in backlog_dir.iterdir()
+                     if item.is_dir() and not item.name.startswith('_')]
+        for item in items:
             plan_path = item / 'plan.md'
             
             if plan_path.exists():
@@ -165,53 +322,69 @@ def discover_features():
                 if frontmatter.get('_error'):
                     continue
                 
-                status = frontmatter.get('status', '').lower()
-                
                 # Only include in_progress features
-                if status == 'in_progress':
-                    # Calculate remaining hours if we have estimate and actual
-                    remaining_hours = None
-                    effort_estimate = frontmatter.get('effort_estimate')
-                    effort_actual = frontmatter.get('effort_actual')
-                    
-                    if effort_estimate:
-                        # Parse "Xh" format
-                        est_match = re.search(r'(\d+)', str(effort_estimate))
-                        if est_match:
-                            total = int(est_match.group(1))
-                            if effort_actual:
-                                act_match = re.search(r'(\d+)', str(effort_actual))
-                                if act_match:
-                                    done = int(act_match.group(1))
-                                    remaining_hours = max(0, total - done)
-                            else:
-                                remaining_hours = total
-                    
-                    # Check HANDOFF.md
-                    handoff_check = validate_handoff_status(item)
-                    
-                    feature_data = {
-                        "id": frontmatter.get('id', item.name),
-                        "name": item.name,
-                        "title": frontmatter.get('title', item.name),
-                        "status": status,
-                        "priority": frontmatter.get('priority'),
-                        "effort_estimate": effort_estimate,
-                        "effort_actual": effort_actual,
-                        "remaining_hours": remaining_hours,
-                        "blocked": frontmatter.get('blocked', False),
-                        "started": frontmatter.get('started'),
-                        "component": frontmatter.get('component'),
-                        "plan_path": str(plan_path.relative_to(project_root))
-                    }
-                    
-                    # Add handoff status
-                    if handoff_check.get('status'):
-                        feature_data["status_summary"] = handoff_check['status']
-                    if handoff_check.get('error'):
-                        feature_data["status_warning"] = handoff_check['error']
-                    
-                    features.append(feature_data)
+                status = frontmatter.get('status')
+                if isinstance(status, str) and status.lower() == 'in_progress':
+                    active.append((item.name, plan_path, frontmatter))
+        if feature_journal is not None:
+            feature_journal.rebuild_active_view(backlog_dir, project_root, active, scanned)
+    
+    # Probe every HANDOFF.md not already read by the caller in one concurrent pass
+    probe_dirs = [plan_path.parent for _, plan_path, _ in active
+                  if plan_path.parent not in handoffs]
+    handoff_checks = probe_handoffs(probe_dirs, backlog_dir, project_root)
+    for feature_dir, content in handoffs.items():
+        handoff_checks[feature_dir] = handoff_status_from_lines(content.splitlines()[:10])
+    
+    features = []
+    
+    for name, plan_path, frontmatter in active:
+        item = plan_path.parent
+        status = 'in_progress'
+        
+        # Calculate remaining hours if we have estimate and actual
+        remaining_hours = None
+        effort_estimate = frontmatter.get('effort_estimate')
+        effort_actual = frontmatter.get('effort_actual')
+        
+        if effort_estimate:
+            # Parse "Xh" format
+            est_match = re.search(r'(\d+)', str(effort_estimate))
+            if est_match:
+                total = int(est_match.group(1))
+                if effort_actual:
+                    act_match = re.search(r'(\d+)', str(effort_actual))
+                    if act_match:
+                        done = int(act_match.group(1))
+                        remaining_hours = max(0, total - done)
+                else:
+                    remaining_hours = total
+        
+        # Check HANDOFF.md
+        handoff_check = handoff_checks[item]
+        
+        feature_data = {
+            "id": frontmatter.get('id', name),
+            "name": name,
+            "title": frontmatter.get('title', name),
+            "status": status,
+            "priority": frontmatter.get('priority'),
+            "effort_estimate": effort_estimate,
+            "effort_actual": effort_actual,
+            "remaining_hours": remaining_hours,
+            "blocked": frontmatter.get('blocked', False),
+            "started": frontmatter.get('started'),
+            "component": frontmatter.get('component'),
+            "plan_path": str(plan_path.relative_to(project_root))
+        }
+        
+        # Add handoff status
+        if handoff_check.get('status'):
+            feature_data["status_summary"] = handoff_check['status']
+        if handoff_check.get('error'):
+            feature_data["status_warning"] = handoff_check['error']
+        
+        features.append(feature_data)
     
     # Sort by priority (P0 > P1 > P2 > P3)
     priority_order = {'P0': 0, 'P1': 1, 'P2': 2, 'P3': 3, None: 9}
@@ -219,13 +392,14 @@ def discover_features():
     
     return {
         "count": len(features),
+        "source": source,
         "active_features": features
     }
 
 
 def main():
     """Main entry point."""
-    result = discover_features()
+    result = discover_features(rescan='--rescan' in sys.argv[1:])
     
     # Pretty print JSON
     print(json.dumps(result, indent=2))
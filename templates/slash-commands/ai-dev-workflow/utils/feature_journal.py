@@ -0,0 +1,345 @@
+#!/usr/bin/env python3
+"""
+Feature Journal
+
+Append-only log of status transitions (backlog/.journal.jsonl) plus a small
+materialized view of in-progress features (backlog/.cache/active.json).
+Only set-status writes the journal; readers only ever write the view.
+
+active_features_manager.py records every set-status transition here.
+`list` and feature_discovery.py serve the view instead of reading and
+parsing every plan.md. The view records the mtime/size of every plan.md
+and the mtimes of the few directories a new plan.md can appear in
+(backlog/, type folders, folders that have no plan.md yet), so checking
+it costs one stat per plan. It is served only while the journal exists
+and matches the size the view was built at, and every stamp still
+matches. Otherwise (no set-status yet, a plan edited or created by hand
+or pulled from git) callers fall back to a full rescan and rebuild it.
+
+Usage:
+    python3 .claude/utils/feature_journal.py           # Show the active view
+    python3 .claude/utils/feature_journal.py --tail 20 # Last 20 transitions
+"""
+
+import argparse
+import json
+import os
+import sys
+from contextlib import contextmanager
+from datetime import datetime
+from pathlib import Path
+
+try:
+    import fcntl
+except ImportError:  # Windows: no advisory locks
+    fcntl = None
+
+
+JOURNAL_NAME = '.journal.jsonl'
+CACHE_DIR = '.cache'
+VIEW_NAME = 'active.json'
+VIEW_FORMAT = 3
+
+
+@contextmanager
+def backlog_lock(backlog_dir):
+    """Exclusive advisory lock on the backlog directory (journal + view writes)."""
+    if fcntl is None:
+        yield
+        return
+    fd = os.open(backlog_dir, os.O_RDONLY)
+    try:
+        fcntl.flock(fd, fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            fcntl.flock(fd, fcntl.LOCK_UN)
+    finally:
+        os.close(fd)
+
+
+def journal_size(backlog_dir):
+    """Current journal size in bytes (0 before the first transition)."""
+    try:
+        return (backlog_dir / JOURNAL_NAME).stat().st_size
+    except FileNotFoundError:
+        return 0
+
+
+def plan_stamp(path):
+    """[mtime_ns, size] of a plan.md, or None if it can't be stat'ed."""
+    try:
+        st = os.stat(path)
+    except OSError:
+        return None
+    return [st.st_mtime_ns, st.st_size]
+
+
+def backlog_stamps(backlog_dir):
+    """
+    Stamps of every plan.md (flat backlog/<feature>/ and nested
+    backlog/<type>/<feature>/) and of the directories where a new plan.md
+    can appear: backlog/ itself (new feature or type folders), type folders
+    (new features in them) and folders without a plan.md yet (`mkdir`
+    first, plan.md later).
+
+    Returns:
+        tuple: ({dir relative to backlog/: mtime_ns},
+                {plan.md relative to backlog/: [mtime_ns, size]})
+    """
+    directories = {'.': os.stat(backlog_dir).st_mtime_ns}
+    plans = {}
+    for entry in os.scandir(backlog_dir):
+        if entry.name.startswith(('_', '.')) or not entry.is_dir():
+            continue
+        stamp = plan_stamp(os.path.join(entry.path, 'plan.md'))
+        if stamp is not None:
+            plans[f'{entry.name}/plan.md'] = stamp
+            continue
+        directories[entry.name] = entry.stat().st_mtime_ns
+        for child in os.scandir(entry.path):
+            if child.name.startswith(('_', '.')) or not child.is_dir():
+                continue
+            rel = f'{entry.name}/{child.name}'
+            stamp = plan_stamp(os.path.join(child.path, 'plan.md'))
+            if stamp is not None:
+                plans[f'{rel}/plan.md'] = stamp
+            else:
+                directories[rel] = child.stat().st_mtime_ns
+    return directories, plans
+
+
+def _stamps_unchanged(backlog_dir, directories, plans):
+    for rel, mtime_ns in directories.items():
+        try:
+            if os.stat(backlog_dir / rel).st_mtime_ns != mtime_ns:
+                return False
+        except OSError:
+            return False
+    return all(plan_stamp(backlog_dir / rel) == stamp for rel, stamp in plans.items())
+
+
+def scan_state(backlog_dir):
+    """
+    Take before a full scan and pass to rebuild_active_view(), so a plan
+    changed during the scan fails the next check instead of being cached.
+
+    Returns: (journal size, directory stamps, plan stamps)
+    """
+    return (journal_size(backlog_dir), *backlog_stamps(backlog_dir))
+
+
+def cache_dir(backlog_dir):
+    """backlog/.cache/, created on first write with a .gitignore that ignores all of it."""
+    path = backlog_dir / CACHE_DIR
+    if not path.is_dir():
+        path.mkdir(exist_ok=True)
+        (path / '.gitignore').write_text('*\n', encoding='utf-8')
+    return path
+
+
+def _read_view(backlog_dir):
+    try:
+        with open(backlog_dir / CACHE_DIR / VIEW_NAME, 'r', encoding='utf-8') as f:
+            view = json.load(f)
+    except (OSError, ValueError):
+        return None
+    if not isinstance(view, dict) or view.get('format') != VIEW_FORMAT:
+        return None
+    return view
+
+
+def _write_view(backlog_dir, entries, size, directories, plans):
+    first_write = not (backlog_dir / CACHE_DIR).is_dir()
+    view_path = cache_dir(backlog_dir) / VIEW_NAME
+    if first_write:
+        # Creating backlog/.cache/ changed backlog/'s mtime; don't count that as a new feature
+        directories = dict(directories, **{'.': os.stat(backlog_dir).st_mtime_ns})
+    tmp_path = view_path.with_name(f'{VIEW_NAME}.{os.getpid()}.tmp')
+    view = {
+        "format": VIEW_FORMAT,
+        "journal_size": size,
+        "directories": directories,
+        "plans": plans,
+        "updated": datetime.now().isoformat(timespec='seconds'),
+        "features": entries,
+    }
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump(view, f, indent=2)
+    os.replace(tmp_path, view_path)
+
+
+def _invalidate_view(backlog_dir):
+    try:
+        (backlog_dir / CACHE_DIR / VIEW_NAME).unlink()
+    except FileNotFoundError:
+        pass
+
+
+def view_entry(name, plan_path, frontmatter, project_root):
+    """Build an active-view entry, stamped with plan.md's current mtime and size."""
+    st = plan_path.stat()
+    return {
+        "name": name,
+        "plan_path": str(plan_path.relative_to(project_root)),
+        "mtime_ns": st.st_mtime_ns,
+        "size": st.st_size,
+        "frontmatter": {k: v for k, v in frontmatter.items() if not k.startswith('_')},
+    }
+
+
+def record_transition(backlog_dir, project_root, name, plan_path, previous, frontmatter):
+    """
+    Append a transition to the journal and update the active view.
+
+    Call while still holding the feature's lock, right after plan.md was
+    written, so journal order matches file order.
+
+    Args:
+        backlog_dir: Path to backlog/
+        project_root: Project root (paths are stored relative to it)
+        name: Feature name
+        plan_path: Path to the feature's plan.md
+        previous: Frontmatter before the update
+        frontmatter: Frontmatter after the update
+    """
+    old_status, new_status = (
+        status.lower() or None if isinstance(status, str) else None
+        for status in (previous.get('status'), frontmatter.get('status')))
+    record = {
+        "ts": datetime.now().isoformat(timespec='seconds'),
+        "feature": name,
+        "path": str(plan_path.relative_to(project_root)),
+        "from": old_status,
+        "to": new_status,
+    }
+
+    with backlog_lock(backlog_dir):
+        size_before = journal_size(backlog_dir)
+        view = _read_view(backlog_dir)
+
+        with open(backlog_dir / JOURNAL_NAME, 'a', encoding='utf-8') as f:
+            f.write(json.dumps(record) + '\n')
+        size_after = journal_size(backlog_dir)
+
+        # Only extend a view that was in sync with the journal before this append;
+        # otherwise drop it and let the next reader rebuild from a full scan.
+        if view is None or view.get('journal_size') != size_before:
+            _invalidate_view(backlog_dir)
+            return
+
+        entries = [e for e in view.get('features', []) if e.get('name') != name]
+        if new_status == 'in_progress':
+            entries.append(view_entry(name, plan_path, frontmatter, project_root))
+        plans = view.get('plans', {})
+        plans[plan_path.relative_to(backlog_dir).as_posix()] = plan_stamp(plan_path)
+        _write_view(backlog_dir, entries, size_after, view.get('directories', {}), plans)
+
+
+def load_active_view(backlog_dir, project_root):
+    """
+    Return the in-progress features from the materialized view.
+
+    Valid only while the journal exists at the size the view was built at
+    and every stamp from backlog_stamps() still matches, so plans edited by
+    hand or by `git pull` are picked up by a rescan.
+
+    Returns:
+        list: [(name, plan_path, frontmatter)], or None if a rescan is needed
+    """
+    if not (backlog_dir / JOURNAL_NAME).exists():
+        return None
+    size = journal_size(backlog_dir)
+    view = _read_view(backlog_dir)
+    if view is None or view.get('journal_size') != size:
+        return None
+    if not _stamps_unchanged(backlog_dir, view.get('directories', {}), view.get('plans', {})):
+        return None
+
+    features = []
+    for entry in view.get('features', []):
+        plan_path = project_root / entry['plan_path']
+        try:
+            st = plan_path.stat()
+        except OSError:
+            return None
+        if st.st_mtime_ns != entry.get('mtime_ns') or st.st_size != entry.get('size'):
+            return None
+        features.append((entry['name'], plan_path, entry.get('frontmatter', {})))
+    return features
+
+
+def rebuild_active_view(backlog_dir, project_root, features, scanned):
+    """
+    Materialize the view from a full scan.
+
+    Args:
+        features: [(name, plan_path, frontmatter)] of in-progress features
+        scanned: scan_state() taken before the scan started; if the journal
+            grew meanwhile the scan may be stale and is not saved. Plans and
+            directories that changed meanwhile just fail the next check.
+
+    Without a journal (no set-status yet) no view is written, since
+    load_active_view() wouldn't serve it.
+    """
+    scanned_journal_size, directories, plans = scanned
+    try:
+        with backlog_lock(backlog_dir):
+            if not (backlog_dir / JOURNAL_NAME).exists():
+                return
+            size = journal_size(backlog_dir)
+            if size != scanned_journal_size:
+                return
+            entries = [view_entry(name, plan_path, frontmatter, project_root)
+                       for name, plan_path, frontmatter in features]
+            _write_view(backlog_dir, entries, size, directories, plans)
+    except OSError:
+        pass  # Read-only checkout: serve the scan without caching it
+
+
+def read_journal(backlog_dir, tail=None):
+    """Read journal records (optionally only the last `tail`)."""
+    try:
+        with open(backlog_dir / JOURNAL_NAME, 'r', encoding='utf-8') as f:
+            lines = f.readlines()
+    except FileNotFoundError:
+        return []
+    if tail:
+        lines = lines[-tail:]
+    records = []
+    for line in lines:
+        try:
+            records.append(json.loads(line))
+        except ValueError:
+            continue
+    return records
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Show the feature status journal and active view')
+    parser.add_argument('--tail', type=int, metavar='N', help='Show the last N transitions')
+    args = parser.parse_args()
+
+    current = Path.cwd()
+    project_root = current
+    for candidate in [current, *current.parents]:
+        if (candidate / 'backlog').exists():
+            project_root = candidate
+            break
+    backlog_dir = project_root / 'backlog'
+
+    if args.tail:
+        result = {"transitions": read_journal(backlog_dir, args.tail)}
+    else:
+        active = load_active_view(backlog_dir, project_root)
+        result = {
+            "view_valid": active is not None,
+            "active": [name for name, _, _ in active or []],
+        }
+
+    print(json.dumps(result, indent=2))
+    sys.exit(0)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,249 @@
+#!/usr/bin/env python3
+"""
+Feature Resolver
+
+Maps a feature id to its directory for both backlog layouts:
+- flat:   backlog/<name>/plan.md          (ai-dev-workflow)
+- nested: backlog/<type>/<name>/plan.md   (folder-based backlog)
+
+A plan's frontmatter `id` is also accepted when it differs from the folder
+name. The map is cached in backlog/.cache/feature_map.json, so a lookup is one
+dict access plus a stat of the hit. The backlog is only walked again when
+a name is missing from the cache or a cached entry went stale.
+
+Usage:
+    python3 .claude/utils/feature_resolver.py <feature-id>
+    python3 .claude/utils/feature_resolver.py --list
+    python3 .claude/utils/feature_resolver.py --rebuild
+"""
+
+import json
+import os
+import sys
+from pathlib import Path
+
+
+CACHE_DIR = '.cache'
+MAP_NAME = 'feature_map.json'
+MAP_FORMAT = 1
+
+# Files that mark a directory as a feature (vs. a type/grouping directory)
+FEATURE_MARKERS = ('plan.md', 'README.md', 'HANDOFF.md')
+
+
+def find_project_root():
+    """Find the project root directory (where backlog/ or .claude/ exists)."""
+    current = Path.cwd()
+
+    # Try current directory first
+    if (current / 'backlog').exists() or (current / '.claude').exists():
+        return current
+
+    # Walk up to find backlog or .claude directory
+    for parent in current.parents:
+        if (parent / 'backlog').exists() or (parent / '.claude').exists():
+            return parent
+
+    # Fallback: assume we're in project root
+    return current
+
+
+def _is_feature_dir(path):
+    return any((path / marker).exists() for marker in FEATURE_MARKERS)
+
+
+def iter_feature_dirs(backlog_dir):
+    """
+    Yield every feature directory in either layout.
+
+    Top-level directories holding a plan/README/HANDOFF are features (flat
+    layout); other top-level directories are treated as type folders and
+    their children are checked instead (nested layout). Names starting with
+    '_' or '.' are skipped at both levels.
+    """
+    for entry in sorted(os.scandir(backlog_dir), key=lambda e: e.name):
+        if entry.name.startswith(('_', '.')) or not entry.is_dir():
+            continue
+        path = Path(entry.path)
+        if _is_feature_dir(path):
+            yield path
+            continue
+        for child in sorted(os.scandir(path), key=lambda e: e.name):
+            if child.name.startswith(('_', '.')) or not child.is_dir():
+                continue
+            child_path = Path(child.path)
+            if _is_feature_dir(child_path):
+                yield child_path
+
+
+def read_frontmatter_id(plan_path):
+    """Read just the `id:` field from a plan's frontmatter (stops at the closing ---)."""
+    try:
+        with open(plan_path, 'r', encoding='utf-8') as f:
+            if f.readline().strip() != '---':
+                return None
+            for line in f:
+                if line.strip() == '---':
+                    return None
+                if line.startswith('id:'):
+                    value = line[3:].split('#', 1)[0].strip().strip('"\'')
+                    return value or None
+    except (OSError, UnicodeDecodeError):
+        return None
+    return None
+
+
+def build_feature_map(project_root):
+    """
+    Walk the backlog once and map feature ids to directories.
+
+    Folder names win over frontmatter ids when both claim the same key.
+
+    Returns:
+        dict: {id: {"dir": relative dir, "mtime_ns": plan mtime or None, "via": "dir"|"id"}}
+    """
+    backlog_dir = project_root / 'backlog'
+    by_dir = {}
+    by_id = {}
+
+    for feature_dir in iter_feature_dirs(backlog_dir):
+        rel = str(feature_dir.relative_to(project_root))
+        plan_path = feature_dir / 'plan.md'
+        mtime_ns = None
+        fm_id = None
+        if plan_path.exists():
+            mtime_ns = plan_path.stat().st_mtime_ns
+            fm_id = read_frontmatter_id(plan_path)
+
+        by_dir.setdefault(feature_dir.name, {"dir": rel, "mtime_ns": mtime_ns, "via": "dir"})
+        if fm_id and fm_id != feature_dir.name:
+            by_id.setdefault(fm_id, {"dir": rel, "mtime_ns": mtime_ns, "via": "id"})
+
+    for key, entry in by_id.items():
+        by_dir.setdefault(key, entry)
+    return by_dir
+
+
+def cache_dir(backlog_dir):
+    """backlog/.cache/, created on first write with a .gitignore that ignores all of it."""
+    path = backlog_dir / CACHE_DIR
+    if not path.is_dir():
+        path.mkdir(exist_ok=True)
+        (path / '.gitignore').write_text('*\n', encoding='utf-8')
+    return path
+
+
+def _load_map(backlog_dir):
+    try:
+        with open(backlog_dir / CACHE_DIR / MAP_NAME, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+    except (OSError, ValueError):
+        return None
+    if not isinstance(data, dict) or data.get('format') != MAP_FORMAT:
+        return None
+    return data.get('features')
+
+
+def _save_map(backlog_dir, features):
+    try:
+        map_path = cache_dir(backlog_dir) / MAP_NAME
+        tmp_path = map_path.with_name(f'{MAP_NAME}.{os.getpid()}.tmp')
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump({"format": MAP_FORMAT, "features": features}, f, indent=2)
+        os.replace(tmp_path, map_path)
+    except OSError:
+        pass  # Read-only checkout: resolve from the in-memory map only
+
+
+_memo = {}
+
+
+def load_feature_map(project_root, rebuild=False):
+    """Return the cached id -> directory map, building it if missing."""
+    backlog_dir = project_root / 'backlog'
+    key = str(project_root)
+    if not rebuild and key in _memo:
+        return _memo[key]
+
+    features = None if rebuild else _load_map(backlog_dir)
+    if features is None:
+        features = build_feature_map(project_root)
+        _save_map(backlog_dir, features)
+    _memo[key] = features
+    return features
+
+
+def _entry_valid(project_root, entry):
+    feature_dir = project_root / entry['dir']
+    if not feature_dir.is_dir():
+        return False
+    if entry.get('via') == 'id':
+        # An id override is only trusted while plan.md is unchanged
+        try:
+            return (feature_dir / 'plan.md').stat().st_mtime_ns == entry.get('mtime_ns')
+        except OSError:
+            return False
+    return True
+
+
+def resolve_feature_dir(feature_id, project_root=None):
+    """
+    Resolve a feature id (folder name or frontmatter id) to its directory.
+
+    Args:
+        feature_id: Feature folder name or frontmatter id
+        project_root: Project root (found from cwd if omitted)
+
+    Returns:
+        Path or None: Feature directory, or None if no such feature
+    """
+    project_root = project_root or find_project_root()
+    if not (project_root / 'backlog').is_dir():
+        return None
+
+    features = load_feature_map(project_root)
+    entry = features.get(feature_id)
+    if entry and _entry_valid(project_root, entry):
+        return project_root / entry['dir']
+
+    # Miss or stale entry: walk once, then answer from the fresh map
+    features = load_feature_map(project_root, rebuild=True)
+    entry = features.get(feature_id)
+    if entry:
+        return project_root / entry['dir']
+    return None
+
+
+def main():
+    """Main entry point."""
+    if len(sys.argv) < 2:
+        print(json.dumps({
+            "error": "Usage: feature_resolver.py <feature-id> | --list | --rebuild",
+            "example": "python3 feature_resolver.py session-based-auth"
+        }, indent=2), file=sys.stderr)
+        sys.exit(1)
+
+    project_root = find_project_root()
+    arg = sys.argv[1]
+
+    if arg in ('--list', '--rebuild'):
+        features = load_feature_map(project_root, rebuild=arg == '--rebuild')
+        print(json.dumps({"count": len(features), "features": features}, indent=2))
+        sys.exit(0)
+
+    feature_dir = resolve_feature_dir(arg, project_root)
+    if feature_dir is None:
+        print(json.dumps({"feature": arg, "error": f"Feature not found: {arg}"}, indent=2))
+        sys.exit(1)
+
+    plan_path = feature_dir / 'plan.md'
+    print(json.dumps({
+        "feature": arg,
+        "dir": str(feature_dir.relative_to(project_root)),
+        "plan_path": str(plan_path.relative_to(project_root)) if plan_path.exists() else None
+    }, indent=2))
+    sys.exit(0)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,299 @@
+#!/usr/bin/env python3
+"""
+Handoff Compaction Utility
+
+Keeps HANDOFF.md small: once it passes a size threshold, older dated session
+sections (e.g. "## Session 2026-01-05") are moved to HANDOFF.archive.md next
+to it. The lead (title and **Status**: line), undated sections (Quick Resume,
+Next Steps, Blockers...) and the latest sessions stay in place, and a short
+"## Archived Sessions" index records what moved.
+
+The archive is never loaded by handoff_loader.py; search it on demand with
+--search.
+
+Usage:
+    python3 .claude/utils/handoff_compact.py <feature-name>
+    python3 .claude/utils/handoff_compact.py <feature-name> --dry-run
+    python3 .claude/utils/handoff_compact.py <feature-name> --force --keep 1
+    python3 .claude/utils/handoff_compact.py <feature-name> --search "token refresh"
+
+Output:
+    JSON with what was archived and the size before/after
+"""
+
+import argparse
+import json
+import os
+import re
+import sys
+from contextlib import contextmanager
+from pathlib import Path
+
+import markdown_sections
+
+try:
+    import fcntl
+except ImportError:  # Windows: no advisory locks
+    fcntl = None
+
+try:
+    import feature_resolver
+except ImportError:  # feature_resolver.py not copied: flat backlog/<name>/ layout only
+    feature_resolver = None
+
+
+ARCHIVE_NAME = 'HANDOFF.archive.md'
+INDEX_TITLE = 'Archived Sessions'
+THRESHOLD_BYTES = 32 * 1024  # ~8k tokens
+KEEP_SESSIONS = 2
+
+
+def find_project_root():
+    """Find the project root directory (where backlog/ or .claude/ exists)."""
+    current = Path.cwd()
+
+    # Try current directory first
+    if (current / 'backlog').exists() or (current / '.claude').exists():
+        return current
+
+    # Walk up to find backlog or .claude directory
+    for parent in current.parents:
+        if (parent / 'backlog').exists() or (parent / '.claude').exists():
+            return parent
+
+    # Fallback: assume we're in project root
+    return current
+
+
+def resolve_feature_dir(project_root, feature_name):
+    """Feature directory by folder name or frontmatter id, in flat or nested layout."""
+    if feature_resolver is not None:
+        feature_dir = feature_resolver.resolve_feature_dir(feature_name, project_root)
+        if feature_dir is not None:
+            return feature_dir
+    return project_root / 'backlog' / feature_name
+
+
+@contextmanager
+def handoff_lock(feature_dir):
+    """Exclusive advisory lock on the feature directory while HANDOFF.md is rewritten."""
+    if fcntl is None:
+        yield
+        return
+    fd = os.open(feature_dir, os.O_RDONLY)
+    try:
+        fcntl.flock(fd, fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            fcntl.flock(fd, fcntl.LOCK_UN)
+    finally:
+        os.close(fd)
+
+
+def session_date(section):
+    """ISO date in the section's own heading, or None."""
+    match = markdown_sections.DATE_PATTERN.search(section.title)
+    return match.group(0) if match else None
+
+
+def plan_compaction(sections, keep=KEEP_SESSIONS):
+    """
+    Pick the dated session chunks to archive.
+
+    A session is a section whose own heading holds a YYYY-MM-DD date and has
+    no dated ancestor, together with its subsections. Works whether sessions
+    are top-level ("## Session 2026-01-05") or grouped ("## Log" >
+    "### 2026-01-05").
+
+    Returns:
+        list: [(date, [sections])] to archive, oldest first
+    """
+    sessions = []
+    position = 0
+    while position < len(sections):
+        section = sections[position]
+        day = None if section.lead else session_date(section)
+        if day is None:
+            position += 1
+            continue
+        chunk = markdown_sections.subtree(sections, position)
+        sessions.append((day, position, chunk))
+        position += len(chunk)
+
+    if len(sessions) <= keep:
+        return []
+    newest = sorted(sessions, key=lambda s: (s[0], s[1]), reverse=True)[:keep]
+    kept = set(id(s[2][0]) for s in newest)
+    return [(day, chunk) for day, _, chunk in sessions if id(chunk[0]) not in kept]
+
+
+def index_lines(archived):
+    """Index bullet lines for newly archived sessions."""
+    lines = []
+    for day, chunk in archived:
+        count = sum(len(s.lines) for s in chunk)
+        lines.append(f"- {chunk[0].title} ({count} lines) → {ARCHIVE_NAME}\n")
+    return lines
+
+
+def compacted_text(sections, archived):
+    """
+    HANDOFF.md text with archived chunks removed and the index updated.
+
+    The index goes where the first archived session was, or is extended in
+    place when an earlier compaction already created it.
+    """
+    moved = set(id(s) for _, chunk in archived for s in chunk)
+    new_lines = index_lines(archived)
+    has_index = any(s.title == INDEX_TITLE for s in sections)
+
+    out = []
+    index_written = False
+    for section in sections:
+        if section.title == INDEX_TITLE and not section.lead:
+            body = section.text().rstrip('\n') + '\n'
+            out.append(body + ''.join(new_lines) + '\n')
+            index_written = True
+        elif id(section) in moved:
+            if not has_index and not index_written:
+                level = '#' * max(section.level, 2)
+                out.append(f"{level} {INDEX_TITLE}\n\n" + ''.join(new_lines) + '\n')
+                index_written = True
+        else:
+            out.append(section.text())
+    return ''.join(out)
+
+
+def append_archive(archive_path, feature_name, archived):
+    """Append archived chunks to HANDOFF.archive.md (created with a title if new)."""
+    new_file = not archive_path.exists()
+    with open(archive_path, 'a', encoding='utf-8') as f:
+        if new_file:
+            f.write(f"# Handoff Archive: {feature_name}\n\n"
+                    f"Older sessions moved out of HANDOFF.md. Not loaded by default.\n\n")
+        for _, chunk in archived:
+            text = markdown_sections.render(chunk).rstrip('\n')
+            f.write(text + '\n\n')
+        f.flush()
+        os.fsync(f.fileno())
+
+
+def compact_handoff(feature_name, threshold=THRESHOLD_BYTES, keep=KEEP_SESSIONS,
+                    force=False, dry_run=False, project_root=None):
+    """
+    Archive older dated sessions of a feature's HANDOFF.md.
+
+    Args:
+        feature_name: Feature name or id
+        threshold: Only compact files larger than this many bytes
+        keep: Number of latest dated sessions to keep in HANDOFF.md
+        force: Compact regardless of size
+        dry_run: Report what would move without writing
+
+    Returns:
+        dict: {"feature_name", "compacted", "archived", "bytes_before", "bytes_after", ...}
+    """
+    project_root = project_root or find_project_root()
+    feature_dir = resolve_feature_dir(project_root, feature_name)
+    handoff_path = feature_dir / 'HANDOFF.md'
+    archive_path = feature_dir / ARCHIVE_NAME
+
+    result = {
+        "feature_name": feature_name,
+        "compacted": False,
+        "archived": [],
+        "archive_path": str(archive_path.relative_to(project_root))
+    }
+    if not handoff_path.exists():
+        result['error'] = f"HANDOFF.md not found in {feature_dir}"
+        return result
+
+    with handoff_lock(feature_dir):
+        size = handoff_path.stat().st_size
+        result['bytes_before'] = size
+        result['bytes_after'] = size
+        if size <= threshold and not force:
+            result['reason'] = f"HANDOFF.md is {size} bytes (threshold {threshold})"
+            return result
+
+        with open(handoff_path, 'r', encoding='utf-8') as f:
+            sections = markdown_sections.parse_sections(f)
+        archived = plan_compaction(sections, keep)
+        if not archived:
+            result['reason'] = f"No more than {keep} dated sessions to keep"
+            return result
+
+        text = compacted_text(sections, archived)
+        result['archived'] = [chunk[0].title for _, chunk in archived]
+        result['bytes_after'] = len(text.encode('utf-8'))
+        if dry_run:
+            result['dry_run'] = True
+            return result
+
+        # Archive first: a crash in between duplicates sessions, never loses them
+        append_archive(archive_path, feature_name, archived)
+        tmp_path = handoff_path.with_name(f'.HANDOFF.md.{os.getpid()}.tmp')
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            f.write(text)
+        os.replace(tmp_path, handoff_path)
+        result['compacted'] = True
+    return result
+
+
+def search_archive(feature_name, pattern, project_root=None):
+    """
+    Search HANDOFF.archive.md without loading it into context.
+
+    Returns:
+        dict: {"matches": [{"section", "line", "text"}]} for each matching line
+    """
+    project_root = project_root or find_project_root()
+    archive_path = resolve_feature_dir(project_root, feature_name) / ARCHIVE_NAME
+    result = {"feature_name": feature_name, "pattern": pattern, "matches": []}
+    if not archive_path.exists():
+        result['error'] = f"No {ARCHIVE_NAME} for {feature_name}"
+        return result
+
+    regex = re.compile(pattern, re.IGNORECASE)
+    with open(archive_path, 'r', encoding='utf-8') as f:
+        sections = markdown_sections.parse_sections(f)
+    for section in sections:
+        for offset, line in enumerate(section.lines):
+            if regex.search(line):
+                result['matches'].append({
+                    "section": section.label,
+                    "line": section.start_line + offset,
+                    "text": line.rstrip('\n')
+                })
+    return result
+
+
+def main():
+    """Main entry point."""
+    parser = argparse.ArgumentParser(description='Archive older HANDOFF.md sessions')
+    parser.add_argument('feature', help='Feature name or id')
+    parser.add_argument('--threshold', type=int, default=THRESHOLD_BYTES,
+                        help=f'Only compact above this size in bytes (default {THRESHOLD_BYTES})')
+    parser.add_argument('--keep', type=int, default=KEEP_SESSIONS,
+                        help=f'Latest dated sessions to keep (default {KEEP_SESSIONS})')
+    parser.add_argument('--force', action='store_true', help='Compact regardless of size')
+    parser.add_argument('--dry-run', action='store_true', help='Report without writing')
+    parser.add_argument('--search', metavar='REGEX', help='Search the archive instead')
+    args = parser.parse_args()
+
+    try:
+        if args.search:
+            result = search_archive(args.feature, args.search)
+        else:
+            result = compact_handoff(args.feature, args.threshold, max(args.keep, 0),
+                                     args.force, args.dry_run)
+    except (OSError, UnicodeDecodeError, re.error) as e:
+        result = {"feature_name": args.feature, "error": str(e)}
+
+    print(json.dumps(result, indent=2))
+    sys.exit(1 if 'error' in result else 0)
+
+
+if __name__ == '__main__':
+    main()
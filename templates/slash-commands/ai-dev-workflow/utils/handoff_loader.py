@@ -5,18 +5,75 @@ Handoff Loader Utility
 Loads ONLY the selected feature's context (HANDOFF.md and plan.md).
 Validates HANDOFF.md status line format. Prevents loading all features.
 
+With --max-tokens and/or --sections, only the highest-ranked sections that
+fit are returned (see markdown_sections.py), with bytes/lines/tokens
+accounting for what was kept and dropped.
+
+Every response carries a `content_hash`. A full load with --record keeps a
+snapshot of it; with --since <hash> (or --since last, the last recorded
+load of this feature) the loader then answers `unchanged: true`, or a
+section-level diff against that snapshot, and records the new state.
+Snapshots (section hashes only) live in backlog/.cache/handoff_served.json;
+plain loads don't write anything.
+
+Several features (or --all-active) are read concurrently and returned in
+one document; --max-tokens is then one global budget split by priority.
+
 Usage:
     python3 .claude/utils/handoff_loader.py <feature-name>
+    python3 .claude/utils/handoff_loader.py <feature-name> --max-tokens 4000
+    python3 .claude/utils/handoff_loader.py <feature-name> --sections "Goal,Next Steps,Blockers"
+    python3 .claude/utils/handoff_loader.py <feature-name> --record
+    python3 .claude/utils/handoff_loader.py <feature-name> --since last
+    python3 .claude/utils/handoff_loader.py feat-a feat-b --max-tokens 12000
+    python3 .claude/utils/handoff_loader.py --all-active --max-tokens 12000
+    python3 .claude/utils/handoff_loader.py <feature-name> --compact   # Archive old sessions first
 
 Output:
     JSON with feature context and metadata
 """
 
+import argparse
+import hashlib
 import json
+import os
 import re
 import sys
+from concurrent.futures import ThreadPoolExecutor
+from itertools import chain, islice
 from pathlib import Path
 
+try:
+    import feature_resolver
+except ImportError:  # feature_resolver.py not copied: flat backlog/<name>/ layout only
+    feature_resolver = None
+
+try:
+    import markdown_sections
+except ImportError:  # markdown_sections.py not copied: --max-tokens/--sections unavailable
+    markdown_sections = None
+
+try:
+    import feature_discovery
+except ImportError:  # feature_discovery.py not copied: --all-active unavailable
+    feature_discovery = None
+
+try:
+    import handoff_compact
+except ImportError:  # handoff_compact.py not copied: --compact unavailable
+    handoff_compact = None
+
+
+CACHE_DIR = '.cache'
+SERVED_CACHE_NAME = 'handoff_served.json'
+SERVED_CACHE_FORMAT = 1
+SNAPSHOTS_PER_FEATURE = 4
+
+# Batch loads: reader threads, and budget share per priority (P0 gets 4x P3)
+BATCH_WORKERS = 8
+PRIORITY_WEIGHTS = {'P0': 4, 'P1': 3, 'P2': 2, 'P3': 1}
+DEFAULT_WEIGHT = 1
+
 
 def find_project_root():
     """Find the project root directory (where backlog/ or .claude/ exists)."""
@@ -35,6 +92,34 @@ def find_project_root():
     return current
 
 
+def resolve_feature_dir(project_root, feature_name):
+    """Feature directory by folder name or frontmatter id, in flat or nested layout."""
+    if feature_resolver is not None:
+        feature_dir = feature_resolver.resolve_feature_dir(feature_name, project_root)
+        if feature_dir is not None:
+            return feature_dir
+    return project_root / 'backlog' / feature_name
+
+
+def unique_features(project_root, feature_names):
+    """
+    Resolve names to feature directories, keeping the first name for each
+    directory, so a feature named by its id and by its folder loads once.
+
+    Returns:
+        dict: {name: feature_dir} in the order given
+    """
+    dirs = {}
+    seen = set()
+    for name in feature_names:
+        feature_dir = resolve_feature_dir(project_root, name)
+        key = os.path.realpath(feature_dir)
+        if key not in seen:
+            seen.add(key)
+            dirs[name] = feature_dir
+    return dirs
+
+
 def validate_handoff_status(handoff_content):
     """
     Validate HANDOFF.md has proper Status line in first 10 lines.
@@ -70,18 +155,256 @@ def validate_handoff_status(handoff_content):
     }
 
 
-def load_feature_context(feature_name):
+def read_feature_files(feature_dir):
+    """
+    Read a feature's HANDOFF.md and plan.md (or README.md), each exactly once.
+
+    Args:
+        feature_dir: Path to the feature directory
+
+    Returns:
+        dict: {"handoff": (path, content) | None, "plan": (path, content) | None,
+               "errors": [str]}
+    """
+    files = {"handoff": None, "plan": None, "errors": []}
+
+    handoff_path = feature_dir / 'HANDOFF.md'
+    if handoff_path.exists():
+        try:
+            files['handoff'] = (handoff_path, handoff_path.read_text(encoding='utf-8'))
+        except Exception as e:
+            files['errors'].append(f"Failed to read HANDOFF.md: {str(e)}")
+
+    # Prefer plan.md, fall back to README.md
+    for plan_path in (feature_dir / 'plan.md', feature_dir / 'README.md'):
+        if plan_path.exists():
+            try:
+                files['plan'] = (plan_path, plan_path.read_text(encoding='utf-8'))
+            except Exception as e:
+                files['errors'].append(f"Failed to read {plan_path.name}: {str(e)}")
+            break
+
+    return files
+
+
+def content_hash(texts):
+    """
+    Short hash identifying the exact context served.
+
+    Args:
+        texts: [(file name, content)] in load order (HANDOFF.md, then plan)
+    """
+    digest = hashlib.sha256()
+    for name, text in texts:
+        digest.update(name.encode('utf-8') + b'\0' + text.encode('utf-8') + b'\0')
+    return digest.hexdigest()[:16]
+
+
+def file_texts(files):
+    """[(file name, content)] from a read_feature_files() result."""
+    return [(files[key][0].name, files[key][1]) for key in ('handoff', 'plan') if files[key]]
+
+
+def section_digests(sections):
+    """
+    {section key: sha} for one file's sections.
+
+    Keys are section labels; repeated titles get a #2, #3... suffix.
+    """
+    digests = {}
+    for section in sections:
+        key = ' > '.join(section.path) or section.title or '(preamble)'
+        base, n = key, 1
+        while key in digests:
+            n += 1
+            key = f"{base} #{n}"
+        digests[key] = (hashlib.sha256(section.text().encode('utf-8')).hexdigest()[:16], section)
+    return digests
+
+
+def cache_dir(backlog_dir):
+    """backlog/.cache/, created on first write with a .gitignore that ignores all of it."""
+    path = backlog_dir / CACHE_DIR
+    if not path.is_dir():
+        path.mkdir(exist_ok=True)
+        (path / '.gitignore').write_text('*\n', encoding='utf-8')
+    return path
+
+
+def load_served_cache(backlog_dir):
+    """Read the served-snapshot cache ({feature dir: {"last": hash, "snapshots": {...}}})."""
+    try:
+        with open(backlog_dir / CACHE_DIR / SERVED_CACHE_NAME, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+    except (OSError, ValueError):
+        return {}
+    if not isinstance(data, dict) or data.get('format') != SERVED_CACHE_FORMAT:
+        return {}
+    return data.get('features', {})
+
+
+def record_served(project_root, feature_dir, texts, digest):
+    """
+    Remember that the full context with hash `digest` was served.
+
+    Stores section hashes (not content) so a later --since can diff against
+    it. Keeps the last few snapshots per feature; best effort, atomic write.
+    """
+    backlog_dir = project_root / 'backlog'
+    if not backlog_dir.is_dir():
+        return
+    cache = load_served_cache(backlog_dir)
+    key = str(feature_dir.relative_to(project_root))
+    entry = cache.get(key, {"last": None, "snapshots": {}})
+    if entry.get('last') == digest and digest in entry.get('snapshots', {}):
+        return
+
+    snapshot = None
+    if markdown_sections is not None:
+        snapshot = {}
+        for name, text in texts:
+            sections = markdown_sections.parse_sections(text.splitlines(keepends=True))
+            snapshot[name] = {k: sha for k, (sha, _) in section_digests(sections).items()}
+
+    snapshots = entry.get('snapshots', {})
+    snapshots.pop(digest, None)
+    snapshots[digest] = snapshot
+    while len(snapshots) > SNAPSHOTS_PER_FEATURE:
+        snapshots.pop(next(iter(snapshots)))
+    cache[key] = {"last": digest, "snapshots": snapshots}
+
+    try:
+        cache_path = cache_dir(backlog_dir) / SERVED_CACHE_NAME
+        tmp_path = cache_path.with_name(f'{SERVED_CACHE_NAME}.{os.getpid()}.tmp')
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump({"format": SERVED_CACHE_FORMAT, "features": cache}, f)
+        os.replace(tmp_path, cache_path)
+    except OSError:
+        pass  # Read-only checkout: --since only matches the current hash
+
+
+def read_feature_sections(feature_dir, files=None):
+    """
+    Parse a feature's HANDOFF.md and plan.md (or README.md) into sections.
+
+    Files are streamed line by line; content already read by the caller
+    (read_feature_files() result) is split instead of reading it again.
+
+    Returns:
+        dict: {"handoff": (path, sections) | None, "plan": (path, sections) | None,
+               "errors": [str]}
+    """
+    if files is not None:
+        parsed = {"handoff": None, "plan": None, "errors": list(files['errors'])}
+        for key, source in (('handoff', 'HANDOFF.md'), ('plan', None)):
+            if files[key]:
+                path, content = files[key]
+                parsed[key] = (path, markdown_sections.parse_sections(
+                    content.splitlines(keepends=True), source or path.name))
+        return parsed
+
+    parsed = {"handoff": None, "plan": None, "errors": []}
+    candidates = (('handoff', [feature_dir / 'HANDOFF.md']),
+                  ('plan', [feature_dir / 'plan.md', feature_dir / 'README.md']))
+    for key, paths in candidates:
+        for path in paths:
+            if not path.exists():
+                continue
+            try:
+                with open(path, 'r', encoding='utf-8') as f:
+                    parsed[key] = (path, markdown_sections.parse_sections(f, path.name))
+            except Exception as e:
+                parsed['errors'].append(f"Failed to read {path.name}: {str(e)}")
+            break
+    return parsed
+
+
+def load_budgeted_context(result, feature_dir, project_root, files=None,
+                          max_tokens=None, section_names=None, parsed=None):
+    """
+    Fill `result` with only the sections that fit the token budget.
+
+    HANDOFF.md and plan.md share one budget: sections from both are ranked
+    together (lead/status first, then Next Steps/Blockers/Goal, newest
+    sessions before older ones) and the first section that doesn't fit is
+    truncated at a line boundary.
+
+    Args:
+        parsed: Result of read_feature_sections() to reuse (batch loads)
+
+    Returns:
+        dict: result with content, files_loaded, lines_loaded and "budget"
+    """
+    if markdown_sections is None:
+        result['error'] = "--max-tokens/--sections need markdown_sections.py next to handoff_loader.py"
+        return result
+
+    if parsed is None:
+        parsed = read_feature_sections(feature_dir, files)
+    every_section = []
+    for key in ('handoff', 'plan'):
+        if parsed[key]:
+            path, sections = parsed[key]
+            result['files_loaded'].append(str(path.relative_to(project_root)))
+            every_section.extend(sections)
+
+    if parsed['handoff']:
+        # Status line is checked on the full file, before any trimming
+        head = islice(chain.from_iterable(s.lines for s in parsed['handoff'][1]), 10)
+        status_check = validate_handoff_status(''.join(head))
+        result['status_valid'] = status_check['valid']
+        if not status_check['valid']:
+            result['status_warning'] = status_check['error']
+
+    kept, dropped, truncated = markdown_sections.select_sections(
+        every_section, max_tokens, section_names)
+
+    # Hash of the full files; not recorded as served since only part was sent
+    result['content_hash'] = content_hash(
+        [(parsed[key][0].name, markdown_sections.render(parsed[key][1]))
+         for key in ('handoff', 'plan') if parsed[key]])
+
+    for key in ('handoff', 'plan'):
+        if parsed[key]:
+            source = parsed[key][1][0].source if parsed[key][1] else None
+            text = markdown_sections.render([s for s in kept if s.source == source])
+            result[f'{key}_content'] = text or None
+
+    result['lines_loaded'] = sum(len(s.lines) for s in kept)
+    result['budget'] = {
+        "max_tokens": max_tokens,
+        "sections": section_names,
+        "kept": markdown_sections.account(kept),
+        "dropped": markdown_sections.account(dropped, labels=True),
+        "truncated": truncated.label if truncated else None
+    }
+
+    if parsed['errors']:
+        result['error'] = '; '.join(parsed['errors'])
+    if not parsed['handoff'] and not parsed['plan']:
+        result['error'] = f"No HANDOFF.md or plan.md/README.md found in {feature_dir}"
+    return result
+
+
+def load_feature_context(feature_name, project_root=None, files=None,
+                         max_tokens=None, section_names=None, parsed=None, record=False):
     """
     Load ONLY the selected feature's context files.
     
     Args:
         feature_name: Name of the feature (e.g., "session-based-auth")
+        project_root: Project root (found from cwd if omitted)
+        files: Result of read_feature_files() to reuse instead of reading again
+        max_tokens: Estimated token budget for both files together (None = no limit)
+        section_names: Section titles to keep, e.g. ["Goal", "Next Steps"] (None = all)
+        parsed: Result of read_feature_sections() to reuse (budgeted loads only)
+        record: Keep a snapshot of a full load as a baseline for --since
         
     Returns:
         dict: JSON structure with feature context
     """
-    project_root = find_project_root()
-    feature_dir = project_root / 'backlog' / feature_name
+    project_root = project_root or find_project_root()
+    feature_dir = resolve_feature_dir(project_root, feature_name)
     
     if not feature_dir.exists():
         return {
@@ -103,76 +426,350 @@ def load_feature_context(feature_name):
         "status_warning": None
     }
 
-    # Load HANDOFF.md if exists
-    handoff_path = feature_dir / 'HANDOFF.md'
-    if handoff_path.exists():
-        try:
-            content = handoff_path.read_text(encoding='utf-8')
-            result['handoff_content'] = content
-            result['files_loaded'].append(str(handoff_path.relative_to(project_root)))
-            result['lines_loaded'] += len(content.splitlines())
+    if max_tokens is not None or section_names:
+        return load_budgeted_context(result, feature_dir, project_root, files,
+                                     max_tokens, section_names, parsed)
 
-            # Validate status line
-            status_check = validate_handoff_status(content)
-            result['status_valid'] = status_check['valid']
-            if not status_check['valid']:
-                result['status_warning'] = status_check['error']
+    if files is None:
+        files = read_feature_files(feature_dir)
 
-        except Exception as e:
-            result['error'] = f"Failed to read HANDOFF.md: {str(e)}"
-    
-    # Load plan.md or README.md (prefer plan.md)
-    plan_path = feature_dir / 'plan.md'
-    readme_path = feature_dir / 'README.md'
-    
-    if plan_path.exists():
-        try:
-            content = plan_path.read_text(encoding='utf-8')
-            result['plan_content'] = content
-            result['files_loaded'].append(str(plan_path.relative_to(project_root)))
-            result['lines_loaded'] += len(content.splitlines())
-        except Exception as e:
-            if 'error' in result:
-                result['error'] += f"; Failed to read plan.md: {str(e)}"
-            else:
-                result['error'] = f"Failed to read plan.md: {str(e)}"
-    
-    elif readme_path.exists():
-        try:
-            content = readme_path.read_text(encoding='utf-8')
-            result['plan_content'] = content
-            result['files_loaded'].append(str(readme_path.relative_to(project_root)))
-            result['lines_loaded'] += len(content.splitlines())
-        except Exception as e:
-            if 'error' in result:
-                result['error'] += f"; Failed to read README.md: {str(e)}"
-            else:
-                result['error'] = f"Failed to read README.md: {str(e)}"
+    if files['handoff']:
+        handoff_path, content = files['handoff']
+        result['handoff_content'] = content
+        result['files_loaded'].append(str(handoff_path.relative_to(project_root)))
+        result['lines_loaded'] += len(content.splitlines())
+
+        # Validate status line
+        status_check = validate_handoff_status(content)
+        result['status_valid'] = status_check['valid']
+        if not status_check['valid']:
+            result['status_warning'] = status_check['error']
+
+    if files['plan']:
+        plan_path, content = files['plan']
+        result['plan_content'] = content
+        result['files_loaded'].append(str(plan_path.relative_to(project_root)))
+        result['lines_loaded'] += len(content.splitlines())
+
+    if files['errors']:
+        result['error'] = '; '.join(files['errors'])
     
     # If no plan or handoff found, note it
     if not result['handoff_content'] and not result['plan_content']:
         result['error'] = f"No HANDOFF.md or plan.md/README.md found in {feature_dir}"
     
+    if 'error' not in result:
+        texts = file_texts(files)
+        result['content_hash'] = content_hash(texts)
+        if record:
+            record_served(project_root, feature_dir, texts, result['content_hash'])
+    
+    return result
+
+
+def diff_sections(old, sections):
+    """
+    Section-level diff of one file.
+
+    Args:
+        old: {section key: sha} from the baseline snapshot (None if the file was absent)
+        sections: Current sections of the file
+
+    Returns:
+        dict: {"added": [{"title", "content"}], "changed": [...], "removed": [titles],
+               "unchanged": count}
+    """
+    old = old or {}
+    current = section_digests(sections)
+    delta = {"added": [], "changed": [], "removed": [], "unchanged": 0}
+    for key, (sha, section) in current.items():
+        if key not in old:
+            delta['added'].append({"title": key, "content": section.text()})
+        elif old[key] != sha:
+            delta['changed'].append({"title": key, "content": section.text()})
+        else:
+            delta['unchanged'] += 1
+    delta['removed'] = [key for key in old if key not in current]
+    return delta
+
+
+def load_feature_delta(feature_name, since, project_root=None, files=None):
+    """
+    Return only what changed since the context identified by `since` was served.
+
+    Args:
+        feature_name: Name of the feature
+        since: content_hash from an earlier response, or "last" for the
+            last full load of this feature
+        project_root: Project root (found from cwd if omitted)
+        files: Result of read_feature_files() to reuse instead of reading again
+
+    Returns:
+        dict: {"unchanged": true} when nothing changed; else a per-file section
+        diff, or the full context (with "baseline_missing": true) when the
+        baseline snapshot is unknown
+    """
+    project_root = project_root or find_project_root()
+    feature_dir = resolve_feature_dir(project_root, feature_name)
+    if not feature_dir.exists():
+        return load_feature_context(feature_name, project_root, record=True)
+
+    if files is None:
+        files = read_feature_files(feature_dir)
+    texts = file_texts(files)
+    current = content_hash(texts)
+
+    entry = load_served_cache(project_root / 'backlog').get(
+        str(feature_dir.relative_to(project_root)), {})
+    baseline = entry.get('last') if since == 'last' else since
+
+    result = {
+        "feature_name": feature_name,
+        "content_hash": current,
+        "since": baseline,
+        "unchanged": baseline == current
+    }
+    if result['unchanged'] and not files['errors']:
+        return result
+
+    snapshot = entry.get('snapshots', {}).get(baseline)
+    if markdown_sections is None or snapshot is None or files['errors']:
+        full = load_feature_context(feature_name, project_root, files, record=True)
+        full.update(since=baseline, unchanged=False, baseline_missing=True)
+        return full
+
+    result['delta'] = {}
+    for name, text in texts:
+        sections = markdown_sections.parse_sections(text.splitlines(keepends=True))
+        result['delta'][name] = diff_sections(snapshot.get(name), sections)
+    for name in snapshot:
+        if name not in result['delta']:
+            result['delta'][name] = {"added": [], "changed": [], "removed": list(snapshot[name]),
+                                     "unchanged": 0, "file_removed": True}
+
+    if files['handoff']:
+        status_check = validate_handoff_status(files['handoff'][1])
+        result['status_valid'] = status_check['valid']
+        result['status_warning'] = None if status_check['valid'] else status_check['error']
+
+    record_served(project_root, feature_dir, texts, current)
     return result
 
 
+def frontmatter_priority(text):
+    """Read `priority:` from a plan's frontmatter text (None if absent)."""
+    lines = text.splitlines()
+    if not lines or lines[0].strip() != '---':
+        return None
+    for line in lines[1:]:
+        if line.strip() == '---':
+            break
+        if line.startswith('priority:'):
+            return line[9:].split('#', 1)[0].strip().strip('"\'') or None
+    return None
+
+
+def allocate_budget(max_tokens, needs, weights):
+    """
+    Split one token budget across features in proportion to their weights.
+
+    Features needing less than their share get exactly what they need and
+    the surplus is split again among the rest (water-filling), so no budget
+    is left unused while anything is still being dropped.
+
+    Args:
+        max_tokens: Global budget
+        needs: {feature: tokens its (filtered) files would take in full}
+        weights: {feature: priority weight}
+
+    Returns:
+        dict: {feature: allocated tokens}
+    """
+    allocation = {}
+    remaining = max_tokens
+    pending = dict(needs)
+    while pending:
+        total_weight = sum(weights[name] for name in pending)
+        satisfied = [name for name, need in pending.items()
+                     if need <= remaining * weights[name] / total_weight]
+        if not satisfied:
+            for name in pending:
+                allocation[name] = int(remaining * weights[name] / total_weight)
+            break
+        for name in satisfied:
+            allocation[name] = pending.pop(name)
+            remaining -= allocation[name]
+    return allocation
+
+
+def load_many(feature_names, max_tokens=None, section_names=None,
+              workers=BATCH_WORKERS, project_root=None, record=False):
+    """
+    Load several features' context in one pass.
+
+    Files are read on a thread pool; results are assembled (and, with
+    record, served snapshots recorded) in order afterwards. With max_tokens, the budget is
+    split across features by plan priority (PRIORITY_WEIGHTS), each
+    feature's share then filled as in a single budgeted load.
+
+    Args:
+        feature_names: Feature names/ids (several naming one feature load it once)
+        max_tokens: Global token budget (None = no limit)
+        section_names: Section titles to keep in every feature
+        workers: Reader thread count
+        record: Keep snapshots of full (unbudgeted) loads for --since
+
+    Returns:
+        dict: {"count", "features": [per-feature context], "lines_loaded", "budget"?}
+    """
+    project_root = project_root or find_project_root()
+    dirs = unique_features(project_root, feature_names)
+    names = list(dirs)
+    budgeted = max_tokens is not None or bool(section_names)
+    if budgeted and markdown_sections is None:
+        return {"count": 0, "features": [],
+                "error": "--max-tokens/--sections need markdown_sections.py next to handoff_loader.py"}
+
+    def read(name):
+        if not dirs[name].exists():
+            return None
+        if budgeted:
+            return read_feature_sections(dirs[name])
+        return read_feature_files(dirs[name])
+
+    if len(names) > 1:
+        with ThreadPoolExecutor(max_workers=min(workers, len(names))) as pool:
+            loaded = dict(zip(names, pool.map(read, names)))
+    else:
+        loaded = {name: read(name) for name in names}
+
+    priorities = {}
+    for name, data in loaded.items():
+        plan = data and data['plan']
+        if plan:
+            text = markdown_sections.render(plan[1][:1]) if budgeted else plan[1]
+            priorities[name] = frontmatter_priority(text)
+        else:
+            priorities[name] = None
+    weights = {name: PRIORITY_WEIGHTS.get(priorities[name], DEFAULT_WEIGHT) for name in names}
+    order = sorted(names, key=lambda name: -weights[name])
+
+    allocation = {name: None for name in names}
+    if max_tokens is not None:
+        needs = {}
+        for name in names:
+            data = loaded[name]
+            sections = [s for key in ('handoff', 'plan') if data and data[key]
+                        for s in data[key][1]]
+            if section_names:
+                sections = markdown_sections.filter_sections(sections, section_names)
+            needs[name] = sum(s.tokens for s in sections)
+        allocation = allocate_budget(max_tokens, needs, weights)
+
+    features = []
+    for name in order:
+        if budgeted:
+            result = load_feature_context(name, project_root, max_tokens=allocation[name],
+                                          section_names=section_names,
+                                          parsed=loaded[name] or None)
+        else:
+            result = load_feature_context(name, project_root, files=loaded[name] or None,
+                                          record=record)
+        result['priority'] = priorities[name]
+        features.append(result)
+
+    batch = {
+        "count": len(features),
+        "features": features,
+        "lines_loaded": sum(f.get('lines_loaded', 0) for f in features)
+    }
+    if budgeted:
+        kept = [f['budget']['kept'] for f in features if 'budget' in f]
+        dropped = [f['budget']['dropped'] for f in features if 'budget' in f]
+        batch['budget'] = {
+            "max_tokens": max_tokens,
+            "allocated": allocation if max_tokens is not None else None,
+            "kept_tokens": sum(k['tokens'] for k in kept),
+            "dropped_tokens": sum(d['tokens'] for d in dropped)
+        }
+    return batch
+
+
+class JsonArgumentParser(argparse.ArgumentParser):
+    """ArgumentParser that raises instead of printing usage, so errors stay JSON."""
+
+    def error(self, message):
+        raise ValueError(message)
+
+
 def main():
     """Main entry point."""
-    if len(sys.argv) < 2:
+    parser = JsonArgumentParser(add_help=False)
+    parser.add_argument('features', nargs='*')
+    parser.add_argument('--all-active', action='store_true')
+    parser.add_argument('--max-tokens', type=int)
+    parser.add_argument('--sections')
+    parser.add_argument('--since')
+    parser.add_argument('--record', action='store_true')
+    parser.add_argument('--compact', action='store_true')
+    try:
+        args = parser.parse_args()
+        if not args.features and not args.all_active:
+            raise ValueError("a feature name or --all-active is required")
+        if args.max_tokens is not None and args.max_tokens < 0:
+            raise ValueError("--max-tokens must be >= 0")
+        if args.since and (args.max_tokens is not None or args.sections):
+            raise ValueError("--since returns whole changed sections; don't combine with --max-tokens/--sections")
+        if args.record and (args.max_tokens is not None or args.sections):
+            raise ValueError("--record keeps full loads only; don't combine with --max-tokens/--sections")
+        if args.since and (len(args.features) > 1 or args.all_active):
+            raise ValueError("--since takes a single feature")
+        if args.all_active and feature_discovery is None:
+            raise ValueError("--all-active needs feature_discovery.py next to handoff_loader.py")
+        if args.compact and handoff_compact is None:
+            raise ValueError("--compact needs handoff_compact.py next to handoff_loader.py")
+    except ValueError as e:
         print(json.dumps({
-            "error": "Usage: handoff_loader.py <feature-name>",
-            "example": "python3 handoff_loader.py session-based-auth"
+            "error": f"Usage: handoff_loader.py <feature-name>... | --all-active [--max-tokens N] [--sections A,B] [--since HASH|last] [--record] [--compact] ({e})",
+            "example": "python3 handoff_loader.py session-based-auth --max-tokens 4000"
         }, indent=2), file=sys.stderr)
         sys.exit(1)
     
-    feature_name = sys.argv[1]
-    result = load_feature_context(feature_name)
+    section_names = [n.strip() for n in args.sections.split(',') if n.strip()] if args.sections else None
+    project_root = find_project_root()
+    names = list(args.features)
+    if args.all_active:
+        discovery = feature_discovery.discover_features(project_root=project_root)
+        names += [f['name'] for f in discovery['active_features']]
+
+    # Archive old sessions of oversized handoffs before anything is read
+    compaction = {}
+    if args.compact:
+        for name in unique_features(project_root, names):
+            try:
+                compaction[name] = handoff_compact.compact_handoff(name, project_root=project_root)
+            except (OSError, UnicodeDecodeError) as e:
+                compaction[name] = {"feature_name": name, "compacted": False, "error": str(e)}
+
+    if args.all_active or len(args.features) > 1:
+        result = load_many(names, args.max_tokens, section_names, project_root=project_root,
+                           record=args.record)
+        for feature in result['features']:
+            if feature['feature_name'] in compaction:
+                feature['compaction'] = compaction[feature['feature_name']]
+    elif args.since:
+        result = load_feature_delta(args.features[0], args.since, project_root)
+    else:
+        result = load_feature_context(args.features[0], project_root, max_tokens=args.max_tokens,
+                                      section_names=section_names, record=args.record)
+    if compaction and 'features' not in result:
+        result['compaction'] = compaction[args.features[0]]
     
     # Pretty print JSON
     print(json.dumps(result, indent=2))
     
     # Exit with appropriate code
-    if 'error' in result:
+    if 'error' in result or any('error' in f for f in result.get('features', [])):
         sys.exit(1)
     else:
         sys.exit(0)
@@ -0,0 +1,479 @@
+#!/usr/bin/env python3
+"""
+Markdown Sections
+
+Splits a markdown file into its heading sections in one streaming pass and
+picks the sections worth loading under a token budget. Used by
+handoff_loader.py for --max-tokens / --sections. SectionIndex gives
+plan_validator.py heading and **Label:** lookups from one linear scan.
+
+Each section is the heading line plus the text up to the next heading of any
+level. Text before the first heading (frontmatter) and a leading `# Title`
+section (which holds the **Status**: line) form the lead and are always
+kept first. Headings inside fenced code blocks are ignored.
+
+Token counts are estimates (about 4 characters per token), close enough for
+budgeting without a tokenizer dependency.
+
+Usage:
+    python3 .claude/utils/markdown_sections.py <file.md>                  # Section outline
+    python3 .claude/utils/markdown_sections.py <file.md> --max-tokens 2000
+    python3 .claude/utils/markdown_sections.py <file.md> --sections "Goal,Next Steps"
+"""
+
+import argparse
+import json
+import re
+import sys
+from datetime import date
+
+
+HEADING_PATTERN = re.compile(r'^(#{1,6})\s+(.*?)\s*#*\s*$')
+FENCE_PATTERN = re.compile(r'^\s*(```|~~~)')
+DATE_PATTERN = re.compile(r'(\d{4})-(\d{2})-(\d{2})')
+# **Label:** and **Label**: styles
+LABEL_PATTERN = re.compile(r'\*\*([^*\n]+?)(?::\*\*|\*\*:)')
+
+CHARS_PER_TOKEN = 4
+
+# Title keywords by importance tier (lower tier is loaded first)
+IMPORTANCE = (
+    ('status', 'quick resume', 'next step', 'blocker'),
+    ('goal', 'problem', 'current state', 'in progress'),
+    ('approach', 'solution', 'task', 'decision', 'open question'),
+)
+DEFAULT_TIER = len(IMPORTANCE)
+LEAD_TIER = -1
+
+
+def estimate_tokens(chars):
+    """Estimated tokens for a number of characters (ceil(chars / 4))."""
+    return -(-chars // CHARS_PER_TOKEN)
+
+
+class Section:
+    """One heading and its own text (not its subsections)."""
+
+    __slots__ = ('index', 'level', 'title', 'path', 'start_line', 'lines',
+                 'chars', 'bytes', 'source', 'lead', 'root')
+
+    def __init__(self, index, level, title, path, start_line, source=None, lead=False):
+        self.index = index
+        self.level = level
+        self.title = title
+        self.path = path
+        self.start_line = start_line
+        self.lines = []
+        self.chars = 0
+        self.bytes = 0
+        self.source = source
+        self.lead = lead
+        self.root = index  # index of the top-level section this one belongs to
+
+    def add(self, line):
+        self.lines.append(line)
+        self.chars += len(line)
+        self.bytes += len(line.encode('utf-8'))
+
+    @property
+    def tokens(self):
+        return estimate_tokens(self.chars)
+
+    @property
+    def label(self):
+        name = ' > '.join(self.path) or self.title or '(preamble)'
+        return f"{self.source}: {name}" if self.source else name
+
+    def text(self):
+        return ''.join(self.lines)
+
+
+def parse_sections(lines, source=None):
+    """
+    Split markdown into sections in a single pass.
+
+    Args:
+        lines: Iterable of lines with line endings (an open file works)
+        source: Optional file label stored on each section (e.g. "HANDOFF.md")
+
+    Returns:
+        list: Section objects in document order, lead sections first
+    """
+    preamble = Section(0, 0, '', (), 1, source, lead=True)
+    sections = [preamble]
+    current = preamble
+    stack = []  # (level, title, index) of open headings
+    in_fence = False
+
+    for line_no, line in enumerate(lines, 1):
+        if FENCE_PATTERN.match(line):
+            in_fence = not in_fence
+        elif not in_fence:
+            match = HEADING_PATTERN.match(line)
+            if match:
+                level = len(match.group(1))
+                title = match.group(2)
+                if level == 1 and len(sections) == 1:
+                    # Document title: part of the lead, not a parent of every section
+                    current = Section(1, level, title, (), line_no, source, lead=True)
+                    sections.append(current)
+                    current.add(line)
+                    continue
+                while stack and stack[-1][0] >= level:
+                    stack.pop()
+                stack.append((level, title, len(sections)))
+                current = Section(len(sections), level, title,
+                                  tuple(t for _, t, _ in stack), line_no, source)
+                current.root = stack[0][2]
+                sections.append(current)
+        current.add(line)
+
+    if not preamble.lines:
+        sections.pop(0)
+        for section in sections:
+            section.index -= 1
+            section.root -= 1
+    return sections
+
+
+def subtree(sections, position):
+    """Sections from `position` through the end of its subsections."""
+    level = sections[position].level
+    end = position + 1
+    while end < len(sections) and sections[end].level > level:
+        end += 1
+    return sections[position:end]
+
+
+def filter_sections(sections, names):
+    """
+    Keep the lead plus every section (with subsections) whose title
+    matches one of `names` (case-insensitive prefix, e.g. "Next Steps").
+    """
+    wanted = [n.strip().lower() for n in names if n.strip()]
+    picked = {}
+    for position, section in enumerate(sections):
+        if section.lead:
+            picked[id(section)] = section
+        elif any(section.title.lower().startswith(w) for w in wanted):
+            for s in subtree(sections, position):
+                picked[id(s)] = s
+    return [s for s in sections if id(s) in picked]
+
+
+def importance(section):
+    """Importance tier of a section (lower loads first)."""
+    if section.lead:
+        return LEAD_TIER
+    titles = ' '.join(section.path).lower()
+    for tier, keywords in enumerate(IMPORTANCE):
+        if any(keyword in titles for keyword in keywords):
+            return tier
+    return DEFAULT_TIER
+
+
+def recency(section):
+    """
+    Recency key (higher is newer): the date in the heading path if any,
+    otherwise the position of the section's top-level chunk (handoffs append
+    new sessions at the end). Subsections share their chunk's key.
+    """
+    for title in reversed(section.path):
+        match = DATE_PATTERN.search(title)
+        if match:
+            try:
+                return (1, date(*map(int, match.groups())).toordinal(), section.root)
+            except ValueError:
+                pass
+    return (0, 0, section.root)
+
+
+def rank(sections):
+    """
+    Sections ordered most-wanted first: by importance tier, then newest
+    chunk first, then document order (so a heading precedes its subsections).
+
+    Only the newest dated chunk of each file (the current session) is ranked
+    by importance. Older dated chunks rank after everything else, newest
+    first, so an old session's "Next Steps" never displaces the plan's Goal
+    or the current session.
+    """
+    newest = {}
+    for section in sections:
+        dated, day, root = recency(section)
+        if dated:
+            newest[section.source] = max(newest.get(section.source, (0, 0)), (day, root))
+
+    def key(section):
+        dated, day, root = recency(section)
+        tier = importance(section)
+        if dated and (day, root) != newest[section.source]:
+            tier = DEFAULT_TIER + 1
+        return (tier, -dated, -day, -root, section.index)
+    return sorted(sections, key=key)
+
+
+def ancestors(sections):
+    """
+    Enclosing headings of every section, per file.
+
+    Returns:
+        dict: {(source, index): [ancestor sections, outermost first]}
+    """
+    found = {}
+    stack = []
+    source = None
+    for section in sections:
+        if section.source != source:
+            stack = []
+            source = section.source
+        if section.lead:
+            found[(section.source, section.index)] = []
+            continue
+        while stack and stack[-1].level >= section.level:
+            stack.pop()
+        found[(section.source, section.index)] = list(stack)
+        stack.append(section)
+    return found
+
+
+def split(section, count):
+    """
+    Split a section after its first `count` lines.
+
+    Returns:
+        tuple: (head, tail) sections; tail has no lines if nothing was left over
+    """
+    head = Section(section.index, section.level, section.title, section.path,
+                   section.start_line, section.source, section.lead)
+    tail = Section(section.index, section.level, section.title, section.path,
+                   section.start_line + count, section.source, section.lead)
+    for position, line in enumerate(section.lines):
+        (head if position < count else tail).add(line)
+    return head, tail
+
+
+def truncate(section, max_tokens):
+    """
+    Split a section at the last whole line that fits in max_tokens.
+
+    Returns:
+        tuple: (kept head, dropped tail) sections, or (None, section) if no line fits
+    """
+    budget_chars = max_tokens * CHARS_PER_TOKEN
+    chars = 0
+    count = 0
+    for line in section.lines:
+        if chars + len(line) > budget_chars:
+            break
+        chars += len(line)
+        count += 1
+    if not count:
+        return None, section
+    return split(section, count)
+
+
+def select_sections(sections, max_tokens=None, names=None):
+    """
+    Choose sections to load.
+
+    Filters by `names` first, then (with a budget) adds sections in rank order
+    while they fit. The first section that doesn't fit is truncated to the
+    remaining budget; smaller lower-ranked sections may still fill the rest.
+    A kept subsection always brings the heading lines of its enclosing
+    sections, counted against the budget, so it is never shown out of context.
+
+    Args:
+        sections: Sections from parse_sections() (may span several files)
+        max_tokens: Token budget, or None for no limit
+        names: Section titles to keep, or None for all
+
+    Returns:
+        tuple: (kept sections in document order, dropped sections, truncated section or None)
+    """
+    candidates = filter_sections(sections, names) if names else list(sections)
+    parents = ancestors(sections)
+    kept = {}       # (source, index) -> section, or its heading line only
+    headings = {}   # (source, index) -> dropped rest of a section kept as a heading line
+    truncated = None
+    remaining = max_tokens
+
+    def with_parents(section):
+        """Heading lines of the section's enclosing sections that aren't kept yet."""
+        return [split(parent, 1) for parent in parents[(section.source, section.index)]
+                if (parent.source, parent.index) not in kept]
+
+    def keep(section, missing):
+        for head, tail in missing:
+            kept[(head.source, head.index)] = head
+            headings[(head.source, head.index)] = tail
+        kept[(section.source, section.index)] = section
+        headings.pop((section.source, section.index), None)
+
+    for section in (candidates if max_tokens is None else rank(candidates)):
+        key = (section.source, section.index)
+        missing = with_parents(section)
+        cost = section.tokens + sum(head.tokens for head, _ in missing)
+        if key in kept:
+            cost -= kept[key].tokens  # Kept as a heading line so far
+        if max_tokens is None or cost <= remaining:
+            keep(section, missing)
+            if max_tokens is not None:
+                remaining -= cost
+            continue
+        if truncated is None and key not in kept:
+            budget = remaining - sum(head.tokens for head, _ in missing)
+            head, tail = truncate(section, budget) if budget > 0 else (None, section)
+            if head is not None:
+                keep(head, missing)
+                headings[key] = tail
+                remaining -= head.tokens + sum(h.tokens for h, _ in missing)
+                truncated = section
+                continue
+
+    # Back to document order (files in the order they were passed)
+    position = {(s.source, s.index): i for i, s in enumerate(sections)}
+    order = lambda s: position[(s.source, s.index)]
+    dropped = [s for s in sections if (s.source, s.index) not in kept]
+    dropped += [tail for tail in headings.values() if tail.lines]
+    return sorted(kept.values(), key=order), sorted(dropped, key=order), truncated
+
+
+class SectionIndex:
+    """
+    Heading and bold-label spans of one document, built in one pass.
+
+    headings: [(level, title, heading_start, body_start, end)] character
+        offsets; a heading's body runs to the next heading of any level
+    labels: {label: (start, end)} of the first value of each **Label:**,
+        which runs to the next blank line, a line starting with ** or the
+        next label
+    """
+
+    def __init__(self, text):
+        self.text = text
+        self.headings = []
+        self.labels = {}
+        self._build()
+
+    def _build(self):
+        text = self.text
+        offset = 0
+        in_fence = False
+        heading = None     # open heading: [level, title, start, body_start]
+        label = None       # open label: (name, value_start)
+
+        def close_label(end):
+            nonlocal label
+            if label is not None:
+                name, start = label
+                self.labels.setdefault(name, (start, max(start, end)))
+                label = None
+
+        for line in text.splitlines(keepends=True):
+            start = offset
+            offset += len(line)
+            body_end = start - 1 if start else 0  # before the preceding newline
+
+            if FENCE_PATTERN.match(line):
+                in_fence = not in_fence
+                continue
+            if in_fence:
+                continue
+
+            match = HEADING_PATTERN.match(line)
+            if match:
+                close_label(body_end)
+                if heading is not None:
+                    self.headings.append((*heading, start))
+                heading = [len(match.group(1)), match.group(2), start, offset]
+                continue
+
+            if label is not None and (not line.strip() or line.startswith('**')):
+                close_label(body_end)
+
+            for match in LABEL_PATTERN.finditer(line):
+                close_label(start + match.start())
+                label = (match.group(1).strip(), start + match.end())
+
+        close_label(len(text))
+        if heading is not None:
+            self.headings.append((*heading, len(text)))
+
+    def section(self, *titles):
+        """
+        Body of the first non-empty heading titled like one of `titles`,
+        tried in order of preference (exact title, whitespace-insensitive).
+        A tuple groups equally preferred titles: the first in the document wins.
+
+        Returns:
+            str or None: Stripped body text
+        """
+        for group in titles:
+            group = (group,) if isinstance(group, str) else group
+            wanted = {' '.join(t.split()) for t in group}
+            for _, heading, _, body_start, end in self.headings:
+                if ' '.join(heading.split()) in wanted:
+                    body = self.text[body_start:end].strip()
+                    if body:
+                        return body
+        return None
+
+    def label(self, *names):
+        """Value of the first **Name:** label among `names` (in order), or None."""
+        for name in names:
+            span = self.labels.get(name)
+            if span is not None:
+                return self.text[span[0]:span[1]].strip()
+        return None
+
+
+def render(sections):
+    """Join sections back into markdown text."""
+    return ''.join(section.text() for section in sections)
+
+
+def account(sections, labels=False):
+    """Section count, bytes, lines and estimated tokens for a list of sections."""
+    summary = {
+        "sections": len(sections),
+        "bytes": sum(s.bytes for s in sections),
+        "lines": sum(len(s.lines) for s in sections),
+        "tokens": sum(s.tokens for s in sections),
+    }
+    if labels:
+        summary["titles"] = [s.label for s in sections]
+    return summary
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Show markdown sections and budgeted selection')
+    parser.add_argument('file', help='Markdown file')
+    parser.add_argument('--max-tokens', type=int, help='Token budget')
+    parser.add_argument('--sections', help='Comma-separated section titles to keep')
+    args = parser.parse_args()
+
+    try:
+        with open(args.file, 'r', encoding='utf-8') as f:
+            sections = parse_sections(f)
+    except (OSError, UnicodeDecodeError) as e:
+        print(json.dumps({"error": f"Failed to read {args.file}: {e}"}, indent=2))
+        sys.exit(1)
+
+    if args.max_tokens is None and args.sections is None:
+        outline = [{"level": s.level, "title": s.label, "line": s.start_line,
+                    "tokens": s.tokens} for s in sections]
+        print(json.dumps({"sections": outline, "total": account(sections)}, indent=2))
+        return
+
+    names = args.sections.split(',') if args.sections else None
+    kept, dropped, truncated = select_sections(sections, args.max_tokens, names)
+    print(json.dumps({
+        "kept": account(kept, labels=True),
+        "dropped": account(dropped, labels=True),
+        "truncated": truncated.label if truncated else None,
+    }, indent=2))
+
+
+if __name__ == '__main__':
+    main()
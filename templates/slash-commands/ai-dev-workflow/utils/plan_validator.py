@@ -5,18 +5,88 @@ Plan Validator Utility
 Runs the 3 boolean validation checks without loading PLAN_QUALITY_RUBRIC.md.
 Compares original plan against current HANDOFF state.
 
+With --baseline, the "original plan" is plan.md as committed at a git
+revision (or at its `started` date) instead of the working copy, so edits
+to the plan itself show up as drift. Versions are read through one
+`git cat-file --batch` process.
+
+With --drift, a numeric TF-IDF drift score (drift_score.py) is reported
+next to the boolean checks; --drift-update/--drift-invalid set its category
+thresholds (and imply --drift). It is opt-in because its IDF fit walks the
+whole backlog, which costs far more than the checks for one feature.
+
+Several features (or --all-active / --all) are validated on a thread pool.
+Verdicts are cached in backlog/.cache/plan_verdicts.json by the content hashes of
+plan.md and HANDOFF.md and a digest of the validator code, so a sweep only
+re-checks features that changed.
+
 Usage:
     python3 .claude/utils/plan_validator.py <feature-name>
+    python3 .claude/utils/plan_validator.py <feature-name> --baseline started
+    python3 .claude/utils/plan_validator.py <feature-name> --baseline v1.2
+    python3 .claude/utils/plan_validator.py <feature-name> --drift
+    python3 .claude/utils/plan_validator.py <feature-name> --drift-update 0.7
+    python3 .claude/utils/plan_validator.py --all-active     # Every in-progress feature
+    python3 .claude/utils/plan_validator.py --all --drift    # Whole backlog (drift sweep)
 
 Output:
     JSON with validation category (valid/update/invalid)
 """
 
+import argparse
+import difflib
+import hashlib
 import json
+import os
+import subprocess
 import sys
 import re
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 
+try:
+    import feature_resolver
+except ImportError:  # feature_resolver.py not copied: flat backlog/<name>/ layout only
+    feature_resolver = None
+
+try:
+    import markdown_sections
+except ImportError:  # markdown_sections.py not copied: regex section extraction
+    markdown_sections = None
+
+try:
+    import feature_discovery
+except ImportError:  # feature_discovery.py not copied: --all-active unavailable
+    feature_discovery = None
+
+try:
+    import drift_score
+except ImportError:  # drift_score.py not copied: keyword checks only, no numeric drift
+    drift_score = None
+
+
+# Baseline mode: goal/approach text below this similarity to the baseline counts as edited
+BASELINE_SIMILARITY = 0.85
+CACHE_DIR = '.cache'
+BASELINE_CACHE_NAME = 'plan_baseline_cache.json'
+BASELINE_CACHE_FORMAT = 1
+BASELINE_CACHE_SIZE = 512
+
+# Batch mode (--all-active / --all)
+BATCH_WORKERS = 8
+VERDICT_CACHE_NAME = 'plan_verdicts.json'
+VERDICT_CACHE_FORMAT = 3
+
+
+def cache_dir(backlog_dir):
+    """backlog/.cache/, created on first write with a .gitignore that ignores all of it."""
+    path = backlog_dir / CACHE_DIR
+    if not path.is_dir():
+        path.mkdir(exist_ok=True)
+        (path / '.gitignore').write_text('*\n', encoding='utf-8')
+    return path
+
 
 def find_project_root():
     """Find the project root directory (where backlog/ or .claude/ exists)."""
@@ -35,11 +105,88 @@ def find_project_root():
     return current
 
 
-def extract_goal(content):
+def resolve_feature_dir(project_root, feature_name):
+    """Feature directory by folder name, frontmatter id or backlog-relative path (type/name)."""
+    if '/' in feature_name:
+        return project_root / 'backlog' / feature_name
+    if feature_resolver is not None:
+        feature_dir = feature_resolver.resolve_feature_dir(feature_name, project_root)
+        if feature_dir is not None:
+            return feature_dir
+    return project_root / 'backlog' / feature_name
+
+
+# Handoff phrases that signal drift, by category. All of them are found in
+# one scan of the handoff (see scan_indicators).
+INDICATORS = (
+    ('goal_change', (r'goal\s+changed', r'scope\s+changed', r'pivot',
+                     r'different\s+outcome', r'requirements\s+changed')),
+    ('no_blockers', (r'\*\*Blockers?:\*\*\s*None', r'No blockers')),
+    ('blocker', (r'🚫.*block', r'❌.*block')),
+    ('workaround', (r'workaround', r'temporary\s+solution')),
+    ('major_change', (r'complete\s+redesign', r'changed\s+architecture', r'switching\s+to',
+                      r'abandoned.*approach', r'pivoting\s+to')),
+    ('minor_change', (r'refined\s+approach', r'adjusted', r'tweaked', r'optimization',
+                      r'simplified')),
+)
+
+INDICATOR_PATTERNS = [(category, re.compile(pattern, re.IGNORECASE))
+                      for category, patterns in INDICATORS for pattern in patterns]
+
+# Zero-width scan: stops at every position where any indicator starts, so
+# overlapping hits of different categories (e.g. "pivoting to") all count
+INDICATOR_SCAN = re.compile(
+    '(?=(?:' + '|'.join(p for _, patterns in INDICATORS for p in patterns) + '))',
+    re.IGNORECASE)
+
+GOAL_TITLES = ('Goal', 'Problem', 'Purpose')
+APPROACH_TITLES = (('Approach', 'Technical Approach'), 'Solution')
+
+
+def scan_indicators(content):
+    """
+    Find every indicator phrase in one pass over the handoff.
+
+    Returns:
+        list: [{"category", "phrase", "line"}] in document order
+    """
+    hits = []
+    if not content:
+        return hits
+    line = 1
+    last = 0
+    for match in INDICATOR_SCAN.finditer(content):
+        pos = match.start()
+        line += content.count('\n', last, pos)
+        last = pos
+        for category, pattern in INDICATOR_PATTERNS:
+            found = pattern.match(content, pos)
+            if found:
+                hits.append({"category": category, "phrase": found.group(0)[:80], "line": line})
+    return hits
+
+
+def hit_categories(hits):
+    """Set of indicator categories present in scan_indicators() output."""
+    return {hit['category'] for hit in hits}
+
+
+def extract_goal(content, index=None):
     """Extract goal statement from markdown content."""
     if not content:
         return None
     
+    if index is None and markdown_sections is not None:
+        index = markdown_sections.SectionIndex(content)
+    
+    if index is not None:
+        # Look for "## Goal" or "## Problem" or "## Purpose" section, then **Goal:**
+        goal = index.section(*GOAL_TITLES) or index.label('Goal')
+        if not goal:
+            return None
+        # Take first paragraph only
+        return goal.split('\n\n')[0][:500]
+    
     # Look for "## Goal" or "## Problem" or "## Purpose" section
     goal_patterns = [
         r'##\s+Goal\s*\n+(.*?)(?=\n##|\Z)',
@@ -59,11 +206,22 @@ def extract_goal(content):
     return None
 
 
-def extract_approach(content):
+def extract_approach(content, index=None):
     """Extract technical approach from markdown content."""
     if not content:
         return None
     
+    if index is None and markdown_sections is not None:
+        index = markdown_sections.SectionIndex(content)
+    
+    if index is not None:
+        # Look for "## Approach" / "## Technical Approach" / "## Solution", then **Approach:**
+        approach = index.section(*APPROACH_TITLES) or index.label('Approach')
+        if not approach:
+            return None
+        # Take first 2 paragraphs
+        return '\n\n'.join(approach.split('\n\n')[:2])[:800]
+    
     # Look for "## Approach" or "## Technical Approach" section
     approach_patterns = [
         r'##\s+(?:Technical\s+)?Approach\s*\n+(.*?)(?=\n##|\Z)',
@@ -82,10 +240,13 @@ def extract_approach(content):
     return None
 
 
-def check_goal_unchanged(original_goal, handoff_content):
+def check_goal_unchanged(original_goal, handoff_content, hits=None):
     """
     Check if goal is unchanged between plan and current state.
     
+    Args:
+        hits: scan_indicators() result for handoff_content (scanned if omitted)
+    
     Returns:
         bool: True if goal is unchanged or only clarified
     """
@@ -97,27 +258,20 @@ def check_goal_unchanged(original_goal, handoff_content):
         # No handoff means early in feature, assume unchanged
         return True
     
-    # Look for goal changes mentioned in handoff
-    change_indicators = [
-        r'goal\s+changed',
-        r'scope\s+changed',
-        r'pivot',
-        r'different\s+outcome',
-        r'requirements\s+changed'
-    ]
+    if hits is None:
+        hits = scan_indicators(handoff_content)
     
-    for pattern in change_indicators:
-        if re.search(pattern, handoff_content, re.IGNORECASE):
-            return False
-    
-    # No explicit change mentioned - assume unchanged
-    return True
+    # Goal changes mentioned in handoff ("goal changed", "pivot", ...)
+    return 'goal_change' not in hit_categories(hits)
 
 
-def check_dependencies_met(handoff_content):
+def check_dependencies_met(handoff_content, hits=None):
     """
     Check if dependencies are still met (no blockers discovered).
     
+    Args:
+        hits: scan_indicators() result for handoff_content (scanned if omitted)
+    
     Returns:
         str: "yes" | "workaround" | "no"
     """
@@ -125,35 +279,31 @@ def check_dependencies_met(handoff_content):
         # No handoff - assume dependencies met
         return "yes"
     
-    # Look for blocker mentions
-    blocker_patterns = [
-        r'\*\*Blockers?:\*\*\s*None',
-        r'No blockers',
-        r'🚫.*block',
-        r'❌.*block',
-    ]
+    if hits is None:
+        hits = scan_indicators(handoff_content)
+    categories = hit_categories(hits)
     
-    # Check for explicit "no blockers"
-    for pattern in blocker_patterns:
-        if re.search(pattern, handoff_content, re.IGNORECASE):
-            if 'None' in pattern or 'No block' in pattern:
-                return "yes"
-            else:
-                # Found blocker indicators
-                return "no"
+    # Explicit "no blockers" wins over blocker markers
+    if 'no_blockers' in categories:
+        return "yes"
+    if 'blocker' in categories:
+        return "no"
     
     # Look for workaround mentions
-    if re.search(r'workaround|temporary\s+solution', handoff_content, re.IGNORECASE):
+    if 'workaround' in categories:
         return "workaround"
     
     # No explicit blockers mentioned - assume met
     return "yes"
 
 
-def check_approach_sound(original_approach, handoff_content):
+def check_approach_sound(original_approach, handoff_content, hits=None):
     """
     Check if approach is unchanged or only refined.
     
+    Args:
+        hits: scan_indicators() result for handoff_content (scanned if omitted)
+    
     Returns:
         str: "same" | "minor" | "major"
     """
@@ -165,56 +315,218 @@ def check_approach_sound(original_approach, handoff_content):
         # No handoff - assume unchanged
         return "same"
     
-    # Look for major approach changes
-    major_change_indicators = [
-        r'complete\s+redesign',
-        r'changed\s+architecture',
-        r'switching\s+to',
-        r'abandoned.*approach',
-        r'pivoting\s+to',
-    ]
+    if hits is None:
+        hits = scan_indicators(handoff_content)
+    categories = hit_categories(hits)
     
-    for pattern in major_change_indicators:
-        if re.search(pattern, handoff_content, re.IGNORECASE):
-            return "major"
-    
-    # Look for minor refinements
-    minor_change_indicators = [
-        r'refined\s+approach',
-        r'adjusted',
-        r'tweaked',
-        r'optimization',
-        r'simplified',
-    ]
-    
-    for pattern in minor_change_indicators:
-        if re.search(pattern, handoff_content, re.IGNORECASE):
-            return "minor"
+    # Major approach changes win over minor refinements
+    if 'major_change' in categories:
+        return "major"
+    if 'minor_change' in categories:
+        return "minor"
     
     # No changes mentioned - assume same
     return "same"
 
 
-def validate_plan(feature_name):
+class GitBlobStore:
     """
-    Run the 3 boolean validation checks.
-    
+    Reads file versions through one long-lived `git cat-file --batch` process.
+
+    Commit lookups by date use a single `git log` over the backlog, loaded on
+    first use. Safe to share between threads.
+    """
+
+    def __init__(self, git_root):
+        self.git_root = git_root
+        self._proc = None
+        self._history = None
+        self._lock = threading.Lock()
+
+    def _process(self):
+        if self._proc is None:
+            self._proc = subprocess.Popen(
+                ['git', 'cat-file', '--batch'], cwd=self.git_root,
+                stdin=subprocess.PIPE, stdout=subprocess.PIPE, stderr=subprocess.DEVNULL)
+        return self._proc
+
+    def blob(self, rev, path):
+        """
+        Read `path` (relative to the git root) as of `rev`.
+
+        Returns:
+            tuple or None: (blob sha, text), or None if missing at that revision
+        """
+        with self._lock:
+            proc = self._process()
+            proc.stdin.write(f'{rev}:{path}\n'.encode('utf-8'))
+            proc.stdin.flush()
+            header = proc.stdout.readline().decode('utf-8').split()
+            if len(header) != 3:
+                return None  # "<object> missing": no body follows
+            if header[1] != 'blob':
+                proc.stdout.read(int(header[2]) + 1)  # skip the body to stay in sync
+                return None
+            data = proc.stdout.read(int(header[2]))
+            proc.stdout.read(1)  # trailing newline
+        return header[0], data.decode('utf-8', errors='replace')
+
+    def _load_history(self, scope):
+        """{path: [(commit date, commit sha)] newest first} for files under scope."""
+        output = subprocess.run(
+            ['git', 'log', '--date=short', '--format=>%H %cd', '--name-only', '--', scope],
+            cwd=self.git_root, capture_output=True, text=True, check=True).stdout
+        history = {}
+        commit = None
+        for line in output.splitlines():
+            if line.startswith('>'):
+                sha, day = line[1:].split()
+                commit = (day, sha)
+            elif line and commit:
+                history.setdefault(line, []).append(commit)
+        return history
+
+    def commit_at(self, path, day, scope='.'):
+        """
+        Last commit on or before `day` (YYYY-MM-DD) that touched `path`.
+
+        Returns:
+            tuple: (commit sha or None, how it was resolved)
+        """
+        with self._lock:
+            if self._history is None:
+                self._history = self._load_history(scope)
+        commits = self._history.get(path, [])
+        for commit_day, sha in commits:
+            if commit_day <= day:
+                return sha, f"last commit on or before {day}"
+        if commits:
+            return commits[-1][1], f"first commit (none on or before {day})"
+        return None, "never committed"
+
+    def close(self):
+        if self._proc is not None:
+            self._proc.stdin.close()
+            self._proc.wait()
+            self._proc = None
+
+
+def find_git_root(path):
+    """Nearest directory at or above `path` holding .git (dir or worktree file)."""
+    for candidate in [path, *path.parents]:
+        if (candidate / '.git').exists():
+            return candidate
+    return None
+
+
+def git_blob_sha(text):
+    """Git's blob id for text (matches `git hash-object`), or 'none'."""
+    if text is None:
+        return 'none'
+    data = text.encode('utf-8')
+    return hashlib.sha1(b'blob %d\0' % len(data) + data).hexdigest()
+
+
+def frontmatter_field(content, field):
+    """Read one scalar field from a plan's frontmatter (None if absent)."""
+    lines = (content or '').splitlines()
+    if not lines or lines[0].strip() != '---':
+        return None
+    prefix = f'{field}:'
+    for line in lines[1:]:
+        if line.strip() == '---':
+            break
+        if line.startswith(prefix):
+            value = line[len(prefix):].split('#', 1)[0].strip().strip('"\'')
+            return value if value and value.lower() not in ('null', 'none', '~') else None
+    return None
+
+
+def load_baseline(plan_path, plan_content, rev, store, project_root):
+    """
+    Load the plan as it was at `rev` ("started" = the frontmatter started date).
+
     Returns:
-        dict: JSON structure with validation results
+        tuple: (baseline info dict, baseline text or None)
     """
-    project_root = find_project_root()
-    feature_dir = project_root / 'backlog' / feature_name
-    
-    if not feature_dir.exists():
-        return {
-            "feature_name": feature_name,
-            "category": "invalid",
-            "error": f"Feature directory not found: {feature_dir}",
-            "checks": {},
-            "issues": ["Feature not found"],
-            "recommendation": "Check feature name and try again"
-        }
+    info = {"rev": rev}
+    git_root = find_git_root(plan_path.parent.resolve())
+    if git_root is None:
+        info['error'] = "Not a git repository"
+        return info, None
+    rel_path = plan_path.resolve().relative_to(git_root).as_posix()
+    info['path'] = rel_path
+
+    try:
+        if store is None:
+            store = GitBlobStore(git_root)
+        if rev == 'started':
+            started = frontmatter_field(plan_content, 'started')
+            if not started:
+                info['error'] = "plan.md has no started date"
+                return info, None
+            scope = (project_root / 'backlog').resolve().relative_to(git_root).as_posix()
+            commit, resolved = store.commit_at(rel_path, started, scope)
+            info['resolved'] = resolved
+            if commit is None:
+                info['error'] = f"{rel_path} is not in git history"
+                return info, None
+        else:
+            commit = rev
+        info['commit'] = commit
+        blob = store.blob(commit, rel_path)
+    except (OSError, ValueError, subprocess.CalledProcessError) as e:
+        info['error'] = f"git failed: {e}"
+        return info, None
+
+    if blob is None:
+        info['error'] = f"{rel_path} not found at {commit}"
+        return info, None
+    info['blob'] = blob[0]
+    return info, blob[1]
+
+
+def load_baseline_cache(project_root):
+    try:
+        with open(project_root / 'backlog' / CACHE_DIR / BASELINE_CACHE_NAME, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+    except (OSError, ValueError):
+        return {}
+    if not isinstance(data, dict) or data.get('format') != BASELINE_CACHE_FORMAT:
+        return {}
+    return data.get('entries', {})
+
+
+def save_baseline_cache(project_root, entries):
+    """Best-effort atomic write, keeping the newest BASELINE_CACHE_SIZE entries."""
+    while len(entries) > BASELINE_CACHE_SIZE:
+        entries.pop(next(iter(entries)))
+    try:
+        cache_path = cache_dir(project_root / 'backlog') / BASELINE_CACHE_NAME
+        tmp_path = cache_path.with_name(f'{BASELINE_CACHE_NAME}.{os.getpid()}.{threading.get_ident()}.tmp')
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump({"format": BASELINE_CACHE_FORMAT, "entries": entries}, f)
+        os.replace(tmp_path, cache_path)
+    except OSError:
+        pass
+
+
+def similarity(a, b):
+    """Text similarity 0..1 (whitespace-insensitive); 1.0 when both are missing."""
+    a = ' '.join((a or '').split())
+    b = ' '.join((b or '').split())
+    if a == b:
+        return 1.0
+    return round(difflib.SequenceMatcher(None, a, b).ratio(), 3)
+
+
+def read_plan_files(feature_dir):
+    """
+    Read a feature's plan (plan.md, else README.md) and HANDOFF.md.
     
+    Returns:
+        tuple: (plan path, plan text or None, handoff text or None)
+    """
     # Load plan
     plan_path = feature_dir / 'plan.md'
     readme_path = feature_dir / 'README.md'
@@ -223,6 +535,7 @@ def validate_plan(feature_name):
     if plan_path.exists():
         plan_content = plan_path.read_text(encoding='utf-8')
     elif readme_path.exists():
+        plan_path = readme_path
         plan_content = readme_path.read_text(encoding='utf-8')
     
     # Load handoff
@@ -231,14 +544,144 @@ def validate_plan(feature_name):
     if handoff_path.exists():
         handoff_content = handoff_path.read_text(encoding='utf-8')
     
-    # Extract key information from plan
-    original_goal = extract_goal(plan_content) if plan_content else None
-    original_approach = extract_approach(plan_content) if plan_content else None
+    return plan_path, plan_content, handoff_content
+
+
+def validate_plan(feature_name, project_root=None, baseline=None, store=None,
+                  thresholds=None, drift=False, baseline_cache=None):
+    """
+    Run the 3 boolean validation checks.
+    
+    Args:
+        feature_name: Name of the feature
+        project_root: Project root (found from cwd if omitted)
+        baseline: Compare against plan.md at this git revision, or "started"
+            for the plan as of its frontmatter started date (None = current plan)
+        store: Shared GitBlobStore (one cat-file process for many features)
+        thresholds: (update, invalid) drift score thresholds (drift_score defaults)
+        drift: Add the numeric drift score (fits IDF over the whole backlog)
+        baseline_cache: Shared load_baseline_cache() dict, saved by the caller
+            (None = load and save it here)
+    
+    Returns:
+        dict: JSON structure with validation results
+    """
+    project_root = project_root or find_project_root()
+    feature_dir = resolve_feature_dir(project_root, feature_name)
+    
+    if not feature_dir.exists():
+        return {
+            "feature_name": feature_name,
+            "category": "invalid",
+            "error": f"Feature directory not found: {feature_dir}",
+            "checks": {},
+            "issues": ["Feature not found"],
+            "recommendation": "Check feature name and try again"
+        }
+    
+    plan_path, plan_content, handoff_content = read_plan_files(feature_dir)
+    
+    baseline_info = baseline_content = None
+    if baseline and plan_content is not None:
+        owned = store is None
+        git_root = find_git_root(plan_path.parent.resolve())
+        if owned and git_root is not None:
+            store = GitBlobStore(git_root)
+        try:
+            baseline_info, baseline_content = load_baseline(
+                plan_path, plan_content, baseline, store, project_root)
+        finally:
+            if owned and store is not None:
+                store.close()
+    
+    return validate_content(feature_name, plan_content, handoff_content,
+                            baseline_content, baseline_info, project_root, thresholds, drift,
+                            baseline_cache)
+
+
+def validate_content(feature_name, plan_content, handoff_content,
+                     baseline_content=None, baseline_info=None, project_root=None,
+                     thresholds=None, drift=False, baseline_cache=None):
+    """
+    Run the 3 boolean validation checks on already-loaded plan and handoff text.
+    
+    With a baseline, goal and approach are taken from the baseline plan, and
+    edits to plan.md since then count as drift too (similarity below
+    BASELINE_SIMILARITY). Baseline extraction and the handoff scan are cached
+    per (baseline blob sha, handoff sha).
+    
+    Args:
+        feature_name: Name of the feature (echoed in the result)
+        plan_content: plan.md (or README.md) content, or None
+        handoff_content: HANDOFF.md content, or None
+        baseline_content: plan.md text at the baseline revision, or None
+        baseline_info: load_baseline() info, echoed as "baseline"
+        project_root: Project root holding the baseline cache and drift IDF
+        thresholds: (update, invalid) drift score thresholds (drift_score defaults)
+        drift: Add the numeric drift score (None in the result otherwise)
+        baseline_cache: Shared load_baseline_cache() dict; new entries are
+            added to it and saving is left to the caller (None = load and
+            save it here)
+    
+    Returns:
+        dict: JSON structure with validation results
+    """
+    # Extract key information from plan (one section index for both lookups)
+    index = None
+    if plan_content and markdown_sections is not None:
+        index = markdown_sections.SectionIndex(plan_content)
+    original_goal = extract_goal(plan_content, index) if plan_content else None
+    original_approach = extract_approach(plan_content, index) if plan_content else None
+    current_goal, current_approach = original_goal, original_approach
+    
+    hits = None
+    if baseline_content is not None:
+        key = f"{baseline_info['blob']}:{git_blob_sha(handoff_content)}"
+        owned = baseline_cache is None
+        cache = baseline_cache
+        if owned:
+            cache = load_baseline_cache(project_root) if project_root else {}
+        cached = cache.get(key)
+        baseline_info['cached'] = cached is not None
+        if cached is None:
+            cached = {
+                "goal": extract_goal(baseline_content),
+                "approach": extract_approach(baseline_content),
+                "hits": scan_indicators(handoff_content)
+            }
+            cache[key] = cached
+            if owned and project_root:
+                save_baseline_cache(project_root, cache)
+        original_goal, original_approach, hits = cached['goal'], cached['approach'], cached['hits']
+    
+    # One scan of the handoff feeds all 3 checks
+    if hits is None:
+        hits = scan_indicators(handoff_content)
     
     # Run the 3 boolean checks
-    goal_unchanged = check_goal_unchanged(original_goal, handoff_content)
-    dependencies = check_dependencies_met(handoff_content)
-    approach = check_approach_sound(original_approach, handoff_content)
+    goal_unchanged = check_goal_unchanged(original_goal, handoff_content, hits)
+    dependencies = check_dependencies_met(handoff_content, hits)
+    approach = check_approach_sound(original_approach, handoff_content, hits)
+    
+    # Drift in plan.md itself since the baseline
+    approach_edited = False
+    if baseline_content is not None:
+        goal_similarity = similarity(original_goal, current_goal)
+        approach_similarity = similarity(original_approach, current_approach)
+        baseline_info['goal_similarity'] = goal_similarity
+        baseline_info['approach_similarity'] = approach_similarity
+        if goal_similarity < BASELINE_SIMILARITY:
+            goal_unchanged = False
+        if approach_similarity < BASELINE_SIMILARITY and approach == "same":
+            approach = "minor"
+            approach_edited = True
+    
+    # Numeric drift, reported alongside the checks (doesn't change the category)
+    drift_result = None
+    if drift and drift_score is not None and project_root is not None:
+        drift_result = drift_score.score_drift(
+            original_goal, original_approach, handoff_content,
+            drift_score.load_model(project_root), *(thresholds or ()))
     
     checks = {
         "goal_unchanged": goal_unchanged,
@@ -259,6 +702,8 @@ def validate_plan(feature_name):
     
     if approach == "major":
         issues.append("Major approach change (complete redesign)")
+    elif approach_edited:
+        issues.append(f"Approach edited in plan.md since {baseline_info['rev']}")
     
     # Categorize: valid / update / invalid
     if len(issues) == 0:
@@ -274,32 +719,270 @@ def validate_plan(feature_name):
         category = "update"
         recommendation = "Document changes in plan.md, consider if replanning needed"
     
-    return {
+    result = {
         "feature_name": feature_name,
         "category": category,
         "checks": checks,
         "issues": issues,
-        "recommendation": recommendation
+        "recommendation": recommendation,
+        "indicators": hits,
+        "drift": drift_result
+    }
+    if baseline_info is not None:
+        result['baseline'] = baseline_info
+    return result
+
+
+_code_digest = None
+
+
+def code_digest():
+    """
+    Digest of the code verdicts depend on: this file (checks, INDICATORS,
+    thresholds) and the optional modules it uses. Editing any of them
+    invalidates every cached verdict.
+    """
+    global _code_digest
+    if _code_digest is None:
+        digest = hashlib.sha256()
+        for module in (sys.modules[__name__], markdown_sections, drift_score):
+            path = getattr(module, '__file__', None)
+            if path:
+                with open(path, 'rb') as f:
+                    digest.update(f.read())
+            digest.update(b'\xff')
+        _code_digest = digest.hexdigest()[:16]
+    return _code_digest
+
+
+def content_key(plan_content, handoff_content, thresholds):
+    """Verdict cache key: content hashes of both files, the drift thresholds and code_digest()."""
+    digest = hashlib.sha256(code_digest().encode('utf-8'))
+    for text in (plan_content, handoff_content):
+        digest.update(b'\0' if text is None else b'\1' + text.encode('utf-8'))
+        digest.update(b'\xff')
+    digest.update(repr(thresholds).encode('utf-8'))
+    return digest.hexdigest()[:24]
+
+
+def load_verdict_cache(project_root):
+    try:
+        with open(project_root / 'backlog' / CACHE_DIR / VERDICT_CACHE_NAME, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+    except (OSError, ValueError):
+        return {}
+    if not isinstance(data, dict) or data.get('format') != VERDICT_CACHE_FORMAT:
+        return {}
+    return data.get('features', {})
+
+
+def save_verdict_cache(project_root, entries):
+    try:
+        cache_path = cache_dir(project_root / 'backlog') / VERDICT_CACHE_NAME
+        tmp_path = cache_path.with_name(f'{VERDICT_CACHE_NAME}.{os.getpid()}.tmp')
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump({"format": VERDICT_CACHE_FORMAT, "features": entries}, f)
+        os.replace(tmp_path, cache_path)
+    except OSError:
+        pass  # Read-only checkout: validate without caching
+
+
+def all_feature_names(project_root):
+    """
+    Every feature in the backlog as its path relative to backlog/ (the folder
+    name in the flat layout, type/name in the nested one, so same-named
+    features under different types stay apart). Flat layout only without
+    feature_resolver.
+    """
+    backlog_dir = project_root / 'backlog'
+    if not backlog_dir.is_dir():
+        return []
+    if feature_resolver is not None:
+        return [d.relative_to(backlog_dir).as_posix()
+                for d in feature_resolver.iter_feature_dirs(backlog_dir)]
+    return sorted(entry.name for entry in os.scandir(backlog_dir)
+                  if entry.is_dir() and not entry.name.startswith(('_', '.'))
+                  and any(os.path.exists(os.path.join(entry.path, f))
+                          for f in ('plan.md', 'README.md', 'HANDOFF.md')))
+
+
+def validate_many(feature_names, workers=BATCH_WORKERS, baseline=None, thresholds=None,
+                  project_root=None, drift=False):
+    """
+    Validate several features on a thread pool.
+    
+    Verdicts are cached in backlog/.cache/plan_verdicts.json per feature
+    directory (its path relative to backlog/), keyed by the content hashes of plan.md and HANDOFF.md (see content_key()), and
+    reused while neither file changed. Drift scores (with drift) are cached
+    next to them under the IDF model's digest, which changes with any file
+    in the backlog. Baseline runs share one GitBlobStore and skip the
+    verdict cache (the baseline moves with git); their baseline cache is
+    loaded once and saved once from this thread after the pool finishes.
+    
+    Args:
+        feature_names: Feature names/ids or backlog-relative paths (duplicates ignored)
+        workers: Thread count
+        baseline: As in validate_plan()
+        thresholds: (update, invalid) drift score thresholds
+        drift: Add numeric drift scores (one IDF fit shared by all features)
+    
+    Returns:
+        dict: {"count", "cached", "summary", "table", "features"}
+    """
+    project_root = project_root or find_project_root()
+    names = list(dict.fromkeys(feature_names))
+    cache = {} if baseline else load_verdict_cache(project_root)
+    git_root = find_git_root(project_root.resolve()) if baseline else None
+    store = GitBlobStore(git_root) if git_root is not None else None
+    baseline_cache = load_baseline_cache(project_root) if baseline else None
+    model = drift_score.load_model(project_root) if drift and drift_score is not None else None
+    hits = set()
+    changed = set()
+    
+    def validate(name):
+        if baseline:
+            return validate_plan(name, project_root, baseline, store, thresholds, drift,
+                                 baseline_cache)
+        feature_dir = resolve_feature_dir(project_root, name)
+        if not feature_dir.exists():
+            return validate_plan(name, project_root)
+        _, plan_content, handoff_content = read_plan_files(feature_dir)
+        key = content_key(plan_content, handoff_content, thresholds)
+        rel = feature_dir.relative_to(project_root / 'backlog').as_posix()
+        entry = cache.get(rel)
+        model_digest = model.digest if model is not None else None
+        if entry is None or entry.get('key') != key:
+            result = validate_content(name, plan_content, handoff_content,
+                                      project_root=project_root, thresholds=thresholds,
+                                      drift=drift)
+            cache[rel] = {"key": key, "result": {k: v for k, v in result.items() if k != 'drift'},
+                           "model": model_digest, "drift": result['drift']}
+            changed.add(name)
+            return result
+        hits.add(name)
+        result = dict(entry['result'])
+        if model is None:
+            result['drift'] = None
+        elif entry.get('model') == model_digest:
+            result['drift'] = entry.get('drift')
+        else:
+            result['drift'] = drift_score.score_drift(
+                extract_goal(plan_content), extract_approach(plan_content),
+                handoff_content, model, *(thresholds or ()))
+            cache[rel] = dict(entry, model=model_digest, drift=result['drift'])
+            changed.add(name)
+        return result
+    
+    def safe_validate(name):
+        try:
+            return validate(name)
+        except (OSError, UnicodeDecodeError) as e:
+            return {"feature_name": name, "category": "invalid", "error": str(e),
+                    "checks": {}, "issues": ["Feature files unreadable"],
+                    "recommendation": "Check file encoding and permissions"}
+    
+    try:
+        if len(names) > 1:
+            with ThreadPoolExecutor(max_workers=min(workers, len(names))) as pool:
+                results = list(pool.map(safe_validate, names))
+        else:
+            results = [safe_validate(name) for name in names]
+    finally:
+        if store is not None:
+            store.close()
+    
+    if not baseline and changed:
+        save_verdict_cache(project_root, cache)
+    if baseline and any(not result.get('baseline', {}).get('cached', True) for result in results):
+        save_baseline_cache(project_root, baseline_cache)
+    
+    summary = {"valid": 0, "update": 0, "invalid": 0, "error": 0}
+    table = []
+    for result in results:
+        status = 'error' if 'error' in result else result['category']
+        summary[status] += 1
+        drift = result.get('drift')
+        table.append({
+            "feature": result['feature_name'],
+            "category": status,
+            "drift": drift['score'] if drift else None,
+            "drift_category": drift['category'] if drift else None,
+            "issues": len(result.get('issues', []))
+        })
+    severity = {"error": 0, "invalid": 1, "update": 2, "valid": 3}
+    table.sort(key=lambda row: (severity[row['category']], -(row['drift'] or 0), row['feature']))
+    
+    return {
+        "count": len(results),
+        "cached": len(hits),
+        "summary": summary,
+        "table": table,
+        "features": results
     }
 
 
+class JsonArgumentParser(argparse.ArgumentParser):
+    """ArgumentParser that raises instead of printing usage, so errors stay JSON."""
+
+    def error(self, message):
+        raise ValueError(message)
+
+
 def main():
     """Main entry point."""
-    if len(sys.argv) < 2:
+    parser = JsonArgumentParser(add_help=False)
+    parser.add_argument('features', nargs='*')
+    parser.add_argument('--all-active', action='store_true')
+    parser.add_argument('--all', action='store_true')
+    parser.add_argument('--workers', type=int, default=BATCH_WORKERS)
+    parser.add_argument('--baseline', metavar='started|REV')
+    parser.add_argument('--drift', action='store_true')
+    parser.add_argument('--drift-update', type=float)
+    parser.add_argument('--drift-invalid', type=float)
+    try:
+        args = parser.parse_args()
+        if not args.features and not args.all_active and not args.all:
+            raise ValueError("a feature name, --all-active or --all is required")
+        if args.all_active and feature_discovery is None:
+            raise ValueError("--all-active needs feature_discovery.py next to plan_validator.py")
+        if args.workers < 1:
+            raise ValueError("--workers must be >= 1")
+    except ValueError as e:
         print(json.dumps({
-            "error": "Usage: plan_validator.py <feature-name>",
-            "example": "python3 plan_validator.py session-based-auth"
+            "error": f"Usage: plan_validator.py <feature-name>... | --all-active | --all "
+                     f"[--baseline started|REV] [--drift] [--drift-update X] [--drift-invalid Y] ({e})",
+            "example": "python3 plan_validator.py session-based-auth --baseline started"
         }, indent=2), file=sys.stderr)
         sys.exit(1)
     
-    feature_name = sys.argv[1]
-    result = validate_plan(feature_name)
+    thresholds = None
+    if drift_score is not None and (args.drift_update is not None or args.drift_invalid is not None):
+        thresholds = (
+            drift_score.UPDATE_THRESHOLD if args.drift_update is None else args.drift_update,
+            drift_score.INVALID_THRESHOLD if args.drift_invalid is None else args.drift_invalid)
+    drift = args.drift or thresholds is not None
+    
+    project_root = find_project_root()
+    names = list(args.features)
+    if args.all:
+        names += all_feature_names(project_root)
+    elif args.all_active:
+        discovery = feature_discovery.discover_features(project_root=project_root)
+        names += [f['name'] for f in discovery['active_features']]
+    
+    if args.all or args.all_active or len(args.features) > 1:
+        result = validate_many(names, args.workers, args.baseline, thresholds, project_root, drift)
+        results = result['features']
+    else:
+        result = validate_plan(args.features[0], project_root, args.baseline, thresholds=thresholds,
+                               drift=drift)
+        results = [result]
     
     # Pretty print JSON
     print(json.dumps(result, indent=2))
     
     # Exit with appropriate code
-    if 'error' in result or result['category'] == 'invalid':
+    if any('error' in r or r['category'] == 'invalid' for r in results):
         sys.exit(1)
     else:
         sys.exit(0)
@@ -307,4 +990,3 @@ def main():
 
 if __name__ == '__main__':
     main()
-
@@ -0,0 +1,115 @@
+#!/usr/bin/env python3
+"""
+Resume Bundle Utility
+
+Runs everything /resume-feature needs in one process: feature discovery,
+context loading and the 3 plan validation checks. The project root is found
+once and the selected feature's HANDOFF.md and plan.md are each read once,
+then shared by all three stages.
+
+Without a feature name, the feature is auto-selected when exactly one is in
+progress; with 0 or 2+ active features only discovery is returned so the
+user can pick one (then run again with the name).
+
+Usage:
+    python3 .claude/utils/resume_bundle.py [feature-name] [--rescan]
+
+Output:
+    JSON with "discovery", "context" and "validation" sections
+"""
+
+import json
+import sys
+
+import feature_discovery
+import handoff_loader
+import plan_validator
+
+
+def build_bundle(feature_name=None, rescan=False):
+    """
+    Build the combined resume document.
+
+    Args:
+        feature_name: Feature to load (auto-selected if omitted and only one is active)
+        rescan: Ignore the journal view during discovery
+
+    Returns:
+        dict: {"feature_name", "selected_by", "discovery", "context", "validation"}
+    """
+    project_root = feature_discovery.find_project_root()
+    selected_by = "argument" if feature_name else None
+
+    files = None
+    handoffs = {}
+    feature_dir = None
+    if feature_name:
+        feature_dir = handoff_loader.resolve_feature_dir(project_root, feature_name)
+        if feature_dir.exists():
+            files = handoff_loader.read_feature_files(feature_dir)
+            if files['handoff']:
+                handoffs[feature_dir] = files['handoff'][1]
+
+    discovery = feature_discovery.discover_features(
+        rescan=rescan, project_root=project_root, handoffs=handoffs)
+
+    if not feature_name:
+        if discovery['count'] != 1:
+            return {
+                "feature_name": None,
+                "selected_by": None,
+                "discovery": discovery,
+                "context": None,
+                "validation": None
+            }
+        feature_name = discovery['active_features'][0]['name']
+        selected_by = "auto"
+        feature_dir = handoff_loader.resolve_feature_dir(project_root, feature_name)
+        files = handoff_loader.read_feature_files(feature_dir)
+
+    context = handoff_loader.load_feature_context(feature_name, project_root, files)
+
+    if files is None:
+        # Feature directory doesn't exist: let the validator report it
+        validation = plan_validator.validate_plan(feature_name, project_root)
+    else:
+        validation = plan_validator.validate_content(
+            feature_name,
+            files['plan'][1] if files['plan'] else None,
+            files['handoff'][1] if files['handoff'] else None,
+            project_root=project_root)
+
+    return {
+        "feature_name": feature_name,
+        "selected_by": selected_by,
+        "discovery": discovery,
+        "context": context,
+        "validation": validation
+    }
+
+
+def main():
+    """Main entry point."""
+    args = [arg for arg in sys.argv[1:] if arg != '--rescan']
+    if len(args) > 1:
+        print(json.dumps({
+            "error": "Usage: resume_bundle.py [feature-name] [--rescan]",
+            "example": "python3 resume_bundle.py session-based-auth"
+        }, indent=2), file=sys.stderr)
+        sys.exit(1)
+
+    result = build_bundle(args[0] if args else None, rescan='--rescan' in sys.argv[1:])
+
+    # Pretty print JSON
+    print(json.dumps(result, indent=2))
+
+    # Exit with appropriate code (validation category is reported, not an error)
+    sections = (result['discovery'], result['context'] or {})
+    if any('error' in section for section in sections):
+        sys.exit(1)
+    else:
+        sys.exit(0)
+
+
+if __name__ == '__main__':
+    main()